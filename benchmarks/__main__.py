@@ -0,0 +1,58 @@
+"""
+Runs the microbenchmarks and writes a JSON report.
+
+    python -m benchmarks --sizes 10 20 40 --output results.json
+    python -m benchmarks --filter "grid.*" --repeat 10
+    python -m benchmarks.compare base.json head.json
+"""
+
+from benchmarks.runner import DEFAULT_SIZES, run_benchmarks, select, write_report
+
+import argparse
+import sys
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="grid sizes"
+    )
+    parser.add_argument(
+        "--filter",
+        nargs="+",
+        metavar="PATTERN",
+        help="glob patterns of the benchmarks to run, e.g. 'grid.*'",
+    )
+    parser.add_argument("--seed", type=int, default=41, help="seed of the fixtures")
+    parser.add_argument("--repeat", type=int, default=5, help="timed rounds")
+    parser.add_argument(
+        "--min-time", type=float, default=0.1, help="minimum seconds per round"
+    )
+    parser.add_argument(
+        "--output", "-o", default="-", help="JSON output file, '-' for stdout"
+    )
+    parser.add_argument("--list", action="store_true", help="list the benchmarks")
+    args = parser.parse_args(argv)
+
+    names = select(args.filter)
+    if args.list:
+        print("\n".join(names))
+        return
+    if not names:
+        parser.error("no benchmark matches --filter.")
+
+    # a geração de mapas é recursiva
+    sys.setrecursionlimit(10**6)
+    report = run_benchmarks(
+        names,
+        sizes=tuple(args.sizes),
+        seed=args.seed,
+        repeat=args.repeat,
+        min_time=args.min_time,
+        log=lambda line: print(line, file=sys.stderr),
+    )
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
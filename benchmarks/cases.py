@@ -0,0 +1,154 @@
+from benchmarks import fixtures
+
+import os
+from typing import Callable
+
+
+class Case:
+    """
+    One benchmark instantiated for a grid size: `run` is the timed code and performs
+    `ops` operations; `prepare`, if given, is called (untimed) before every `run`.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[], object],
+        ops: int,
+        prepare: Callable[[], None] | None = None,
+    ):
+        self.run = run
+        self.ops = ops
+        self.prepare = prepare
+
+
+# nome do benchmark -> função que monta o caso para um tamanho de grid e uma seed
+BENCHMARKS: dict[str, Callable[[int, int], Case]] = {}
+
+
+def benchmark(name: str):
+    """
+    Registers a function `(size, seed) -> Case` under `name`.
+    """
+
+    def register(function: Callable[[int, int], Case]):
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+@benchmark("grid.get_neighbors")
+def get_neighbors(size: int, seed: int) -> Case:
+    grid, _ = fixtures.maze(size, seed)
+    positions = [(row, col) for row in range(size) for col in range(size)]
+
+    def run():
+        for position in positions:
+            grid.get_neighbors(position)
+
+    return Case(run, len(positions))
+
+
+@benchmark("grid.is_terminal")
+def is_terminal(size: int, seed: int) -> Case:
+    grid, _ = fixtures.maze(size, seed)
+    positions = sorted(grid.non_empty_tiles)
+
+    def run():
+        for position in positions:
+            grid.is_terminal(position)
+
+    return Case(run, len(positions))
+
+
+@benchmark("grid.terminal_cells")
+def terminal_cells(size: int, seed: int) -> Case:
+    grid, _ = fixtures.maze(size, seed)
+    return Case(lambda: grid.terminal_cells, 1)
+
+
+@benchmark("map_generator.generate_map")
+def generate_map(size: int, seed: int) -> Case:
+    # o gerador escreve no grid, então cada execução recebe um grid novo
+    state = {}
+
+    def prepare():
+        state["generator"] = fixtures.map_generator(size, seed)
+
+    def run():
+        generator = state["generator"]
+        generator.generate_map(start_cell_position=(0, 0))
+
+    return Case(run, 1, prepare)
+
+
+@benchmark("map_generator.generate_euclidian_rewards")
+def generate_euclidian_rewards(size: int, seed: int) -> Case:
+    generator = fixtures.map_generator(size, seed)
+    generator.generate_map(start_cell_position=(0, 0))
+    solution = generator.grid.generate_random_solution(rng=generator.rng)
+    return Case(lambda: generator.generate_euclidian_rewards(solution), 1)
+
+
+@benchmark("envoriment.step")
+def envoriment_step(size: int, seed: int) -> Case:
+    env = fixtures.envoriment(size, seed)
+    steps = 1_000
+
+    def run():
+        for _ in range(steps):
+            if env.done:
+                env.agent_current_pos = env.agent_start_pos
+                env.done = False
+            env.step()
+
+    return Case(run, steps)
+
+
+@benchmark("q_learning_agent.act")
+def agent_act(size: int, seed: int) -> Case:
+    grid, _ = fixtures.maze(size, seed)
+    agent = fixtures.agent(grid, seed)
+    # metade das ações exploram, metade exploram a Q-table
+    agent.exploration_rate = 0.5
+    moves = fixtures.valid_moves(grid)
+
+    def run():
+        for state, valid_moves in moves:
+            agent.act(state, valid_moves)
+
+    return Case(run, len(moves))
+
+
+@benchmark("q_learning_agent.learn")
+def agent_learn(size: int, seed: int) -> Case:
+    grid, _ = fixtures.maze(size, seed)
+    agent = fixtures.agent(grid, seed)
+    transitions = fixtures.transitions(grid)
+
+    def run():
+        for state, action, reward, next_state in transitions:
+            agent.learn(state, action, reward, next_state)
+
+    return Case(run, len(transitions))
+
+
+@benchmark("camera_group.custom_draw")
+def custom_draw(size: int, seed: int) -> Case:
+    # renderiza sem janela; precisa ser definido antes de iniciar o display
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    from qtable_example.renders.camera_render import CameraGroup
+    from qtable_example.renders.grid_renderer import GridRenderer
+    from qtable_example.sprites.camera_center import CameraCenter
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    camera = CameraGroup(screen)
+    grid, _ = fixtures.maze(size, seed)
+    GridRenderer(grid=grid, camera_group=camera)
+    camera_center = CameraCenter(camera_group=camera)
+
+    return Case(lambda: camera.custom_draw(camera_center), 1)
@@ -0,0 +1,77 @@
+"""
+Compares two benchmark reports, e.g. from two branches:
+
+    python -m benchmarks.compare base.json head.json --threshold 0.1
+
+Exits with status 1 if any benchmark got slower than the threshold.
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict[tuple[str, int], dict]:
+    """
+    The results of a report, by (name, size).
+    """
+    with open(path) as file:
+        report = json.load(file)
+    return {(result["name"], result["size"]): result for result in report["results"]}
+
+
+def compare(base: dict, head: dict, metric: str = "median_per_op") -> list[dict]:
+    """
+    Ratio `head / base` of `metric` for every (name, size) present in both reports;
+    above 1 means slower.
+    """
+    rows = []
+    for key in sorted(base.keys() & head.keys()):
+        rows.append(
+            {
+                "name": key[0],
+                "size": key[1],
+                "base": base[key][metric],
+                "head": head[key][metric],
+                "ratio": head[key][metric] / base[key][metric],
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("base", help="report of the reference branch")
+    parser.add_argument("head", help="report of the branch under test")
+    parser.add_argument(
+        "--metric",
+        default="median_per_op",
+        choices=("median_per_op", "best_per_op"),
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    rows = compare(load(args.base), load(args.head), args.metric)
+    regressions = 0
+    print(f"{'benchmark':<45} {'size':>5} {'base us':>12} {'head us':>12} {'ratio':>7}")
+    for row in rows:
+        flag = ""
+        if row["ratio"] > 1.0 + args.threshold:
+            flag = "  slower"
+            regressions += 1
+        elif row["ratio"] < 1.0 / (1.0 + args.threshold):
+            flag = "  faster"
+        print(
+            f"{row['name']:<45} {row['size']:>5} {row['base'] * 1e6:>12.3f} "
+            f"{row['head'] * 1e6:>12.3f} {row['ratio']:>7.2f}{flag}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+from qtable_example.internal.grid import Grid
+from qtable_example.internal.map_generator import MapGenerator
+from qtable_example.internal.tile import Tile
+
+import numpy as np
+
+import random
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+# parâmetros do gerador usados em todos os fixtures, os mesmos do exemplo
+MAP_PARAMS = {
+    "max_reward": 10.0,
+    "min_reward": -20,
+    "max_cell_neighbors": 2,
+    "map_generation_create_subpath_probability": 0.9,
+}
+
+
+def map_max_length(size: int) -> int:
+    """
+    Path length budget of a `size` x `size` maze, so bigger grids get bigger mazes.
+    """
+    return size * size
+
+
+def maze(size: int, seed: int) -> tuple[Grid, Tile]:
+    """
+    The reference maze of a benchmark: a `size` x `size` grid generated from `seed`
+    with `generate_maze`, starting at (0, 0).
+    """
+    return generate_maze(
+        seed, grid_size=(size, size), map_max_length=map_max_length(size), **MAP_PARAMS
+    )
+
+
+def map_generator(size: int, seed: int) -> MapGenerator:
+    """
+    A generator over a fresh empty grid, with its own `random.Random(seed)`.
+    """
+    return MapGenerator(
+        grid=Grid(grid_size=(size, size)),
+        map_max_length=map_max_length(size),
+        rng=random.Random(seed),
+        **MAP_PARAMS,
+    )
+
+
+def agent(grid: Grid, seed: int) -> QLearningAgent:
+    """
+    A Q-learning agent over the four-direction action space with a seeded generator.
+    """
+    return QLearningAgent(ACTIONS, grid.grid_size, rng=np.random.default_rng(seed))
+
+
+def envoriment(size: int, seed: int) -> Envoriment:
+    """
+    An environment over the reference maze with a seeded Q-learning agent.
+    """
+    grid, solution = maze(size, seed)
+    return Envoriment(grid, agent(grid, seed), solution.grid_position)
+
+
+def valid_moves(grid: Grid) -> list[tuple[tuple[int, int], list[Directions]]]:
+    """
+    The occupied cells of the maze and their valid moves, in a fixed order.
+    """
+    moves = []
+    for position in sorted(grid.non_empty_tiles):
+        neighbors = grid.get_neighbors(position)
+        valid = [action for action in ACTIONS if neighbors[action] is not None]
+        if valid:
+            moves.append((position, valid))
+    return moves
+
+
+def transitions(
+    grid: Grid,
+) -> list[tuple[tuple[int, int], Directions, float, tuple[int, int]]]:
+    """
+    Every valid (state, action, reward, next_state) transition of the maze.
+    """
+    result = []
+    for position, moves in valid_moves(grid):
+        for action in moves:
+            next_position = grid.get_position_following_direction(position, action)
+            result.append(
+                (position, action, grid.get_tile(next_position).reward, next_position)
+            )
+    return result
@@ -0,0 +1,180 @@
+from benchmarks.cases import BENCHMARKS, Case
+
+import numpy as np
+
+import datetime
+import fnmatch
+import importlib.metadata
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+SCHEMA_VERSION = 1
+
+DEFAULT_SIZES = (10, 20, 40, 80)
+
+
+def _time_round(case: Case, number: int) -> float:
+    """
+    Total time of `number` runs of the case, excluding `prepare`.
+    """
+    if case.prepare is None:
+        start = time.perf_counter()
+        for _ in range(number):
+            case.run()
+        return time.perf_counter() - start
+
+    elapsed = 0.0
+    for _ in range(number):
+        case.prepare()
+        start = time.perf_counter()
+        case.run()
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def measure(case: Case, repeat: int = 5, min_time: float = 0.1) -> dict:
+    """
+    Times a case: the number of runs per round is doubled until a round takes at
+    least `min_time`, then `repeat` rounds are timed.
+
+    Returns:
+        dict: `number` (runs per round), `times` (seconds per run of each round),
+        and the `best`/`median` seconds per run and per operation.
+    """
+    number = 1
+    while _time_round(case, number) < min_time:
+        number *= 2
+
+    times = [_time_round(case, number) / number for _ in range(repeat)]
+    best = min(times)
+    median = statistics.median(times)
+    return {
+        "ops": case.ops,
+        "number": number,
+        "times": times,
+        "best": best,
+        "median": median,
+        "best_per_op": best / case.ops,
+        "median_per_op": median / case.ops,
+        "ops_per_second": case.ops / median,
+    }
+
+
+def _git(*args: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def environment() -> dict:
+    """
+    Describes the machine, interpreter, libraries and git revision of a run, so that
+    results from different branches can be matched up.
+    """
+    try:
+        # lido dos metadados para não importar o pygame (que imprime um banner)
+        pygame_version = importlib.metadata.version("pygame")
+    except importlib.metadata.PackageNotFoundError:
+        pygame_version = None
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "pygame": pygame_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def select(patterns: list[str] | None = None) -> list[str]:
+    """
+    Names of the registered benchmarks matching any of the glob `patterns`, or all of
+    them.
+    """
+    if not patterns:
+        return list(BENCHMARKS)
+    return [
+        name
+        for name in BENCHMARKS
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+
+
+def run_benchmarks(
+    names: list[str] | None = None,
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    seed: int = 41,
+    repeat: int = 5,
+    min_time: float = 0.1,
+    log=None,
+) -> dict:
+    """
+    Runs the benchmarks over every grid size.
+
+    Args:
+        names (list[str] | None): Benchmarks to run, see `select`. Defaults to all.
+        sizes (tuple[int, ...]): Grid sizes (square grids of `size` x `size` cells).
+        seed (int): Seed of every fixture.
+        repeat (int): Timed rounds per benchmark.
+        min_time (float): Minimum duration of a round, in seconds.
+        log (Callable[[str], None] | None): Called with a progress line per result.
+
+    Returns:
+        dict: JSON-serializable report with `environment`, `config` and `results`.
+    """
+    names = list(BENCHMARKS) if names is None else names
+    results = []
+    for name in names:
+        for size in sizes:
+            case = BENCHMARKS[name](size, seed)
+            result = {"name": name, "size": size, **measure(case, repeat, min_time)}
+            results.append(result)
+            if log is not None:
+                log(
+                    f"{name:<45} size={size:<4} "
+                    f"{result['median_per_op'] * 1e6:12.3f} us/op"
+                )
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "environment": environment(),
+        "config": {
+            "sizes": list(sizes),
+            "seed": seed,
+            "repeat": repeat,
+            "min_time": min_time,
+            "argv": sys.argv,
+        },
+        "results": results,
+    }
+
+
+def write_report(report: dict, path: str | None):
+    """
+    Writes the report as JSON to `path`, or to stdout when `path` is None or "-".
+    """
+    if path is None or path == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
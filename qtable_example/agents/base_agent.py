@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from typing import TypeVar, List, Tuple
 
 T = TypeVar("T")
@@ -7,16 +9,24 @@ T = TypeVar("T")
 
 class BaseAgent(ABC):
 
-    def __init__(self, action_space: List[T], state_space_dim: Tuple[int, int]):
+    def __init__(
+        self,
+        action_space: List[T],
+        state_space_dim: Tuple[int, int],
+        dtype: np.dtype = np.float64,
+    ):
         """
         Initialize the base agent.
 
         Args:
             action_space (list): The list of possible actions.
             state_space_dim (tuple[int, int]): The dimensions of the state space.
+            dtype (np.dtype): Storage type of the agent's value tables.
         """
         self.action_space = action_space
         self.state_space_dim = state_space_dim
+        self.dtype = np.dtype(dtype)
+        assert self.dtype.kind == "f", "dtype must be a floating point type."
 
     @abstractmethod
     def act(self, state: Tuple[int, int]) -> T:
@@ -35,3 +45,37 @@ class BaseAgent(ABC):
     @abstractmethod
     def reset(self):
         pass
+
+    def end_episode(self):
+        """
+        Called by `Envoriment` when an episode ends, e.g. to apply pending updates.
+        """
+
+    def act_index(self, state: int, valid_actions: tuple[int, ...]) -> int:
+        """
+        Choose an action for a flat state id of a `CompiledMaze`.
+
+        Args:
+            state (int): The flat state id.
+            valid_actions (tuple[int, ...]): Indices of the valid actions.
+
+        Returns:
+            int: The index of the action to be taken.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support compiled environments."
+        )
+
+    def learn_index(self, state: int, action: int, reward: float, next_state: int):
+        """
+        Update the agent from a transition between flat state ids of a `CompiledMaze`.
+
+        Args:
+            state (int): The flat state id.
+            action (int): The index of the action taken.
+            reward (float): The reward received.
+            next_state (int): The next flat state id.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support compiled environments."
+        )
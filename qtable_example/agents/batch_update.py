@@ -0,0 +1,45 @@
+from qtable_example.agents.q_table import accumulation_dtype
+
+import numpy as np
+
+
+def batched_td_update(
+    q_matrix: np.ndarray,
+    states: np.ndarray,
+    actions: np.ndarray,
+    targets: np.ndarray,
+    learning_rate: float,
+) -> np.ndarray:
+    """
+    Applies a batch of TD updates `Q[s, a] += lr * (target - Q[s, a])` in place.
+
+    All targets are computed from the same snapshot of the table, so a pair (s, a)
+    that appears k times is updated once towards the mean of its targets with the
+    step size of k sequential updates, `1 - (1 - lr) ** k`. This is exact when the
+    targets are equal and never overshoots, unlike `np.add.at` with `k * lr > 1`.
+    Updates are computed in `accumulation_dtype(q_matrix.dtype)` and rounded when
+    stored.
+
+    Args:
+        q_matrix (np.ndarray): Q-table as a (n_states, n_actions) matrix.
+        states (np.ndarray): Flat state ids.
+        actions (np.ndarray): Action indices.
+        targets (np.ndarray): TD targets.
+        learning_rate (float): The learning rate (alpha).
+
+    Returns:
+        np.ndarray: The TD error of each unique pair, before the update.
+    """
+    n_actions = q_matrix.shape[1]
+    pairs = np.asarray(states) * n_actions + np.asarray(actions)
+    unique_pairs, inverse, counts = np.unique(
+        pairs, return_inverse=True, return_counts=True
+    )
+    mean_targets = np.bincount(inverse, weights=targets) / counts
+
+    rows, cols = np.divmod(unique_pairs, n_actions)
+    current_q_values = q_matrix[rows, cols].astype(accumulation_dtype(q_matrix.dtype))
+    td_errors = mean_targets - current_q_values
+    step_sizes = 1.0 - (1.0 - learning_rate) ** counts
+    q_matrix[rows, cols] = current_q_values + step_sizes * td_errors
+    return td_errors
@@ -0,0 +1,155 @@
+from qtable_example.agents.batch_update import batched_td_update
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.agents.q_table import accumulation_dtype
+from qtable_example.agents.valid_actions import ValidActionsMixin
+
+import numpy as np
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class DoubleQAgent(ValidActionsMixin, QLearningAgent):
+    """
+    Double Q-learning: two Q-tables, A and B, where each update picks one of them at
+    random, selects the greedy next action with it and evaluates that action with the
+    other one, `A(s, a) += lr * (r + gamma * B(s', argmax_a' A(s', a')) - A(s, a))`.
+    Decoupling selection from evaluation removes the upward bias of the max in
+    Q-learning. The greedy next action is chosen among the valid actions of s' only
+    (see `ValidActionsMixin`): invalid actions keep their initial Q-value, which would
+    otherwise win the argmax whenever the valid ones are negative.
+
+    `q_table` holds the mean of A and B and is kept up to date on every update, so
+    action selection, convergence monitoring and the solvers keep working on it.
+
+    Like the SARSA agents, it runs through `Envoriment` (compiled or not, with or
+    without replay); `FastEpisodeRunner` and `VectorEnvoriment` inline the Q-learning
+    update and reject it.
+    """
+
+    CHECKPOINT_ARRAYS = ("valid_matrix", "valid_known", "q_table_a", "q_table_b")
+
+    def __init__(
+        self,
+        action_space: list[T],
+        state_space_dim: tuple[int, int],
+        *,
+        valid_matrix: np.ndarray | None = None,
+        **kwargs,
+    ):
+        """
+        Initialize the Double Q-learning agent. A and B start as copies of the initial
+        `q_table` and are always kept in memory, even when `q_table` is file-backed.
+
+        Args:
+            valid_matrix (np.ndarray | None): Boolean (n_states, n_actions) mask of the
+                valid actions of each state, indexed like `q_matrix`.
+            Other arguments are the same as `QLearningAgent`.
+        """
+        super().__init__(action_space, state_space_dim, **kwargs)
+        self._init_valid_actions(valid_matrix)
+        self.q_table_a = np.array(self.q_table, copy=True)
+        self.q_table_b = np.array(self.q_table, copy=True)
+        self._coin_rng = self.rng or np.random.default_rng()
+
+    @property
+    def q_matrix_a(self) -> np.ndarray:
+        return self.q_table_a.reshape(-1, self.q_table_a.shape[-1], copy=False)
+
+    @property
+    def q_matrix_b(self) -> np.ndarray:
+        return self.q_table_b.reshape(-1, self.q_table_b.shape[-1], copy=False)
+
+    def learn(self, state, action, reward, next_state):
+        """
+        Update the Q-value for the given state-action pair, through `learn_index`.
+        """
+        self.learn_index(
+            self.state_id(state), action.value, reward, self.state_id(next_state)
+        )
+
+    def learn_index(self, state: int, action: int, reward: float, next_state: int):
+        """
+        Updates A or B, chosen at random, for a flat state id / action index pair.
+        """
+        if self._coin_rng.random() < 0.5:
+            updated, evaluator = self.q_matrix_a, self.q_matrix_b
+        else:
+            updated, evaluator = self.q_matrix_b, self.q_matrix_a
+
+        next_q_values = updated[next_state].tolist()
+        best_next_action = max(
+            (
+                a
+                for a, valid in enumerate(self.valid_matrix[next_state].tolist())
+                if valid
+            ),
+            key=next_q_values.__getitem__,
+        )
+        current_q_value = updated.item(state, action)
+        td_error = (
+            reward
+            + self.discount_factor * evaluator.item(next_state, best_next_action)
+            - current_q_value
+        )
+        updated[state, action] = current_q_value + self.learning_rate * td_error
+        self.q_matrix[state, action] = (
+            self.q_matrix_a.item(state, action) + self.q_matrix_b.item(state, action)
+        ) / 2
+
+        self.decay_exploration()
+
+    def learn_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray | bool = False,
+    ) -> np.ndarray:
+        """
+        Applies a batch of TD updates, each transition going to A or B at random.
+        Both halves compute their targets from the same snapshot of the tables.
+        See `QLearningAgent.learn_batch`.
+        """
+        states = np.asarray(states)
+        actions = np.asarray(actions)
+        next_states = np.asarray(next_states)
+        rewards = np.asarray(rewards, dtype=np.float64)
+        dones = np.broadcast_to(dones, states.shape)
+        update_a = self._coin_rng.random(len(states)) < 0.5
+
+        q_matrix_a, q_matrix_b = self.q_matrix_a, self.q_matrix_b
+        value_dtype = accumulation_dtype(self.dtype)
+        updates = []
+        for mask, updated, evaluator in (
+            (update_a, q_matrix_a, q_matrix_b),
+            (~update_a, q_matrix_b, q_matrix_a),
+        ):
+            batch_next_states = next_states[mask]
+            best_next_actions = np.where(
+                self.valid_matrix[batch_next_states],
+                updated[batch_next_states],
+                -np.inf,
+            ).argmax(axis=1)
+            future_values = np.where(
+                dones[mask],
+                0.0,
+                evaluator[batch_next_states, best_next_actions].astype(value_dtype),
+            )
+            targets = rewards[mask] + self.discount_factor * future_values
+            updates.append((updated, states[mask], actions[mask], targets))
+
+        td_errors = [
+            batched_td_update(
+                updated, batch_states, batch_actions, targets, self.learning_rate
+            )
+            for updated, batch_states, batch_actions, targets in updates
+        ]
+
+        self.q_matrix[states, actions] = (
+            q_matrix_a[states, actions].astype(value_dtype)
+            + q_matrix_b[states, actions]
+        ) / 2
+        return np.concatenate(td_errors)
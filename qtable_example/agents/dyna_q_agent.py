@@ -0,0 +1,112 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+
+import numpy as np
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class DynaQAgent(QLearningAgent):
+    """
+    Dyna-Q agent: Q-learning plus a tabular world model replayed for planning.
+
+    Every real transition is recorded as (state, action) -> (reward, next_state) in
+    array-backed tables, and after each real step `planning_steps` previously observed
+    pairs are sampled and updated in a single batched TD update.
+    The maze is deterministic, so the model keeps the last observed outcome.
+
+    Planning samples from its own `planning_rng`, so changing `planning_steps` does
+    not change the agent's action sequence.
+    """
+
+    CHECKPOINT_GENERATORS = ("planning_rng",)
+
+    def __init__(
+        self,
+        action_space: list[T],
+        state_space_dim: tuple[int, int],
+        *,
+        planning_steps: int = 10,
+        planning_rng: np.random.Generator | None = None,
+        **kwargs,
+    ):
+        """
+        Initialize the Dyna-Q agent.
+
+        Args:
+            planning_steps (int): Model transitions replayed after each real step.
+            planning_rng (np.random.Generator | None): Random generator of the planning
+                samples, e.g. `RunSeeds.replay_rng()`. Defaults to a generator spawned
+                from `rng` (which leaves `rng`'s stream untouched), or to a fresh one
+                without `rng`.
+            Other arguments are the same as `QLearningAgent`.
+        """
+        super().__init__(action_space, state_space_dim, **kwargs)
+        self.planning_steps = planning_steps
+
+        n_states, n_actions = self.q_matrix.shape
+        self.model_reward = np.zeros((n_states, n_actions))
+        self.model_next_state = np.zeros((n_states, n_actions), dtype=np.int64)
+        self.model_seen = np.zeros((n_states, n_actions), dtype=np.bool_)
+
+        # pares (estado, ação) já observados, como índices planos em [0, n_states * n_actions)
+        self._observed_pairs = np.zeros(n_states * n_actions, dtype=np.int64)
+        self._n_observed = 0
+        if planning_rng is None:
+            planning_rng = (
+                self.rng.spawn(1)[0]
+                if self.rng is not None
+                else np.random.default_rng()
+            )
+        self.planning_rng = planning_rng
+
+    def learn(self, state, action, reward, next_state):
+        """
+        Update the Q-value for the given state-action pair, record it in the model
+        and run a planning sweep.
+        """
+        super().learn(state, action, reward, next_state)
+        self._record(
+            self.state_id(state), action.value, reward, self.state_id(next_state)
+        )
+        self.plan()
+
+    def learn_index(self, state: int, action: int, reward: float, next_state: int):
+        """
+        Update the Q-value of a flat state id / action index pair, record it in the
+        model and run a planning sweep.
+        """
+        super().learn_index(state, action, reward, next_state)
+        self._record(state, action, reward, next_state)
+        self.plan()
+
+    def _record(self, state: int, action: int, reward: float, next_state: int):
+        if not self.model_seen[state, action]:
+            self.model_seen[state, action] = True
+            self._observed_pairs[self._n_observed] = (
+                state * self.q_matrix.shape[1] + action
+            )
+            self._n_observed += 1
+        self.model_reward[state, action] = reward
+        self.model_next_state[state, action] = next_state
+
+    def plan(self):
+        """
+        Samples `planning_steps` observed (state, action) pairs and applies their
+        model-predicted TD updates as one batch.
+        """
+        if self._n_observed == 0 or self.planning_steps <= 0:
+            return
+
+        picks = self.planning_rng.integers(
+            0, self._n_observed, size=self.planning_steps
+        )
+        states, actions = np.divmod(self._observed_pairs[picks], self.q_matrix.shape[1])
+
+        self.learn_batch(
+            states,
+            actions,
+            self.model_reward[states, actions],
+            self.model_next_state[states, actions],
+        )
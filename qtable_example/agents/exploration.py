@@ -0,0 +1,390 @@
+import numpy as np
+
+import math
+from abc import ABC, abstractmethod
+
+# quando um cronograma avança
+PER_STEP = "step"
+PER_EPISODE = "episode"
+
+
+class Schedule(ABC):
+    """
+    Value of an exploration parameter (epsilon, temperature, ...) that anneals either
+    once per step or once per episode.
+    """
+
+    def __init__(self, start: float, per: str = PER_EPISODE):
+        """
+        Args:
+            start (float): The initial value.
+            per (str): `PER_STEP` or `PER_EPISODE`.
+        """
+        assert per in (PER_STEP, PER_EPISODE), "per must be 'step' or 'episode'."
+        self.start = start
+        self.per = per
+        self.t = 0
+        self.value = start
+
+    @abstractmethod
+    def at(self, t: int) -> float:
+        """
+        The value after `t` steps or episodes.
+        """
+
+    def advance(self, unit: str):
+        """
+        Advances one step or episode; ignored if `unit` is not the schedule's unit.
+        """
+        if unit == self.per:
+            self.t += 1
+            self.value = self.at(self.t)
+
+
+class ConstantSchedule(Schedule):
+    def __init__(self, value: float):
+        super().__init__(value)
+
+    def at(self, t: int) -> float:
+        return self.start
+
+
+class ExponentialSchedule(Schedule):
+    """
+    `max(minimum, start * decay ** t)`.
+    """
+
+    def __init__(
+        self,
+        start: float = 1.0,
+        decay: float = 0.99,
+        minimum: float = 0.01,
+        per: str = PER_EPISODE,
+    ):
+        super().__init__(start, per)
+        self.decay = decay
+        self.minimum = minimum
+
+    def at(self, t: int) -> float:
+        return max(self.minimum, self.start * self.decay**t)
+
+
+class LinearSchedule(Schedule):
+    """
+    Goes linearly from `start` to `end` in `duration` steps or episodes, then stays at
+    `end`.
+    """
+
+    def __init__(
+        self,
+        start: float = 1.0,
+        end: float = 0.01,
+        duration: int = 500,
+        per: str = PER_EPISODE,
+    ):
+        super().__init__(start, per)
+        self.end = end
+        self.duration = duration
+
+    def at(self, t: int) -> float:
+        fraction = min(t / self.duration, 1.0)
+        return self.start + fraction * (self.end - self.start)
+
+
+def _random_choice(options, rng: np.random.Generator):
+    """
+    Picks one of `options` uniformly.
+    """
+    return options[int(rng.random() * len(options))]
+
+
+def _greedy(scores, actions, rng: np.random.Generator) -> int:
+    """
+    Action of `actions` with the highest score, breaking ties uniformly at random.
+    """
+    best = max(scores[a] for a in actions)
+    return _random_choice([a for a in actions if scores[a] == best], rng)
+
+
+def _random_among(mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Picks, for each row, one column uniformly among the True entries of `mask`.
+    """
+    return np.where(mask, rng.random(mask.shape), -1.0).argmax(axis=1)
+
+
+def _best_mask(scores: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Mask of the valid actions with the highest score of each row.
+    """
+    masked = np.where(valid, scores, -np.inf)
+    return masked == masked.max(axis=1, keepdims=True)
+
+
+class ExplorationStrategy(ABC):
+    """
+    Action selection policy shared by the tabular agents.
+
+    `select` picks the action of a single state and is called by the agents on every
+    step, so it works on plain Python values. `select_batch` and `probabilities` work
+    on a batch of states at once, Q-values and valid-action masks of shape
+    (n, n_actions): the first is used by `VectorEnvoriment`, the second by on-policy
+    agents (e.g. Expected SARSA). Agents call `on_step` after every update and
+    `on_episode` from `reset`, which advance the strategy's schedule.
+
+    Arrays listed in `CHECKPOINT_ARRAYS` (e.g. visit counts) are saved and restored
+    with the agent by `checkpoint.py`.
+    """
+
+    CHECKPOINT_ARRAYS: tuple[str, ...] = ()
+
+    def bind(self, n_states: int, n_actions: int):
+        """
+        Called by the agent with the size of its Q-table.
+        """
+
+    @property
+    def schedules(self) -> list[Schedule]:
+        """
+        The schedules of the strategy, e.g. to save and restore their position.
+        """
+        return [value for value in vars(self).values() if isinstance(value, Schedule)]
+
+    @property
+    @abstractmethod
+    def exploration_rate(self) -> float:
+        """
+        The current value of the exploration parameter, e.g. for logging.
+        """
+
+    @abstractmethod
+    def select(
+        self,
+        q_values: list[float],
+        valid_actions: tuple[int, ...],
+        rng: np.random.Generator,
+        state: int,
+    ) -> int:
+        """
+        Selects the action of one state.
+
+        Args:
+            q_values (list[float]): Q-values of the state, one per action.
+            valid_actions (tuple[int, ...]): Indices of the valid actions; never empty.
+            rng (np.random.Generator): Random generator.
+            state (int): The flat state id, for count-based strategies.
+
+        Returns:
+            int: The index of the selected action.
+        """
+
+    def select_batch(
+        self,
+        q_values: np.ndarray,
+        valid: np.ndarray,
+        rng: np.random.Generator,
+        states: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Selects one action per row. The built-in strategies override it with array
+        operations; by default it calls `select` on each row.
+
+        Args:
+            q_values (np.ndarray): Q-values (n, n_actions).
+            valid (np.ndarray): Valid-action mask (n, n_actions); every row has at
+                least one valid action.
+            rng (np.random.Generator): Random generator.
+            states (np.ndarray): Flat state ids of the rows.
+
+        Returns:
+            np.ndarray: Action index of each row.
+        """
+        return np.array(
+            [
+                self.select(row, tuple(np.flatnonzero(row_valid).tolist()), rng, state)
+                for row, row_valid, state in zip(
+                    q_values.tolist(), valid, states.tolist()
+                )
+            ],
+            dtype=np.intp,
+        )
+
+    def probabilities(
+        self, q_values: np.ndarray, valid: np.ndarray, states: np.ndarray
+    ) -> np.ndarray:
+        """
+        Probability of each action under the strategy, (n, n_actions).
+
+        Args:
+            q_values (np.ndarray): Q-values (n, n_actions).
+            valid (np.ndarray): Valid-action mask (n, n_actions).
+            states (np.ndarray): Flat state ids of the rows.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not define action probabilities."
+        )
+
+    def on_step(self):
+        pass
+
+    def on_episode(self):
+        pass
+
+
+class EpsilonGreedy(ExplorationStrategy):
+    """
+    With probability epsilon a uniformly random valid action, otherwise a greedy one.
+    """
+
+    def __init__(self, epsilon: Schedule | None = None):
+        """
+        Args:
+            epsilon (Schedule | None): Schedule of epsilon. Defaults to an exponential
+                decay per episode.
+        """
+        self.epsilon = epsilon or ExponentialSchedule()
+
+    @property
+    def exploration_rate(self) -> float:
+        return self.epsilon.value
+
+    def select(self, q_values, valid_actions, rng, state):
+        if rng.random() < self.epsilon.value:
+            return _random_choice(valid_actions, rng)
+        return _greedy(q_values, valid_actions, rng)
+
+    def select_batch(self, q_values, valid, rng, states):
+        explore = rng.random(len(q_values)) < self.epsilon.value
+        return np.where(
+            explore,
+            _random_among(valid, rng),
+            _random_among(_best_mask(q_values, valid), rng),
+        )
+
+    def probabilities(self, q_values, valid, states):
+        best = _best_mask(q_values, valid)
+        epsilon = self.epsilon.value
+        return epsilon * valid / valid.sum(axis=1, keepdims=True) + (
+            1.0 - epsilon
+        ) * best / best.sum(axis=1, keepdims=True)
+
+    def on_step(self):
+        self.epsilon.advance(PER_STEP)
+
+    def on_episode(self):
+        self.epsilon.advance(PER_EPISODE)
+
+
+class Boltzmann(ExplorationStrategy):
+    """
+    Softmax over the valid actions' Q-values: `p(a) ∝ exp(Q(s, a) / temperature)`.
+    """
+
+    def __init__(self, temperature: Schedule | None = None):
+        """
+        Args:
+            temperature (Schedule | None): Schedule of the temperature. Defaults to an
+                exponential decay per episode from 1.0 to 0.05.
+        """
+        self.temperature = temperature or ExponentialSchedule(minimum=0.05)
+
+    @property
+    def exploration_rate(self) -> float:
+        return self.temperature.value
+
+    def probabilities(self, q_values, valid, states):
+        logits = np.where(valid, q_values / self.temperature.value, -np.inf)
+        logits -= logits.max(axis=1, keepdims=True)
+        weights = np.exp(logits)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def select(self, q_values, valid_actions, rng, state):
+        temperature = self.temperature.value
+        best = max(q_values[a] for a in valid_actions)
+        weights = [math.exp((q_values[a] - best) / temperature) for a in valid_actions]
+        # primeira ação cujo peso acumulado passa do sorteio
+        draw = rng.random() * sum(weights)
+        for action, weight in zip(valid_actions, weights):
+            draw -= weight
+            if draw < 0.0:
+                return action
+        return valid_actions[-1]
+
+    def select_batch(self, q_values, valid, rng, states):
+        cumulative = self.probabilities(q_values, valid, states).cumsum(axis=1)
+        draws = rng.random((len(q_values), 1)) * cumulative[:, -1:]
+        # primeira ação cuja probabilidade acumulada passa do sorteio; ações inválidas
+        # têm probabilidade 0 e nunca são as primeiras a passar
+        return (cumulative > draws).argmax(axis=1)
+
+    def on_step(self):
+        self.temperature.advance(PER_STEP)
+
+    def on_episode(self):
+        self.temperature.advance(PER_EPISODE)
+
+
+class UCB(ExplorationStrategy):
+    """
+    Upper confidence bound over visit counts:
+    `argmax Q(s, a) + c * sqrt(ln N(s) / N(s, a))`, trying unvisited actions first.
+    """
+
+    CHECKPOINT_ARRAYS = ("counts",)
+
+    def __init__(self, c: Schedule | float = 1.0):
+        """
+        Args:
+            c (Schedule | float): Weight of the exploration bonus.
+        """
+        self.c = c if isinstance(c, Schedule) else ConstantSchedule(c)
+        self.counts: np.ndarray | None = None
+
+    def bind(self, n_states: int, n_actions: int):
+        self.counts = np.zeros((n_states, n_actions), dtype=np.int64)
+
+    @property
+    def exploration_rate(self) -> float:
+        return self.c.value
+
+    def select(self, q_values, valid_actions, rng, state):
+        counts = self.counts[state].tolist()
+        unvisited = [a for a in valid_actions if counts[a] == 0]
+        if unvisited:
+            action = _random_choice(unvisited, rng)
+        else:
+            log_visits = math.log(sum(counts))
+            c = self.c.value
+            scores = {
+                a: q_values[a] + c * math.sqrt(log_visits / counts[a])
+                for a in valid_actions
+            }
+            action = _greedy(scores, valid_actions, rng)
+        self.counts[state, action] += 1
+        return action
+
+    def _scores(self, q_values: np.ndarray, states: np.ndarray) -> np.ndarray:
+        """
+        UCB score of every action of the given states; unvisited actions score inf.
+        """
+        counts = self.counts[states]
+        state_visits = counts.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bonus = self.c.value * np.sqrt(np.log(np.maximum(state_visits, 1)) / counts)
+        return np.where(counts == 0, np.inf, q_values + bonus)
+
+    def select_batch(self, q_values, valid, rng, states):
+        actions = _random_among(_best_mask(self._scores(q_values, states), valid), rng)
+        np.add.at(self.counts, (states, actions), 1)
+        return actions
+
+    def probabilities(self, q_values, valid, states):
+        # política gulosa nos escores: empates dividem a probabilidade
+        best = _best_mask(self._scores(q_values, states), valid)
+        return best / best.sum(axis=1, keepdims=True)
+
+    def on_step(self):
+        self.c.advance(PER_STEP)
+
+    def on_episode(self):
+        self.c.advance(PER_EPISODE)
@@ -0,0 +1,55 @@
+from qtable_example.agents.base_agent import BaseAgent
+from qtable_example.internal.state_index import StateIndex
+
+import numpy as np
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class OptimalAgent(BaseAgent):
+    """
+    Baseline agent that acts greedily on a fixed Q-table, typically Q* from
+    `MazeSolver`. It does not learn.
+    """
+
+    def __init__(
+        self,
+        action_space: list[T],
+        q_table: np.ndarray,
+        state_index: StateIndex | None = None,
+    ):
+        """
+        Initialize the agent.
+
+        Args:
+            action_space (list): The list of possible actions.
+            q_table (np.ndarray): Q-table with the layout of `QLearningAgent.q_table`.
+            state_index (StateIndex | None): Compact index of the rows of `q_table`,
+                when it has one row per occupied cell.
+        """
+        super().__init__(action_space, q_table.shape[:-1])
+        self.q_table = q_table
+        self.state_index = state_index
+        self.q_matrix = q_table.reshape(-1, q_table.shape[-1])
+
+    def act(self, state: tuple, valid_moves: list[T]) -> T:
+        if self.state_index is not None:
+            q_values = self.q_matrix[self.state_index.state_id(state)]
+        else:
+            q_values = self.q_table[*state]
+        return max(valid_moves, key=lambda action: q_values[action.value])
+
+    def act_index(self, state: int, valid_actions: tuple[int, ...]) -> int:
+        q_values = self.q_matrix[state]
+        return max(valid_actions, key=lambda action: q_values[action])
+
+    def learn(self, state, action, reward, next_state):
+        pass
+
+    def learn_index(self, state, action, reward, next_state):
+        pass
+
+    def reset(self):
+        pass
@@ -0,0 +1,119 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+
+import numpy as np
+
+import heapq
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class PrioritizedSweepingAgent(QLearningAgent):
+    """
+    Prioritized sweeping: model-based updates ordered by |TD error|.
+
+    Observed transitions are stored in an array-backed model, together with a
+    predecessor index (next_state -> pairs that lead to it). Every real step pushes the
+    observed pair onto a max-heap keyed by |TD error| and then applies up to
+    `planning_budget` updates, most important first; each update re-prioritizes the
+    predecessors of the updated state. The Q-table layout is the same as
+    `QLearningAgent`, so results are directly comparable.
+    """
+
+    def __init__(
+        self,
+        action_space: list[T],
+        state_space_dim: tuple[int, int],
+        *,
+        planning_budget: int = 10,
+        priority_threshold: float = 1e-4,
+        **kwargs,
+    ):
+        """
+        Initialize the prioritized sweeping agent.
+
+        Args:
+            planning_budget (int): Maximum queued updates applied per real step.
+            priority_threshold (float): Pairs with |TD error| at or below it are not queued.
+            Other arguments are the same as `QLearningAgent`.
+        """
+        super().__init__(action_space, state_space_dim, **kwargs)
+        self.planning_budget = planning_budget
+        self.priority_threshold = priority_threshold
+
+        n_states, n_actions = self.q_matrix.shape
+        self.model_reward = np.zeros((n_states, n_actions))
+        self.model_next_state = np.zeros((n_states, n_actions), dtype=np.int64)
+        self.predecessors: dict[int, set[int]] = {}
+
+        # prioridade atual de cada par na fila; entradas do heap com prioridade
+        # diferente estão desatualizadas e são descartadas ao sair da fila
+        self._priority = np.zeros(n_states * n_actions)
+        self._queue: list[tuple[float, int]] = []
+
+    def learn(self, state, action, reward, next_state):
+        """
+        Record the transition and run a prioritized sweep.
+        """
+        self.learn_index(
+            self.state_id(state), action.value, reward, self.state_id(next_state)
+        )
+
+    def learn_index(self, state: int, action: int, reward: float, next_state: int):
+        """
+        Record the transition of a flat state id / action index pair and run a
+        prioritized sweep.
+        """
+        n_actions = self.q_matrix.shape[1]
+        pair = state * n_actions + action
+        self.model_reward[state, action] = reward
+        self.model_next_state[state, action] = next_state
+        self.predecessors.setdefault(next_state, set()).add(pair)
+
+        self._push(pair, abs(self._td_error(state, action)))
+        self.sweep()
+        self.decay_exploration()
+
+    def _td_error(self, state: int, action: int) -> float:
+        q_matrix = self.q_matrix
+        next_state = self.model_next_state[state, action]
+        return (
+            self.model_reward[state, action]
+            + self.discount_factor * self._bootstrap(next_state)
+            - q_matrix.item(state, action)
+        )
+
+    def _push(self, pair: int, priority: float):
+        if priority > self.priority_threshold and priority > self._priority[pair]:
+            self._priority[pair] = priority
+            heapq.heappush(self._queue, (-priority, pair))
+
+    def _pop(self) -> int | None:
+        while self._queue:
+            priority, pair = heapq.heappop(self._queue)
+            if -priority == self._priority[pair]:
+                self._priority[pair] = 0.0
+                return pair
+        return None
+
+    def sweep(self):
+        """
+        Applies up to `planning_budget` queued updates, highest priority first.
+        """
+        q_matrix = self.q_matrix
+        n_actions = q_matrix.shape[1]
+
+        for _ in range(self.planning_budget):
+            pair = self._pop()
+            if pair is None:
+                break
+
+            state, action = divmod(pair, n_actions)
+            q_matrix[state, action] += self.learning_rate * self._td_error(
+                state, action
+            )
+
+            for predecessor in self.predecessors.get(state, ()):
+                self._push(
+                    predecessor, abs(self._td_error(*divmod(predecessor, n_actions)))
+                )
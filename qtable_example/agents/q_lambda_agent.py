@@ -0,0 +1,142 @@
+from qtable_example.agents.q_table import accumulation_dtype
+from qtable_example.agents.sarsa_agent import SarsaAgent
+
+import numpy as np
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SarsaLambdaAgent(SarsaAgent):
+    """
+    SARSA(λ): SARSA with eligibility traces, so each TD error is also credited to the
+    recently visited state-action pairs, weighted by `(gamma * lambda) ** age`.
+
+    Traces are kept sparsely in `traces`, a dict from flat pair index
+    (`state * n_actions + action`) to trace value, and dropped once they fall below
+    `trace_threshold`. Each step therefore touches only the active traces, about
+    `log(trace_threshold) / log(gamma * lambda)` pairs, never the whole table.
+    Traces are cleared at the end of every episode.
+
+    Like `SarsaAgent`, batched updates (replay, planning) are one-step and do not use
+    the traces.
+    """
+
+    def __init__(
+        self,
+        action_space: list[T],
+        state_space_dim: tuple[int, int],
+        *,
+        trace_decay: float = 0.9,
+        trace_threshold: float = 1e-3,
+        replacing_traces: bool = True,
+        **kwargs,
+    ):
+        """
+        Initialize the agent.
+
+        Args:
+            trace_decay (float): The trace decay (lambda).
+            trace_threshold (float): Traces below this value are dropped.
+            replacing_traces (bool): If True, visiting a pair resets its trace to 1;
+                otherwise 1 is added to it (accumulating traces).
+            Other arguments are the same as `OnPolicyAgent`.
+        """
+        super().__init__(action_space, state_space_dim, **kwargs)
+        assert 0.0 <= trace_decay <= 1.0, "trace_decay must be in [0, 1]."
+        assert trace_threshold > 0.0, "trace_threshold must be positive."
+        self.trace_decay = trace_decay
+        self.trace_threshold = trace_threshold
+        self.replacing_traces = replacing_traces
+        self.traces: dict[int, float] = {}
+
+    def _future_q_value(self, next_state: int, next_action: int | None) -> float:
+        """
+        The bootstrap value of the pending transition.
+        """
+        if next_action is None:
+            return self._bootstrap(next_state)
+        return self.q_matrix.item(next_state, next_action)
+
+    def _apply_pending(self, next_action: int | None):
+        if self._pending is None:
+            return
+        state, action, reward, next_state = self._pending
+        self._pending = None
+
+        q_matrix = self.q_matrix
+        q_flat = q_matrix.reshape(-1)
+        td_error = (
+            reward
+            + self.discount_factor * self._future_q_value(next_state, next_action)
+            - q_matrix.item(state, action)
+        )
+        keep_traces = self._keeps_traces(next_state, next_action)
+
+        pair = state * q_matrix.shape[1] + action
+        if self.replacing_traces:
+            self.traces[pair] = 1.0
+        else:
+            self.traces[pair] = self.traces.get(pair, 0.0) + 1.0
+
+        step = self.learning_rate * td_error
+        for active_pair, trace in self.traces.items():
+            q_flat[active_pair] = q_flat.item(active_pair) + step * trace
+
+        if not keep_traces:
+            self.traces.clear()
+            return
+        decay = self.discount_factor * self.trace_decay
+        threshold = self.trace_threshold
+        self.traces = {
+            active_pair: trace * decay
+            for active_pair, trace in self.traces.items()
+            if trace * decay >= threshold
+        }
+
+    def _keeps_traces(self, next_state: int, next_action: int | None) -> bool:
+        """
+        Whether the traces survive the transition into (next_state, next_action).
+        """
+        return True
+
+    def end_episode(self):
+        super().end_episode()
+        self.traces.clear()
+
+    def reset(self):
+        super().reset()
+        self.traces.clear()
+
+
+class QLambdaAgent(SarsaLambdaAgent):
+    """
+    Watkins's Q(λ): Q-learning targets, `r + gamma * max_a Q(s', a)`, with eligibility
+    traces that are cut whenever the next action is exploratory (not greedy), since
+    the later rewards then no longer follow the greedy policy being learned. The max
+    is taken over the valid actions of s' only, both in the target and to decide
+    whether an action is greedy.
+
+    The traces are stored sparsely as in `SarsaLambdaAgent`; batched updates are the
+    one-step Q-learning update.
+    """
+
+    def _bootstrap(self, next_state: int) -> float:
+        q_values = self.q_matrix[next_state].tolist()
+        valid = self.valid_matrix[next_state].tolist()
+        return max(q for q, is_valid in zip(q_values, valid) if is_valid)
+
+    def bootstrap_values(self, next_states: np.ndarray) -> np.ndarray:
+        q_values = self.q_matrix[next_states].astype(accumulation_dtype(self.dtype))
+        return np.where(self.valid_matrix[next_states], q_values, -np.inf).max(axis=1)
+
+    def _future_q_value(self, next_state: int, next_action: int | None) -> float:
+        return self._bootstrap(next_state)
+
+    def _keeps_traces(self, next_state: int, next_action: int | None) -> bool:
+        if next_action is None:
+            return True
+        return self.q_matrix.item(next_state, next_action) == self._bootstrap(
+            next_state
+        )
@@ -1,4 +1,8 @@
 from qtable_example.agents.base_agent import BaseAgent
+from qtable_example.agents.batch_update import batched_td_update
+from qtable_example.agents.exploration import ExplorationStrategy
+from qtable_example.agents.q_table import accumulation_dtype, memmap_q_table
+from qtable_example.internal.state_index import StateIndex
 
 import numpy as np
 
@@ -19,6 +23,12 @@ class QLearningAgent(BaseAgent):
         exploration_rate: float = 1.0,
         exploration_decay: float = 0.99,
         min_exploration_rate: float = 0.01,
+        rng: np.random.Generator | None = None,
+        q_table: np.ndarray | None = None,
+        q_table_path: str | None = None,
+        state_index: StateIndex | None = None,
+        dtype: np.dtype = np.float64,
+        exploration: ExplorationStrategy | None = None,
     ):
         """
         Initialize the Q-learning agent.
@@ -30,17 +40,74 @@ class QLearningAgent(BaseAgent):
             exploration_decay (float): The decay rate for exploration.
             min_exploration_rate (float): The minimum exploration rate.
             state_space_dim (tuple[int, int]): The dimensions of the state space.
+            rng (np.random.Generator | None): Random generator for action selection.
+                When given, every call to `act`/`act_index` draws exactly two uniforms
+                (exploration and tie-break), so the run can be replayed by
+                `FastEpisodeRunner`. Defaults to the global `np.random`.
+            q_table (np.ndarray | None): Existing Q-table of shape
+                (*state_space_dim, len(action_space)) to use instead of allocating one.
+            q_table_path (str | None): If given (and `q_table` is not), the Q-table is a
+                file-backed `np.memmap` at this path (see `memmap_q_table`), so mazes
+                larger than the available RAM can be trained.
+            state_index (StateIndex | None): If given, the Q-table has one row per
+                occupied cell, (len(state_index), len(action_space)), instead of one
+                per grid cell. See `Grid.state_index`.
+            dtype (np.dtype): Storage type of the Q-table, e.g. np.float32 or np.float16.
+                Updates are computed in at least float32 (float64 for single updates)
+                and rounded to `dtype` when stored.
+            exploration (ExplorationStrategy | None): Action selection strategy. It
+                replaces the built-in epsilon-greedy (`exploration_rate`,
+                `exploration_decay` and `min_exploration_rate` are then unused), and
+                its schedules advance per step from `learn` and per episode from
+                `reset` instead of epsilon being reset to 1.0 every episode.
         """
+        super().__init__(action_space, state_space_dim, dtype=dtype)
 
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.exploration_rate = exploration_rate
         self.exploration_decay = exploration_decay
         self.min_exploration_rate = min_exploration_rate
-        self.action_space = action_space
+        self.rng = rng
+        self.state_index = state_index
 
         # Initialize Q-table as a dictionary
-        self.q_table = np.zeros((*state_space_dim, len(action_space)))
+        if state_index is not None:
+            shape = (len(state_index), len(action_space))
+        else:
+            shape = (*state_space_dim, len(action_space))
+        if q_table is None and q_table_path is not None:
+            q_table = memmap_q_table(q_table_path, shape, dtype=self.dtype)
+        elif q_table is None:
+            q_table = np.zeros(shape, dtype=self.dtype)
+        assert (
+            q_table.shape == shape
+        ), "q_table shape does not match the state and action spaces."
+        assert q_table.dtype == self.dtype, "q_table dtype does not match dtype."
+        self.q_table = q_table
+
+        self.exploration = exploration
+        if exploration is not None:
+            exploration.bind(*self.q_matrix.shape)
+            self.exploration_rate = exploration.exploration_rate
+            self._exploration_rng = rng if rng is not None else np.random.default_rng()
+        self.episodes_started = 0
+
+    def state_id(self, state: tuple[int, int]) -> int:
+        """
+        The row of `q_matrix` of a (row, col) state.
+        """
+        if self.state_index is not None:
+            return self.state_index.state_id(state)
+        return state[0] * self.q_table.shape[1] + state[1]
+
+    def _q_values(self, state: tuple[int, int]) -> np.ndarray:
+        """
+        The Q-values of a (row, col) state, as a view into the Q-table.
+        """
+        if self.state_index is not None:
+            return self.q_table[self.state_index.state_id(state)]
+        return self.q_table[state[0], state[1]]
 
     def learn(self, state, action, reward, next_state):
         """
@@ -52,17 +119,15 @@ class QLearningAgent(BaseAgent):
             reward (float): The reward received.
             next_state (tuple): The next state.
         """
-        current_q_value = self.q_table[state[0], state[1], action.value]
-        max_future_q_value = np.max(self.q_table[next_state[0], next_state[1], :])
+        q_values = self._q_values(state)
+        current_q_value = q_values.item(action.value)
+        max_future_q_value = self._bootstrap(self.state_id(next_state))
         q_value_obs = reward + self.discount_factor * max_future_q_value
         td_error = q_value_obs - current_q_value
         new_q_value = current_q_value + self.learning_rate * td_error
-        self.q_table[state[0], state[1], action.value] = new_q_value
+        q_values[action.value] = new_q_value
 
-        # Decay exploration rate
-        self.exploration_rate = max(
-            self.min_exploration_rate, self.exploration_rate * self.exploration_decay
-        )
+        self.decay_exploration()
 
     def act(self, state: tuple, valid_moves: list[T]) -> T:
         """
@@ -72,13 +137,19 @@ class QLearningAgent(BaseAgent):
         Returns:
             T: The action to be taken.
         """
+        if self.exploration is not None:
+            action = self._select(
+                self.state_id(state), tuple(move.value for move in valid_moves)
+            )
+            return next(move for move in valid_moves if move.value == action)
 
-        if np.random.rand() < self.exploration_rate:
+        explore_draw, pick_draw = self._draw()
+        if explore_draw < self.exploration_rate:
             # Explore: choose a random action
-            return np.random.choice(valid_moves)
+            return self._pick(valid_moves, pick_draw)
         else:
             # Exploit: choose the action with the highest Q-value
-            q_values = self.q_table[*state]
+            q_values = self._q_values(state)
             mapped_q_values = {
                 action.value: q_values[action.value] for action in valid_moves
             }
@@ -91,7 +162,149 @@ class QLearningAgent(BaseAgent):
                 for action in valid_moves
                 if mapped_q_values[action.value] == max_q_value
             ]
-            return np.random.choice(best_actions)
+            return self._pick(best_actions, pick_draw)
+
+    def _draw(self) -> tuple[float, float | None]:
+        """
+        Draws the exploration uniform and, when using `self.rng`, the tie-break uniform.
+        """
+        if self.rng is None:
+            return np.random.rand(), None
+        return self.rng.random(), self.rng.random()
+
+    def _pick(self, options: list, pick_draw: float | None):
+        """
+        Picks one of `options` uniformly, using the tie-break uniform when available.
+        """
+        if pick_draw is None:
+            return options[np.random.randint(len(options))]
+        return options[int(pick_draw * len(options))]
+
+    @property
+    def q_matrix(self) -> np.ndarray:
+        """
+        The Q-table viewed as a (n_states, n_actions) matrix indexed by flat state id.
+        """
+        return self.q_table.reshape(-1, self.q_table.shape[-1], copy=False)
+
+    def learn_index(self, state: int, action: int, reward: float, next_state: int):
+        """
+        Update the Q-value of a flat state id / action index pair.
+
+        Args:
+            state (int): The flat state id.
+            action (int): The index of the action taken.
+            reward (float): The reward received.
+            next_state (int): The next flat state id.
+        """
+        q_matrix = self.q_matrix
+        current_q_value = q_matrix.item(state, action)
+        max_future_q_value = self._bootstrap(next_state)
+        td_error = reward + self.discount_factor * max_future_q_value - current_q_value
+        q_matrix[state, action] = current_q_value + self.learning_rate * td_error
+
+        self.decay_exploration()
+
+    def _bootstrap(self, next_state: int) -> float:
+        """
+        Value of a next state in the TD target. Q-learning bootstraps from the greedy
+        value, `max_a Q(s', a)`; other tabular agents override this.
+        """
+        return max(self.q_matrix[next_state].tolist())
+
+    def bootstrap_values(self, next_states: np.ndarray) -> np.ndarray:
+        """
+        Vectorized `_bootstrap` over an array of flat state ids, computed in
+        `accumulation_dtype(self.dtype)`.
+        """
+        return (
+            self.q_matrix[next_states]
+            .max(axis=1)
+            .astype(accumulation_dtype(self.dtype))
+        )
+
+    def learn_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray | bool = False,
+    ) -> np.ndarray:
+        """
+        Applies a batch of TD updates at once (see `batched_td_update`). Used by
+        replay and planning; does not decay the exploration rate.
+
+        Args:
+            states (np.ndarray): Flat state ids.
+            actions (np.ndarray): Action indices.
+            rewards (np.ndarray): Rewards.
+            next_states (np.ndarray): Next flat state ids.
+            dones (np.ndarray | bool): Whether each transition ended the episode, in
+                which case it does not bootstrap.
+
+        Returns:
+            np.ndarray: The TD errors of the unique (state, action) pairs updated.
+        """
+        future_values = np.where(dones, 0.0, self.bootstrap_values(next_states))
+        targets = rewards + self.discount_factor * future_values
+        return batched_td_update(
+            self.q_matrix, states, actions, targets, self.learning_rate
+        )
+
+    def act_index(self, state: int, valid_actions: tuple[int, ...]) -> int:
+        """
+        Choose an action index for a flat state id using epsilon-greedy policy.
+
+        Args:
+            state (int): The flat state id.
+            valid_actions (tuple[int, ...]): Indices of the valid actions.
+
+        Returns:
+            int: The index of the action to be taken.
+        """
+        if self.exploration is not None:
+            return self._select(state, valid_actions)
+
+        explore_draw, pick_draw = self._draw()
+        if explore_draw < self.exploration_rate:
+            return self._pick(valid_actions, pick_draw)
+
+        q_values = self.q_matrix[state].tolist()
+        max_q_value = max(q_values[a] for a in valid_actions)
+        best_actions = [a for a in valid_actions if q_values[a] == max_q_value]
+        return self._pick(best_actions, pick_draw)
+
+    def _select(self, state: int, valid_actions: tuple[int, ...]) -> int:
+        """
+        Selects an action for a flat state id with `self.exploration`.
+        """
+        return self.exploration.select(
+            self.q_matrix[state].tolist(),
+            valid_actions,
+            self._exploration_rng,
+            state,
+        )
+
+    def decay_exploration(self):
+        """
+        Decay the exploration rate by one step.
+        """
+        if self.exploration is not None:
+            self.exploration.on_step()
+            self.exploration_rate = self.exploration.exploration_rate
+            return
+
+        self.exploration_rate = max(
+            self.min_exploration_rate, self.exploration_rate * self.exploration_decay
+        )
 
     def reset(self):
-        self.exploration_rate = 1.0
+        # `reset` é chamado no início de cada episódio: o primeiro não avança a
+        # estratégia de exploração
+        if self.exploration is None:
+            self.exploration_rate = 1.0
+        elif self.episodes_started:
+            self.exploration.on_episode()
+            self.exploration_rate = self.exploration.exploration_rate
+        self.episodes_started += 1
@@ -0,0 +1,45 @@
+import numpy as np
+
+import os
+
+
+def accumulation_dtype(dtype: np.dtype) -> np.dtype:
+    """
+    Type in which updates of a Q-table stored as `dtype` are computed: at least
+    float32, so float16 tables only lose precision when values are stored.
+    """
+    return np.result_type(dtype, np.float32)
+
+
+def memmap_q_table(
+    path: str, shape: tuple[int, ...], dtype: np.dtype = np.float64
+) -> np.memmap:
+    """
+    Opens a Q-table stored in a `.npy` file mapped into memory, creating it zeroed if
+    it does not exist.
+
+    The file is created sparse, so only the pages of the states the agent actually
+    visits take RAM or disk space; the OS pages them in and out as needed. The result
+    is an `np.ndarray` subclass with the same indexing API as an in-memory table, and
+    reopening the same path continues from the values already stored. Call `flush()`
+    on the table to force the values to disk.
+
+    Args:
+        path (str): Path of the `.npy` file.
+        shape (tuple[int, ...]): Shape of the table, e.g. (*state_space_dim, n_actions).
+        dtype (np.dtype): Type of the values.
+
+    Returns:
+        np.memmap: The Q-table.
+    """
+    if not os.path.exists(path):
+        return np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.dtype(dtype), shape=tuple(shape)
+        )
+
+    q_table = np.lib.format.open_memmap(path, mode="r+")
+    assert q_table.shape == tuple(shape) and q_table.dtype == np.dtype(dtype), (
+        f"{path} holds a {q_table.dtype} table of shape {q_table.shape}, "
+        f"expected {np.dtype(dtype)} {tuple(shape)}."
+    )
+    return q_table
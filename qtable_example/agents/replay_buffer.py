@@ -0,0 +1,126 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of transitions stored as parallel NumPy arrays.
+    States are flat state ids (`row * cols + col`) and actions are Q-table columns.
+    """
+
+    def __init__(self, capacity: int, rng: np.random.Generator | None = None):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Maximum number of transitions kept. Once full, the oldest
+                transitions are overwritten.
+            rng (np.random.Generator | None): Random generator used for sampling.
+        """
+        self.capacity = capacity
+        self.rng = rng or np.random.default_rng()
+
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=np.bool_)
+
+        self._cursor = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, state: int, action: int, reward: float, next_state: int, done: bool):
+        """
+        Stores a transition, overwriting the oldest one when the buffer is full.
+        """
+        i = self._cursor
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self._cursor = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def sample(
+        self, batch_size: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Samples `batch_size` transitions uniformly, with replacement.
+
+        Returns:
+            tuple: Arrays (states, actions, rewards, next_states, dones).
+        """
+        idx = self.rng.integers(0, self._size, size=batch_size)
+        return (
+            self.states[idx],
+            self.actions[idx],
+            self.rewards[idx],
+            self.next_states[idx],
+            self.dones[idx],
+        )
+
+
+class BatchedLearner:
+    """
+    Replaces the per-step `QLearningAgent.learn` with minibatch TD updates sampled
+    from a `ReplayBuffer`. Plugged into `Envoriment` through its `replay` argument.
+    """
+
+    def __init__(
+        self,
+        agent: QLearningAgent,
+        buffer: ReplayBuffer,
+        batch_size: int = 32,
+        updates_per_step: int = 1,
+        learning_starts: int | None = None,
+    ):
+        """
+        Initialize the learner.
+
+        Args:
+            agent (QLearningAgent): The agent whose Q-table is updated.
+            buffer (ReplayBuffer): The replay buffer.
+            batch_size (int): Transitions per minibatch.
+            updates_per_step (int): Minibatches applied per observed transition.
+            learning_starts (int | None): Minimum buffer size before learning starts.
+                Defaults to `batch_size`.
+        """
+        self.agent = agent
+        self.buffer = buffer
+        self.batch_size = batch_size
+        self.updates_per_step = updates_per_step
+        self.learning_starts = (
+            batch_size if learning_starts is None else learning_starts
+        )
+
+    def observe(
+        self, state: int, action: int, reward: float, next_state: int, done: bool
+    ):
+        """
+        Stores a transition and applies `updates_per_step` minibatch updates.
+        """
+        self.buffer.add(state, action, reward, next_state, done)
+        self.agent.decay_exploration()
+
+        if len(self.buffer) < self.learning_starts:
+            return
+
+        for _ in range(self.updates_per_step):
+            self.update()
+
+    def update(self) -> np.ndarray:
+        """
+        Samples one minibatch and applies its TD updates.
+
+        Returns:
+            np.ndarray: The TD errors of the unique (state, action) pairs updated.
+        """
+        states, actions, rewards, next_states, dones = self.buffer.sample(
+            self.batch_size
+        )
+        return self.agent.learn_batch(states, actions, rewards, next_states, dones)
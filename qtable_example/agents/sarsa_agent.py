@@ -0,0 +1,167 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.agents.q_table import accumulation_dtype
+from qtable_example.agents.valid_actions import ValidActionsMixin
+
+import numpy as np
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class OnPolicyAgent(ValidActionsMixin, QLearningAgent):
+    """
+    Shared core of the on-policy agents, `ExpectedSarsaAgent` and `SarsaAgent`: the
+    value of a next state is its expected value under the agent's own exploration
+    policy, `sum_a pi(a | s') Q(s', a)`, instead of the greedy value of Q-learning.
+    The expectation is taken over the valid actions of the next state, tracked as in
+    `ValidActionsMixin`.
+
+    These agents run through `Envoriment`, compiled or not and with or without
+    replay. `FastEpisodeRunner` and `VectorEnvoriment` inline the Q-learning update
+    and reject them.
+    """
+
+    CHECKPOINT_ARRAYS = ("valid_matrix", "valid_known")
+
+    def __init__(
+        self,
+        action_space: list[T],
+        state_space_dim: tuple[int, int],
+        *,
+        valid_matrix: np.ndarray | None = None,
+        **kwargs,
+    ):
+        """
+        Initialize the agent.
+
+        Args:
+            valid_matrix (np.ndarray | None): Boolean (n_states, n_actions) mask of the
+                valid actions of each state, indexed like `q_matrix`.
+            Other arguments are the same as `QLearningAgent`.
+        """
+        super().__init__(action_space, state_space_dim, **kwargs)
+        self._init_valid_actions(valid_matrix)
+
+    def learn(self, state, action, reward, next_state):
+        """
+        Update the Q-value for the given state-action pair, through `learn_index`.
+        """
+        self.learn_index(
+            self.state_id(state), action.value, reward, self.state_id(next_state)
+        )
+
+    def _bootstrap(self, next_state: int) -> float:
+        q_values = self.q_matrix[next_state].tolist()
+        valid_values = [
+            q
+            for q, valid in zip(q_values, self.valid_matrix[next_state].tolist())
+            if valid
+        ]
+
+        if self.exploration is None:
+            # epsilon-greedy embutido: ação aleatória com probabilidade epsilon
+            epsilon = self.exploration_rate
+            return epsilon * sum(valid_values) / len(valid_values) + (
+                1.0 - epsilon
+            ) * max(valid_values)
+
+        probabilities = self.exploration.probabilities(
+            self.q_matrix[next_state : next_state + 1],
+            self.valid_matrix[next_state : next_state + 1],
+            np.array([next_state]),
+        )
+        return sum(p * q for p, q in zip(probabilities[0].tolist(), q_values))
+
+    def bootstrap_values(self, next_states: np.ndarray) -> np.ndarray:
+        q_values = self.q_matrix[next_states].astype(accumulation_dtype(self.dtype))
+        valid = self.valid_matrix[next_states]
+
+        if self.exploration is None:
+            epsilon = self.exploration_rate
+            mean = (q_values * valid).sum(axis=1) / valid.sum(axis=1)
+            greedy = np.where(valid, q_values, -np.inf).max(axis=1)
+            return epsilon * mean + (1.0 - epsilon) * greedy
+
+        probabilities = self.exploration.probabilities(q_values, valid, next_states)
+        return (probabilities * q_values).sum(axis=1)
+
+
+class ExpectedSarsaAgent(OnPolicyAgent):
+    """
+    Expected SARSA: every transition bootstraps from the expected value of the next
+    state, see `OnPolicyAgent`.
+    """
+
+
+class SarsaAgent(OnPolicyAgent):
+    """
+    SARSA: bootstraps from the action actually taken in the next state,
+    `Q(s', a')`.
+
+    `a'` is only known on the next call to `act`/`act_index`, so each transition is
+    kept pending and applied right after that action is chosen. A transition still
+    pending when the episode ends (at the solution or at `max_steps`) is applied by
+    `end_episode` with the Expected SARSA value of its next state, which is 0 at the
+    solution, whose Q-values are never updated.
+
+    Batched updates (`learn_batch`, used by replay and planning) have no next action
+    to bootstrap from and use the Expected SARSA value as well.
+    """
+
+    def __init__(
+        self,
+        action_space: list[T],
+        state_space_dim: tuple[int, int],
+        **kwargs,
+    ):
+        """
+        Initialize the SARSA agent. Arguments are the same as `OnPolicyAgent`.
+        """
+        super().__init__(action_space, state_space_dim, **kwargs)
+        self._pending: tuple[int, int, float, int] | None = None
+
+    def act(self, state: tuple, valid_moves: list[T]) -> T:
+        action = super().act(state, valid_moves)
+        self._apply_pending(action.value)
+        return action
+
+    def act_index(self, state: int, valid_actions: tuple[int, ...]) -> int:
+        action = super().act_index(state, valid_actions)
+        self._apply_pending(action)
+        return action
+
+    def learn_index(self, state: int, action: int, reward: float, next_state: int):
+        """
+        Queues the update of a flat state id / action index pair until the next
+        action is chosen.
+        """
+        self._apply_pending(None)
+        self._pending = (state, action, reward, next_state)
+        self.decay_exploration()
+
+    def _apply_pending(self, next_action: int | None):
+        """
+        Applies the pending update, bootstrapping from `Q(s', next_action)`, or from
+        the Expected SARSA value when `next_action` is None.
+        """
+        if self._pending is None:
+            return
+        state, action, reward, next_state = self._pending
+        self._pending = None
+
+        q_matrix = self.q_matrix
+        if next_action is None:
+            future_q_value = self._bootstrap(next_state)
+        else:
+            future_q_value = q_matrix.item(next_state, next_action)
+        current_q_value = q_matrix.item(state, action)
+        td_error = reward + self.discount_factor * future_q_value - current_q_value
+        q_matrix[state, action] = current_q_value + self.learning_rate * td_error
+
+    def end_episode(self):
+        self._apply_pending(None)
+
+    def reset(self):
+        self._apply_pending(None)
+        super().reset()
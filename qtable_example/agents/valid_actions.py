@@ -0,0 +1,51 @@
+import numpy as np
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class ValidActionsMixin:
+    """
+    Keeps a boolean (n_states, n_actions) mask of the valid actions of each state, for
+    agents whose TD target must ignore invalid actions: their Q-values never change
+    from the initial value and would otherwise distort the value of the next state.
+
+    The mask is learned from the calls to `act`/`act_index` (until a state has been
+    visited all actions count as valid), or given up front, e.g.
+    `CompiledMaze.valid_matrix`. Both arrays are listed in `CHECKPOINT_ARRAYS` by the
+    agents that use it, so a resumed run keeps what was learned.
+    """
+
+    def _init_valid_actions(self, valid_matrix: np.ndarray | None):
+        n_states, n_actions = self.q_matrix.shape
+        if valid_matrix is None:
+            self.valid_matrix = np.ones((n_states, n_actions), dtype=np.bool_)
+            self.valid_known = np.zeros(n_states, dtype=np.bool_)
+        else:
+            assert valid_matrix.shape == (
+                n_states,
+                n_actions,
+            ), "valid_matrix shape does not match the Q-table."
+            self.valid_matrix = np.array(valid_matrix, dtype=np.bool_)
+            self.valid_known = np.ones(n_states, dtype=np.bool_)
+
+    def _observe_valid_actions(self, state: int, valid_actions: tuple[int, ...]):
+        """
+        Records the valid actions of a state the first time it is seen.
+        """
+        if self.valid_known.item(state):
+            return
+        self.valid_matrix[state] = False
+        self.valid_matrix[state, list(valid_actions)] = True
+        self.valid_known[state] = True
+
+    def act(self, state: tuple, valid_moves: list[T]) -> T:
+        self._observe_valid_actions(
+            self.state_id(state), tuple(move.value for move in valid_moves)
+        )
+        return super().act(state, valid_moves)
+
+    def act_index(self, state: int, valid_actions: tuple[int, ...]) -> int:
+        self._observe_valid_actions(state, valid_actions)
+        return super().act_index(state, valid_actions)
@@ -0,0 +1,397 @@
+from qtable_example.envoriment import Envoriment
+
+import numpy as np
+
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+
+# layout do bloco compartilhado: metadados int64, valores float64 e a Q-table
+_META_FIELDS = ("sequence", "episode", "step", "total_steps", "row", "col", "done")
+_VALUE_FIELDS = ("exploration_rate", "total_reward")
+_META_BYTES = 64
+_VALUES_BYTES = 64
+_Q_TABLE_OFFSET = _META_BYTES + _VALUES_BYTES
+
+
+class Snapshot:
+    """
+    A consistent copy of the trainer's state at one instant.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        q_table: np.ndarray,
+        position: tuple[int, int],
+        episode: int,
+        step: int,
+        total_steps: int,
+        done: bool,
+        exploration_rate: float,
+        total_reward: float,
+    ):
+        """
+        Args:
+            version (int): Number of snapshots published before this one.
+            q_table (np.ndarray): Copy of the agent's Q-table.
+            position (tuple[int, int]): The agent's cell.
+            episode (int): Episodes completed.
+            step (int): Step within the current episode.
+            total_steps (int): Steps since training started.
+            done (bool): Whether the agent is on the solution.
+            exploration_rate (float): The agent's exploration rate.
+            total_reward (float): Reward accumulated in the current episode.
+        """
+        self.version = version
+        self.q_table = q_table
+        self.position = position
+        self.episode = episode
+        self.step = step
+        self.total_steps = total_steps
+        self.done = done
+        self.exploration_rate = exploration_rate
+        self.total_reward = total_reward
+
+    def __repr__(self) -> str:
+        return (
+            f"Snapshot(version={self.version}, episode={self.episode}, "
+            f"step={self.step}, position={self.position}, "
+            f"exploration_rate={self.exploration_rate:.3f})"
+        )
+
+
+class SnapshotBuffer:
+    """
+    Single-writer, many-reader snapshot of a training run, guarded by a seqlock and
+    stored in `multiprocessing.shared_memory`, so it works between threads and
+    between processes.
+
+    The writer makes the sequence number odd, writes, and makes it even again; a
+    reader copies the data and retries if the sequence was odd or changed meanwhile.
+    Neither side ever blocks the other: the writer is never slowed down by readers.
+    """
+
+    def __init__(
+        self,
+        q_table_shape: tuple[int, ...],
+        dtype: np.dtype = np.float64,
+        name: str | None = None,
+    ):
+        """
+        Creates a new buffer, or attaches to an existing one by name.
+
+        Args:
+            q_table_shape (tuple[int, ...]): Shape of the agent's Q-table.
+            dtype (np.dtype): Type of the agent's Q-table.
+            name (str | None): Name of an existing buffer to attach to.
+        """
+        self.q_table_shape = tuple(q_table_shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = (
+            _Q_TABLE_OFFSET + int(np.prod(self.q_table_shape)) * self.dtype.itemsize
+        )
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=nbytes)
+        self._meta = np.ndarray(
+            (len(_META_FIELDS),), dtype=np.int64, buffer=self.shm.buf
+        )
+        self._values = np.ndarray(
+            (len(_VALUE_FIELDS),),
+            dtype=np.float64,
+            buffer=self.shm.buf,
+            offset=_META_BYTES,
+        )
+        self._q_table = np.ndarray(
+            self.q_table_shape,
+            dtype=self.dtype,
+            buffer=self.shm.buf,
+            offset=_Q_TABLE_OFFSET,
+        )
+        if self.owner:
+            self._meta.fill(0)
+            self._values.fill(0.0)
+            self._q_table.fill(0.0)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def version(self) -> int:
+        """
+        Number of snapshots published so far.
+        """
+        return int(self._meta[0]) // 2
+
+    def publish(
+        self,
+        q_table: np.ndarray,
+        position: tuple[int, int],
+        episode: int,
+        step: int,
+        total_steps: int,
+        done: bool,
+        exploration_rate: float,
+        total_reward: float,
+    ):
+        """
+        Writes a new snapshot. Must only be called from one writer.
+        """
+        sequence = int(self._meta[0])
+        self._meta[0] = sequence + 1
+        np.copyto(self._q_table, q_table, casting="same_kind")
+        self._meta[1:] = (episode, step, total_steps, position[0], position[1], done)
+        self._values[:] = (exploration_rate, total_reward)
+        self._meta[0] = sequence + 2
+
+    def read(self, newer_than: int = -1, max_retries: int = 100) -> "Snapshot | None":
+        """
+        Copies the latest snapshot.
+
+        Args:
+            newer_than (int): Returns None without copying if the latest snapshot's
+                version is not greater than this, e.g. the version already drawn.
+            max_retries (int): Attempts before giving up while the writer keeps
+                overwriting the snapshot.
+
+        Returns:
+            Snapshot | None: The snapshot, or None if there is nothing newer or no
+            consistent copy could be made.
+        """
+        q_table = np.empty(self.q_table_shape, dtype=self.dtype)
+        for _ in range(max_retries):
+            sequence = int(self._meta[0])
+            if sequence // 2 <= newer_than:
+                return None
+            if sequence % 2:
+                # o escritor está no meio de uma escrita
+                time.sleep(0)
+                continue
+
+            np.copyto(q_table, self._q_table)
+            meta = self._meta.tolist()
+            values = self._values.tolist()
+            if int(self._meta[0]) != sequence:
+                continue
+
+            _, episode, step, total_steps, row, col, done = meta
+            exploration_rate, total_reward = values
+            return Snapshot(
+                version=sequence // 2,
+                q_table=q_table,
+                position=(row, col),
+                episode=episode,
+                step=step,
+                total_steps=total_steps,
+                done=bool(done),
+                exploration_rate=exploration_rate,
+                total_reward=total_reward,
+            )
+        return None
+
+    def close(self):
+        """
+        Detaches from the shared block. The owner also frees it.
+        """
+        # os arrays precisam ser liberados antes de fechar o buffer
+        del self._meta, self._values, self._q_table
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class _Publisher:
+    """
+    Publishes snapshots of an environment at most once every `interval` seconds, from
+    a wrapper around its `step`/`step_compiled` installed on the instance.
+    """
+
+    def __init__(self, env: Envoriment, snapshots: SnapshotBuffer, interval: float):
+        self.env = env
+        self.snapshots = snapshots
+        self.interval = interval
+        self.total_steps = 0
+        self._next_publish = 0.0
+
+        step_name = "step_compiled" if env.compiled else "step"
+        step = getattr(env, step_name)
+        perf_counter = time.perf_counter
+
+        # o que estava na instância (por exemplo, um wrapper de `Instrumentation`)
+        self._step_name = step_name
+        self._had_step = step_name in vars(env)
+        self._step = step
+
+        def publishing_step():
+            step()
+            self.total_steps += 1
+            if perf_counter() >= self._next_publish:
+                self.publish()
+
+        setattr(env, step_name, publishing_step)
+
+    def detach(self):
+        """
+        Restores the environment's `step`/`step_compiled` as it was before.
+        """
+        if self._had_step:
+            setattr(self.env, self._step_name, self._step)
+        else:
+            delattr(self.env, self._step_name)
+
+    def publish(self):
+        env = self.env
+        if env.compiled:
+            position = env.maze.position(env.agent_current_state)
+        else:
+            position = env.agent_current_pos
+        self.snapshots.publish(
+            env.agent.q_table,
+            position,
+            env.episode_count,
+            env.current_step,
+            self.total_steps,
+            env.done,
+            getattr(env.agent, "exploration_rate", float("nan")),
+            env.total_reward,
+        )
+        self._next_publish = time.perf_counter() + self.interval
+
+
+def _train(
+    env: Envoriment,
+    snapshots: SnapshotBuffer,
+    stop_event,
+    episodes: int | None,
+    publish_interval: float,
+):
+    publisher = _Publisher(env, snapshots, publish_interval)
+    try:
+        episode = 0
+        while not stop_event.is_set() and (episodes is None or episode < episodes):
+            env.run_episode()
+            env.episode_count += 1
+            episode += 1
+        publisher.publish()
+    finally:
+        publisher.detach()
+
+
+def _train_process(
+    env: Envoriment,
+    snapshots_name: str,
+    q_table_shape: tuple[int, ...],
+    dtype: np.dtype,
+    stop_event,
+    episodes: int | None,
+    publish_interval: float,
+):
+    snapshots = SnapshotBuffer(q_table_shape, dtype, name=snapshots_name)
+    try:
+        _train(env, snapshots, stop_event, episodes, publish_interval)
+    finally:
+        snapshots.close()
+
+
+class TrainingWorker:
+    """
+    Runs `Envoriment` episodes in the background and publishes snapshots of the
+    agent into a `SnapshotBuffer`, so a render loop can follow training without
+    blocking it.
+
+    With `use_process=False` training runs on a thread of this process and trains
+    `env.agent` in place; it shares the GIL with the caller. With `use_process=True`
+    the environment is copied to a separate process and trains at full speed; the
+    caller's agent is not updated and the results are only visible through the
+    snapshots (the last one is published when training stops).
+    """
+
+    def __init__(
+        self,
+        env: Envoriment,
+        snapshots: SnapshotBuffer,
+        episodes: int | None = None,
+        publish_interval: float = 1 / 60,
+        use_process: bool = False,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            env (Envoriment): The environment to train. Its `instrumentation`, if any,
+                must be detached for `use_process=True`.
+            snapshots (SnapshotBuffer): Where the snapshots are published.
+            episodes (int | None): Episodes to run. None runs until `stop`.
+            publish_interval (float): Minimum seconds between snapshots.
+            use_process (bool): Train in a separate process instead of a thread.
+        """
+        assert (
+            snapshots.q_table_shape == env.agent.q_table.shape
+        ), "The snapshot buffer does not match the agent's Q-table."
+        self.env = env
+        self.snapshots = snapshots
+        self.episodes = episodes
+        self.publish_interval = publish_interval
+        self.use_process = use_process
+        self.error: BaseException | None = None
+
+        if use_process:
+            context = multiprocessing.get_context("spawn")
+            self._stop_event = context.Event()
+            self._worker = context.Process(
+                target=_train_process,
+                args=(
+                    env,
+                    snapshots.name,
+                    snapshots.q_table_shape,
+                    snapshots.dtype,
+                    self._stop_event,
+                    episodes,
+                    publish_interval,
+                ),
+                daemon=True,
+            )
+        else:
+            self._stop_event = threading.Event()
+            self._worker = threading.Thread(target=self._run_thread, daemon=True)
+
+    def _run_thread(self):
+        try:
+            _train(
+                self.env,
+                self.snapshots,
+                self._stop_event,
+                self.episodes,
+                self.publish_interval,
+            )
+        except BaseException as error:
+            self.error = error
+
+    def start(self):
+        self._worker.start()
+
+    @property
+    def running(self) -> bool:
+        return self._worker.is_alive()
+
+    def stop(self, timeout: float | None = None):
+        """
+        Asks the worker to stop after the current episode and waits for it.
+        """
+        self._stop_event.set()
+        self.join(timeout)
+
+    def join(self, timeout: float | None = None):
+        """
+        Waits for the worker to finish, raising any error it failed with.
+        """
+        self._worker.join(timeout)
+        if self.use_process and self._worker.exitcode not in (0, None):
+            raise RuntimeError(
+                f"Training process failed with exit code {self._worker.exitcode}."
+            )
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError(f"Training thread failed: {error}") from error
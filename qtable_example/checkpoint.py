@@ -0,0 +1,357 @@
+from qtable_example.exceptions import CheckpointError
+from qtable_example.internal.grid import Grid
+
+import numpy as np
+
+import json
+import os
+import struct
+import threading
+
+MAGIC = b"QTCKPT"
+FORMAT_VERSION = 1
+
+# magic, versão do formato, tamanho do header json
+_PREAMBLE = struct.Struct(f"<{len(MAGIC)}sHI")
+
+# atributos escalares do agente salvos no checkpoint, quando existem
+AGENT_ATTRIBUTES = (
+    "learning_rate",
+    "discount_factor",
+    "exploration_rate",
+    "exploration_decay",
+    "min_exploration_rate",
+    "episodes_started",
+)
+
+
+def _rng_state(agent) -> dict:
+    rng = getattr(agent, "rng", None)
+    if rng is not None:
+        return {"kind": "generator", "state": rng.bit_generator.state}
+
+    state = np.random.get_state(legacy=False)
+    state["state"]["key"] = state["state"]["key"].tolist()
+    return {"kind": "global", "state": state}
+
+
+def _restore_rng(agent, rng_state: dict):
+    state = rng_state["state"]
+    if rng_state["kind"] == "global":
+        state["state"]["key"] = np.asarray(state["state"]["key"], dtype=np.uint32)
+        np.random.set_state(state)
+        return
+
+    if getattr(agent, "rng", None) is None:
+        bit_generator = getattr(np.random, state["bit_generator"], None)
+        if bit_generator is None:
+            raise CheckpointError(
+                f"Unknown bit generator {state['bit_generator']!r} in checkpoint."
+            )
+        agent.rng = np.random.Generator(bit_generator())
+    agent.rng.bit_generator.state = state
+
+
+def _generators(agent) -> dict[str, np.random.Generator]:
+    """
+    The agent's extra random generators, listed in `CHECKPOINT_GENERATORS`.
+    """
+    return {
+        name: getattr(agent, name)
+        for name in getattr(agent, "CHECKPOINT_GENERATORS", ())
+    }
+
+
+def _schedules(agent) -> list:
+    exploration = getattr(agent, "exploration", None)
+    return exploration.schedules if exploration is not None else []
+
+
+def _checkpoint_arrays(agent) -> dict[str, tuple[object, str]]:
+    """
+    Arrays stored in a checkpoint, by name, with the object and attribute holding them:
+    the Q-table, the agent's `CHECKPOINT_ARRAYS` and those of its exploration strategy,
+    prefixed with `exploration.`.
+    """
+    names = ("q_table", *getattr(agent, "CHECKPOINT_ARRAYS", ()))
+    arrays = {name: (agent, name) for name in names}
+    exploration = getattr(agent, "exploration", None)
+    if exploration is not None:
+        for name in exploration.CHECKPOINT_ARRAYS:
+            arrays[f"exploration.{name}"] = (exploration, name)
+    return arrays
+
+
+def snapshot_agent(
+    agent, episode: int = 0, maze_id: str | None = None
+) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    Captures the state of an agent. The arrays are copied, so the agent can keep
+    training while the snapshot is written.
+
+    Args:
+        agent (QLearningAgent): The agent.
+        episode (int): Number of episodes completed.
+        maze_id (str | None): Identity of the maze, see `Grid.fingerprint`.
+
+    Returns:
+        tuple[dict, dict[str, np.ndarray]]: The checkpoint header and copies of the
+        Q-table and of the `CHECKPOINT_ARRAYS` of the agent and of its exploration
+        strategy.
+    """
+    arrays = {
+        name: np.array(getattr(owner, attribute), copy=True, order="C")
+        for name, (owner, attribute) in _checkpoint_arrays(agent).items()
+    }
+    header = {
+        "agent": type(agent).__name__,
+        "episode": int(episode),
+        "maze": maze_id,
+        "attributes": {
+            name: getattr(agent, name)
+            for name in AGENT_ATTRIBUTES
+            if hasattr(agent, name)
+        },
+        "rng": _rng_state(agent),
+        "generators": {
+            name: generator.bit_generator.state
+            for name, generator in _generators(agent).items()
+        },
+        "schedules": [schedule.t for schedule in _schedules(agent)],
+        "arrays": [
+            {
+                "name": name,
+                "dtype": np.lib.format.dtype_to_descr(array.dtype),
+                "shape": list(array.shape),
+            }
+            for name, array in arrays.items()
+        ],
+    }
+    return header, arrays
+
+
+def write_checkpoint(path: str, header: dict, arrays: dict[str, np.ndarray]):
+    """
+    Writes a snapshot to `path` atomically: the file is written next to it and then
+    renamed, so a crash never leaves a truncated checkpoint behind.
+
+    Layout: magic, format version (uint16), header size (uint32), JSON header, and the
+    raw C-ordered bytes of each array listed in `header["arrays"]`, in order.
+    """
+    encoded = json.dumps(header).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        file.write(encoded)
+        for entry in header["arrays"]:
+            file.write(np.ascontiguousarray(arrays[entry["name"]]).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path: str) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    Reads a checkpoint written by `write_checkpoint`.
+
+    Returns:
+        tuple[dict, dict[str, np.ndarray]]: The header and the arrays by name; the
+        Q-table is `arrays["q_table"]`.
+    """
+    with open(path, "rb") as file:
+        preamble = file.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise CheckpointError(f"{path} is too short to be a checkpoint.")
+
+        magic, version, header_size = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise CheckpointError(f"{path} is not a checkpoint.")
+        if version != FORMAT_VERSION:
+            raise CheckpointError(
+                f"{path} uses format version {version}, not the supported "
+                f"version {FORMAT_VERSION}."
+            )
+
+        header = json.loads(file.read(header_size).decode("utf-8"))
+        arrays = {}
+        for entry in header["arrays"]:
+            dtype = np.dtype(np.lib.format.descr_to_dtype(entry["dtype"]))
+            shape = tuple(entry["shape"])
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            data = file.read(nbytes)
+            if len(data) != nbytes:
+                raise CheckpointError(f"{path} has a truncated {entry['name']}.")
+            arrays[entry["name"]] = np.frombuffer(data, dtype=dtype).reshape(shape)
+
+    return header, {name: array.copy() for name, array in arrays.items()}
+
+
+def save_agent(path: str, agent, episode: int = 0, grid: Grid | None = None):
+    """
+    Saves the Q-table, hyperparameters, exploration rate, random state (including the
+    agent's `CHECKPOINT_GENERATORS`) and episode counter of an agent.
+
+    Args:
+        path (str): Destination file.
+        agent (QLearningAgent): The agent.
+        episode (int): Number of episodes completed.
+        grid (Grid | None): The maze the agent was trained on, to be checked on load.
+    """
+    maze_id = grid.fingerprint() if grid is not None else None
+    write_checkpoint(path, *snapshot_agent(agent, episode, maze_id))
+
+
+def load_agent(path: str, agent, grid: Grid | None = None) -> int:
+    """
+    Restores a checkpoint into an existing agent. The arrays are copied into the
+    agent's arrays in place, so shared or file-backed tables keep their storage.
+
+    Args:
+        path (str): Checkpoint file.
+        agent (QLearningAgent): Agent with the same class and Q-table shape.
+        grid (Grid | None): If given, must be the maze the checkpoint was saved with.
+
+    Returns:
+        int: The episode counter stored in the checkpoint.
+    """
+    header, arrays = read_checkpoint(path)
+
+    if header["agent"] != type(agent).__name__:
+        raise CheckpointError(
+            f"Checkpoint was saved from {header['agent']}, not {type(agent).__name__}."
+        )
+    targets = {
+        name: getattr(owner, attribute)
+        for name, (owner, attribute) in _checkpoint_arrays(agent).items()
+    }
+    if set(arrays) != set(targets):
+        raise CheckpointError(
+            f"Checkpoint arrays {sorted(arrays)} do not match the agent's "
+            f"{sorted(targets)}."
+        )
+    for name, target in targets.items():
+        if arrays[name].shape != target.shape:
+            raise CheckpointError(
+                f"Checkpoint {name} shape {arrays[name].shape} does not match the "
+                f"agent's {target.shape}."
+            )
+    if (
+        grid is not None
+        and header["maze"] is not None
+        and header["maze"] != grid.fingerprint()
+    ):
+        raise CheckpointError("Checkpoint was saved on a different maze.")
+    generators = _generators(agent)
+    if set(header["generators"]) != set(generators):
+        raise CheckpointError("Checkpoint random generators do not match the agent.")
+
+    for name, target in targets.items():
+        target[...] = arrays[name]
+    for name, value in header["attributes"].items():
+        setattr(agent, name, value)
+    _restore_rng(agent, header["rng"])
+    for name, generator in generators.items():
+        generator.bit_generator.state = header["generators"][name]
+
+    schedules = _schedules(agent)
+    schedule_steps = header["schedules"]
+    if len(schedule_steps) != len(schedules):
+        raise CheckpointError(
+            "Checkpoint exploration schedules do not match the agent."
+        )
+    for schedule, t in zip(schedules, schedule_steps):
+        schedule.t = t
+        schedule.value = schedule.at(t)
+    return header["episode"]
+
+
+class CheckpointWriter:
+    """
+    Writes agent checkpoints on a background thread.
+
+    `submit` only copies the agent state; the file is written by the worker thread.
+    If a new snapshot arrives while the previous one is still waiting to be written,
+    the older one is dropped, so training never blocks on disk I/O.
+    """
+
+    def __init__(self, path: str, every: int = 100):
+        """
+        Initialize the writer.
+
+        Args:
+            path (str): Checkpoint file. May contain `{episode}` to keep one file per
+                checkpoint instead of overwriting it.
+            every (int): Episodes between checkpoints when used by `Envoriment.run`.
+        """
+        assert every > 0, "every must be positive."
+        self.path = path
+        self.every = every
+        self.written = 0
+        self.last_path: str | None = None
+        self.error: BaseException | None = None
+
+        self._condition = threading.Condition()
+        self._pending: tuple[str, dict, dict[str, np.ndarray]] | None = None
+        self._writing = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, agent, episode: int, maze_id: str | None = None):
+        """
+        Snapshots the agent and queues the snapshot for writing.
+        """
+        header, arrays = snapshot_agent(agent, episode, maze_id)
+        path = self.path.format(episode=episode)
+        with self._condition:
+            self._raise_error()
+            assert not self._closed, "CheckpointWriter is closed."
+            self._pending = (path, header, arrays)
+            self._condition.notify_all()
+
+    def wait(self):
+        """
+        Blocks until every submitted snapshot has been written (or dropped).
+        """
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+            self._raise_error()
+
+    def close(self):
+        """
+        Writes the pending snapshot and stops the worker thread.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise CheckpointError(f"Failed to write checkpoint: {error}") from error
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                path, header, arrays = self._pending
+                self._pending = None
+                self._writing = True
+
+            try:
+                write_checkpoint(path, header, arrays)
+            except BaseException as error:
+                self.error = error
+            else:
+                self.written += 1
+                self.last_path = path
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
@@ -0,0 +1,167 @@
+import numpy as np
+
+from collections import deque
+
+
+class ConvergenceMonitor:
+    """
+    Tracks per-episode convergence statistics of a Q-table and decides when training
+    can stop.
+
+    Statistics, one entry per episode:
+    - `max_deltas` / `mean_deltas`: max and mean |ΔQ| over the entries that changed.
+    - `policy_changes`: number of states whose greedy action changed. With
+      `valid_actions`, only states with a valid action count, and the greedy action is
+      taken among the valid ones.
+    - `successes`: whether the episode reached the solution.
+
+    Each stopping criterion can be disabled with None; training is considered converged
+    once every enabled criterion holds (and at least `min_episodes` have run).
+    """
+
+    def __init__(
+        self,
+        delta_tolerance: float | None = 1e-3,
+        policy_stable_episodes: int | None = 10,
+        min_success_rate: float | None = None,
+        success_window: int = 20,
+        min_episodes: int = 10,
+        valid_actions: np.ndarray | None = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            delta_tolerance (float | None): Max |ΔQ| in an episode below which the
+                values are considered stable.
+            policy_stable_episodes (int | None): Consecutive episodes without any change
+                of the greedy policy required.
+            min_success_rate (float | None): Minimum success rate over the last
+                `success_window` episodes.
+            success_window (int): Size of the sliding window of the success rate.
+            min_episodes (int): Episodes to run before convergence can be declared.
+            valid_actions (np.ndarray | None): Boolean (n_states, n_actions) mask of the
+                valid actions, in the layout of `q_table.reshape(-1, n_actions)` (see
+                `Envoriment.valid_action_matrix`). `Envoriment.run` sets it when None.
+        """
+        assert (
+            delta_tolerance is not None
+            or policy_stable_episodes is not None
+            or min_success_rate is not None
+        ), "At least one stopping criterion must be enabled."
+
+        self.delta_tolerance = delta_tolerance
+        self.policy_stable_episodes = policy_stable_episodes
+        self.min_success_rate = min_success_rate
+        self.success_window = success_window
+        self.min_episodes = min_episodes
+
+        self.max_deltas: list[float] = []
+        self.mean_deltas: list[float] = []
+        self.policy_changes: list[int] = []
+        self.successes: list[bool] = []
+        self.stable_policy_episodes = 0
+        self.converged = False
+
+        self._recent_successes = deque(maxlen=success_window)
+        self._snapshot: np.ndarray | None = None
+        self._policy: np.ndarray | None = None
+        self.valid_actions: np.ndarray | None = None
+        self._policy_states: np.ndarray | None = None
+        if valid_actions is not None:
+            self.set_valid_actions(valid_actions)
+
+    def set_valid_actions(self, valid_actions: np.ndarray):
+        """
+        Restricts the greedy policy to the valid actions of the states that have any.
+
+        Args:
+            valid_actions (np.ndarray): Boolean (n_states, n_actions) mask.
+        """
+        self.valid_actions = np.asarray(valid_actions, dtype=bool)
+        self._policy_states = np.flatnonzero(self.valid_actions.any(axis=1))
+        self._policy = None
+
+    @property
+    def episodes(self) -> int:
+        return len(self.successes)
+
+    @property
+    def success_rate(self) -> float:
+        """
+        Success rate over the sliding window.
+        """
+        if not self._recent_successes:
+            return 0.0
+        return sum(self._recent_successes) / len(self._recent_successes)
+
+    def start_episode(self, q_table: np.ndarray):
+        """
+        Takes a snapshot of the Q-table before the episode runs.
+        """
+        if self._snapshot is None or self._snapshot.shape != q_table.shape:
+            self._snapshot = np.empty_like(q_table)
+        np.copyto(self._snapshot, q_table)
+
+    def end_episode(self, success: bool, q_table: np.ndarray) -> bool:
+        """
+        Records the statistics of the episode that just ended.
+
+        Args:
+            success (bool): Whether the episode reached the solution.
+            q_table (np.ndarray): The Q-table after the episode.
+
+        Returns:
+            bool: True if training has converged.
+        """
+        delta = np.abs(q_table - self._snapshot)
+        changed = delta[delta > 0]
+        self.max_deltas.append(float(changed.max()) if changed.size else 0.0)
+        self.mean_deltas.append(float(changed.mean()) if changed.size else 0.0)
+
+        policy = self._greedy_policy(q_table)
+        if self._policy is None:
+            changes = policy.size
+        else:
+            changes = int(np.count_nonzero(policy != self._policy))
+        self._policy = policy
+        self.policy_changes.append(changes)
+        self.stable_policy_episodes = (
+            self.stable_policy_episodes + 1 if not changes else 0
+        )
+
+        self.successes.append(bool(success))
+        self._recent_successes.append(bool(success))
+
+        self.converged = self._check()
+        return self.converged
+
+    def _greedy_policy(self, q_table: np.ndarray) -> np.ndarray:
+        q_matrix = q_table.reshape(-1, q_table.shape[-1])
+        if self.valid_actions is None:
+            return q_matrix.argmax(axis=1)
+
+        states = self._policy_states
+        return np.where(self.valid_actions[states], q_matrix[states], -np.inf).argmax(
+            axis=1
+        )
+
+    def _check(self) -> bool:
+        if self.episodes < self.min_episodes:
+            return False
+        if (
+            self.delta_tolerance is not None
+            and self.max_deltas[-1] >= self.delta_tolerance
+        ):
+            return False
+        if (
+            self.policy_stable_episodes is not None
+            and self.stable_policy_episodes < self.policy_stable_episodes
+        ):
+            return False
+        if self.min_success_rate is not None and (
+            len(self._recent_successes) < self.success_window
+            or self.success_rate < self.min_success_rate
+        ):
+            return False
+        return True
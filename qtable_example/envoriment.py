@@ -1,6 +1,18 @@
 from qtable_example.agents.base_agent import BaseAgent
+from qtable_example.checkpoint import CheckpointWriter, load_agent
+from qtable_example.convergence import ConvergenceMonitor
 from qtable_example.internal.grid import Grid
 from qtable_example.enums import Directions
+from qtable_example.instrumentation import Instrumentation
+from qtable_example.metrics import MetricsRecorder, PrintSink
+
+import numpy as np
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from qtable_example.agents.replay_buffer import BatchedLearner
 
 
 class Envoriment:
@@ -12,16 +24,64 @@ class Envoriment:
         agent: BaseAgent,
         solution_position: tuple[int, int],
         max_steps: int = 1_000,
+        compiled: bool = False,
+        replay: "BatchedLearner | None" = None,
+        instrumentation: Instrumentation | None = None,
+        start_position: tuple[int, int] = (0, 0),
     ):
+        """
+        Initialize the environment.
+
+        Args:
+            grid (Grid): The maze.
+            agent (BaseAgent): The agent.
+            solution_position (tuple[int, int]): The solution cell.
+            max_steps (int): The maximum number of steps per episode.
+            compiled (bool): If True, compiles the grid with `Grid.compile` and steps
+                through its tables using flat state ids (`agent.act_index`/`learn_index`),
+                or the agent's compact ids when it has a `state_index`.
+            replay (BatchedLearner | None): If given, transitions go through its replay
+                buffer and minibatch updates instead of `agent.learn`.
+            instrumentation (Instrumentation | None): If given, it is attached to the
+                environment and times each phase of the training loop; its `stats`
+                can be polled while training.
+            start_position (tuple[int, int]): The cell every episode starts from.
+        """
         self.grid = grid
         self.agent = agent
-        self.agent_start_pos = (0, 0)
+        self.agent_start_pos = start_position
         self.agent_current_pos = self.agent_start_pos
         self.solution_position = solution_position
         self.done = False
         self.max_steps = max_steps
         self.current_step = 0
+        self.total_reward = 0.0
         self.episodes = 1000
+        self.episode_count = 0
+        self._maze_id: str | None = None
+        self.replay = replay
+
+        self.compiled = compiled
+        self.maze = None
+        if compiled:
+            # agentes com índice compacto usam os mesmos ids nas tabelas
+            self.maze = grid.compile(
+                self.INVALID_ACTION_PENALTY,
+                actions=self.agent.action_space,
+                state_index=getattr(self.agent, "state_index", None),
+            )
+            # listas python são mais rápidas que arrays numpy para acesso escalar
+            self._next_state = self.maze.next_state.tolist()
+            self._reward = self.maze.reward.tolist()
+            self._valid_mask = self.maze.valid_mask.tolist()
+            self._valid_actions = self.maze.valid_actions_table
+            self.agent_start_state = self.maze.state_id(self.agent_start_pos)
+            self.agent_current_state = self.agent_start_state
+            self.solution_state = self.maze.state_id(solution_position)
+
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     def step(self):
         """
@@ -47,86 +107,276 @@ class Envoriment:
             self.agent_current_pos, action, ignore_out_of_bounds=True
         )
 
-        next_tile = self.grid.get_tile(next_state)
-        if next_tile is None or next_tile.empty:
+        if self.grid.is_out_of_bounds(next_state) or not self.grid.occupied[next_state]:
             reward = self.INVALID_ACTION_PENALTY
         else:
-            reward = next_tile.reward
+            reward = self.grid.rewards.item(next_state)
+
+        done = next_state == self.solution_position
 
         # aprende
-        self.agent.learn(
-            state=self.agent_current_pos,
-            action=action,
-            reward=reward,
-            next_state=next_state,
-        )
+        if self.replay is None:
+            self.agent.learn(
+                state=self.agent_current_pos,
+                action=action,
+                reward=reward,
+                next_state=next_state,
+            )
+        else:
+            state_id = self.replay.agent.state_id
+            self.replay.observe(
+                state_id(self.agent_current_pos),
+                action.value,
+                reward,
+                state_id(next_state),
+                done,
+            )
 
         # Atualiza a posição do agente
         self.agent_current_pos = next_state
-        self.done = self.agent_current_pos == self.solution_position
+        self.total_reward += reward
+        self.done = done
+
+    def step_compiled(self):
+        """
+        Execute an action in the environment using the compiled maze tables.
+        Same semantics as `step`, but without dict/tuple/enum allocations.
+        """
+        state = self.agent_current_state
+        valid_actions = self._valid_actions[self._valid_mask[state]]
+
+        # tecnicamente, é impossível não ter ações válidas, pela construção do grid
+        assert valid_actions, "No valid actions available"
 
-    def run(self):
+        action = self.agent.act_index(state, valid_actions)
+        next_state = self._next_state[state][action]
+
+        reward = self._reward[state][action]
+        done = next_state == self.solution_state
+
+        # aprende
+        if self.replay is None:
+            self.agent.learn_index(state, action, reward, next_state)
+        else:
+            self.replay.observe(state, action, reward, next_state, done)
+
+        # Atualiza o estado do agente
+        self.agent_current_state = next_state
+        self.total_reward += reward
+        self.done = done
+
+    def run_episode(self):
         """
-        Run the environment for a number of steps.
+        Run a single episode, until the solution is reached or `max_steps` is exhausted.
         """
-        for _ in range(self.episodes):
-            self.agent.reset()
-            self.agent_current_pos = self.agent_start_pos
-            self.done = False
-            self.current_step = 0
+        self.agent.reset()
+        self.agent_current_pos = self.agent_start_pos
+        self.done = False
+        self.current_step = 0
+        self.total_reward = 0.0
+        if self.compiled:
+            self.agent_current_state = self.agent_start_state
+            while not self.done and self.current_step < self.max_steps:
+                self.step_compiled()
+                self.current_step += 1
+            self.agent_current_pos = self.maze.position(self.agent_current_state)
+        else:
             while not self.done and self.current_step < self.max_steps:
                 self.step()
                 self.current_step += 1
+        self.agent.end_episode()
+
+    def valid_action_matrix(self) -> np.ndarray:
+        """
+        Boolean mask of the valid actions of every occupied cell, in the layout of
+        `agent.q_table.reshape(-1, n_actions)`. Empty cells have no valid action.
+
+        Returns:
+            np.ndarray: Mask of shape (n_states, n_actions).
+        """
+        maze = self.maze
+        if maze is None:
+            maze = self.grid.compile(
+                self.INVALID_ACTION_PENALTY,
+                actions=self.agent.action_space,
+                state_index=getattr(self.agent, "state_index", None),
+            )
+        return maze.valid_matrix & maze.occupied[:, None]
+
+    def run(
+        self,
+        episodes: int | None = None,
+        monitor: ConvergenceMonitor | None = None,
+        recorder: MetricsRecorder | None = None,
+        checkpoint: CheckpointWriter | None = None,
+        verbose: bool = True,
+    ) -> int:
+        """
+        Run the environment for a number of episodes. `episodes` counts only the
+        episodes of this call, like `VectorEnvoriment.run`: after `resume`, run
+        `total - self.episode_count` episodes to finish a run of `total` episodes.
+        `episode_count` keeps counting across calls and is the episode stored in
+        checkpoints.
+
+        Args:
+            episodes (int | None): Maximum number of episodes of this call. Defaults to
+                `self.episodes`.
+            monitor (ConvergenceMonitor | None): If given, tracks convergence of the
+                agent's Q-table and stops as soon as its criteria are met.
+            recorder (MetricsRecorder | None): If given, receives the metrics of every
+                episode. It is flushed, but not closed, when the run ends.
+            checkpoint (CheckpointWriter | None): If given, the agent is checkpointed
+                every `checkpoint.every` episodes (of `episode_count`) and when the run
+                ends. Pending writes are waited for before returning.
+            verbose (bool): Without a recorder, prints episode metrics through a
+                rate-limited `PrintSink`.
+
+        Returns:
+            int: The number of episodes run in this call.
+        """
+        if episodes is None:
+            episodes = self.episodes
+        if recorder is None and verbose:
+            recorder = MetricsRecorder(capacity=1, sinks=[PrintSink()])
+
+        if monitor is not None and monitor.valid_actions is None:
+            monitor.set_valid_actions(self.valid_action_matrix())
+
+        try:
+            for episode in range(episodes):
+                if monitor is not None:
+                    monitor.start_episode(self.agent.q_table)
+
+                start = time.perf_counter()
+                self.run_episode()
+                wall_time = time.perf_counter() - start
+                self.episode_count += 1
+
+                converged = monitor is not None and monitor.end_episode(
+                    self.done, self.agent.q_table
+                )
+                if recorder is not None:
+                    recorder.record(
+                        steps=self.current_step,
+                        total_reward=self.total_reward,
+                        success=self.done,
+                        exploration_rate=getattr(
+                            self.agent, "exploration_rate", float("nan")
+                        ),
+                        wall_time=wall_time,
+                        max_delta_q=(
+                            monitor.max_deltas[-1]
+                            if monitor is not None
+                            else float("nan")
+                        ),
+                    )
+
+                if checkpoint is not None and (
+                    converged
+                    or episode + 1 == episodes
+                    or self.episode_count % checkpoint.every == 0
+                ):
+                    checkpoint.submit(
+                        self.agent, self.episode_count, maze_id=self.maze_id
+                    )
+
+                if converged:
+                    if verbose:
+                        print(f"Converged after {episode + 1} episodes.")
+                    return episode + 1
+        finally:
+            if recorder is not None:
+                recorder.flush()
+            if checkpoint is not None:
+                checkpoint.wait()
+
+        return episodes
+
+    @property
+    def maze_id(self) -> str:
+        """
+        Identity of the maze stored in checkpoints (see `Grid.fingerprint`).
+        """
+        if self._maze_id is None:
+            self._maze_id = self.grid.fingerprint()
+        return self._maze_id
+
+    def resume(self, path: str) -> int:
+        """
+        Restores the agent and the episode counter from a checkpoint of this maze.
+        The following `run(episodes)` runs `episodes` more episodes on top of it.
+
+        Args:
+            path (str): Checkpoint file written by `save_agent` or `CheckpointWriter`.
+
+        Returns:
+            int: The number of episodes completed before the checkpoint.
+        """
+        self.episode_count = load_agent(path, self.agent, grid=self.grid)
+        return self.episode_count
+
+
+if __name__ == "__main__":
+    # exemplo
+    from qtable_example.agents.q_learng_agent import QLearningAgent
+    from qtable_example.internal.map_generator import MapGenerator
+    from qtable_example.seeding import RunSeeds
+
+    GRID_SIZE = (10, 10)  # in cells
+    TILE_SIZE = 64
+    GRID_START_POSITION = (0, 0)  # in pixels on the screen
+    SEED = 41  # seed for random generation
+    MAX_MAX_LENGTH = 100  # max length of the path
+    GAME_MAX_REWARD = 10.0  # max reward for the game
+    GAME_MIN_REWARD = -20  # min reward for the game
+    MAX_CELL_NEIGHBORS = (
+        2  # max number of neighbors for each cell when generating the map
+    )
+    MAP_GENERATION_CREATE_SUBPATH_PROBABILITY = 0.9  # probability of creating a subpath
+
+    seeds = RunSeeds(SEED)
+
+    grid_size = (20, 20)
+    grid = Grid(grid_size=grid_size)
+    map_generator = MapGenerator(
+        grid=grid,
+        map_max_length=MAX_MAX_LENGTH,
+        max_reward=GAME_MAX_REWARD,
+        min_reward=GAME_MIN_REWARD,
+        max_cell_neighbors=MAX_CELL_NEIGHBORS,
+        map_generation_create_subpath_probability=MAP_GENERATION_CREATE_SUBPATH_PROBABILITY,
+        rng=seeds.map_rng(),
+    )
+
+    map_generator.generate_map(start_cell_position=(0, 0))
+    solution = grid.generate_random_solution(
+        only_terminal=False,
+        rng=seeds.solution_rng(),
+    )
+    map_generator.generate_euclidian_rewards(
+        solution=solution,
+    )
+
+    agent = QLearningAgent(
+        action_space=[
+            Directions.UP,
+            Directions.DOWN,
+            Directions.LEFT,
+            Directions.RIGHT,
+        ],
+        state_space_dim=grid_size,
+        rng=seeds.agent_rng(),
+    )
+
+    env = Envoriment(
+        grid=grid,
+        agent=agent,
+        solution_position=solution.grid_position,
+        max_steps=1000,
+        instrumentation=Instrumentation(),
+    )
 
-            if self.done:
-                print("Agent reached the solution position!")
-            else:
-                print("Max steps reached without finding the solution.")
-
-
-# exemplo
-from qtable_example.agents.q_learng_agent import QLearningAgent
-from qtable_example.internal.map_generator import MapGenerator
-
-GRID_SIZE = (10, 10)  # in cells
-TILE_SIZE = 64
-GRID_START_POSITION = (0, 0)  # in pixels on the screen
-SEED = 41  # seed for random generation
-MAX_MAX_LENGTH = 100  # max length of the path
-GAME_MAX_REWARD = 10.0  # max reward for the game
-GAME_MIN_REWARD = -20  # min reward for the game
-MAX_CELL_NEIGHBORS = 2  # max number of neighbors for each cell when generating the map
-MAP_GENERATION_CREATE_SUBPATH_PROBABILITY = 0.9  # probability of creating a subpath
-
-
-seed = 41
-
-grid_size = (20, 20)
-grid = Grid(grid_size=grid_size)
-map_generator = MapGenerator(
-    grid=grid,
-    map_max_length=MAX_MAX_LENGTH,
-    max_reward=GAME_MAX_REWARD,
-    min_reward=GAME_MIN_REWARD,
-    max_cell_neighbors=MAX_CELL_NEIGHBORS,
-    map_generation_create_subpath_probability=MAP_GENERATION_CREATE_SUBPATH_PROBABILITY,
-)
-
-map_generator.generate_map(start_cell_position=(0, 0), seed=seed)
-solution = grid.generate_random_solution(
-    only_terminal=False,
-)
-map_generator.generate_euclidian_rewards(
-    solution=solution,
-)
-
-agent = QLearningAgent(
-    action_space=[Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT],
-    state_space_dim=grid_size,
-)
-
-env = Envoriment(
-    grid=grid, agent=agent, solution_position=solution.grid_position, max_steps=1000
-)
-
-env.run()
+    recorder = MetricsRecorder("metrics", sinks=[PrintSink(min_interval=0.5)])
+    env.run(monitor=ConvergenceMonitor(), recorder=recorder)
+    recorder.close()
+    print(env.instrumentation.stats)
@@ -12,3 +12,11 @@ class AlreadyOccupiedError(Exception):
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
+
+
+class CheckpointError(Exception):
+    """Exception raised when a checkpoint cannot be read or does not match the agent."""
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,355 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.envoriment import Envoriment
+from qtable_example.fast_episode import FastEpisodeRunner
+from qtable_example.internal.compiled_maze import CompiledMaze
+from qtable_example.internal.grid import Grid
+from qtable_example.internal.map_generator import MapGenerator
+from qtable_example.internal.tile import Tile
+from qtable_example.seeding import RunSeeds
+
+import numpy as np
+
+import itertools
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable
+
+# variáveis de ambiente que controlam as threads das bibliotecas usadas pelo numpy
+NUMPY_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+RESULTS_DTYPE = np.dtype(
+    [
+        ("job", np.int64),
+        ("map_seed", np.int64),
+        ("agent_seed", np.int64),
+        ("learning_rate", np.float64),
+        ("discount_factor", np.float64),
+        ("exploration_decay", np.float64),
+        ("episode", np.int64),
+        ("steps", np.int64),
+        ("total_reward", np.float64),
+        ("success", np.bool_),
+    ]
+)
+
+# estado de cada processo worker, preenchido uma única vez por `_init_worker`
+_worker_mazes: dict[int, tuple[CompiledMaze, tuple[int, int]]] = {}
+_worker_queue = None
+
+
+def generate_maze(
+    map_seed: int,
+    grid_size: tuple[int, int] = (20, 20),
+    start_position: tuple[int, int] = (0, 0),
+    map_max_length: int = 100,
+    max_reward: float = 10.0,
+    min_reward: float = -20,
+    max_cell_neighbors: int = 2,
+    map_generation_create_subpath_probability: float = 0.9,
+) -> tuple[Grid, Tile]:
+    """
+    Generates a maze the same way the `envoriment.py` example does: the map and the
+    solution use the `map_rng` and `solution_rng` streams of `RunSeeds(map_seed)`, so
+    with the default arguments (the example's constants) the example's `SEED` yields
+    the same maze. No global random state is used, so it is safe to call from
+    parallel runs.
+
+    Args:
+        map_seed (int): Root seed of the maze's `RunSeeds`.
+        grid_size (tuple[int, int]): The grid size in cells.
+        start_position (tuple[int, int]): The cell the map is generated from.
+        The remaining arguments are forwarded to `MapGenerator`.
+
+    Returns:
+        tuple[Grid, Tile]: The grid and its solution tile.
+    """
+    grid = Grid(grid_size=grid_size)
+    seeds = RunSeeds(map_seed)
+    map_generator = MapGenerator(
+        grid=grid,
+        map_max_length=map_max_length,
+        max_reward=max_reward,
+        min_reward=min_reward,
+        max_cell_neighbors=max_cell_neighbors,
+        map_generation_create_subpath_probability=map_generation_create_subpath_probability,
+        rng=seeds.map_rng(),
+    )
+    map_generator.generate_map(start_cell_position=start_position)
+    solution = grid.generate_random_solution(
+        only_terminal=False, rng=seeds.solution_rng()
+    )
+    map_generator.generate_euclidian_rewards(solution=solution)
+    return grid, solution
+
+
+@contextmanager
+def single_threaded_numpy():
+    """
+    Limits the BLAS/OpenMP thread pools of processes started inside the context to one
+    thread each, so N workers use N cores instead of N * cores threads.
+    """
+    previous = {name: os.environ.get(name) for name in NUMPY_THREAD_ENV_VARS}
+    os.environ.update({name: "1" for name in NUMPY_THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def available_cpus() -> int:
+    """
+    Returns the number of CPUs this process is allowed to run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _init_worker(mazes, results_queue):
+    global _worker_queue
+    _worker_mazes.update(mazes)
+    _worker_queue = results_queue
+
+
+def _run_job(
+    job_id: int,
+    map_seed: int,
+    agent_seed: int,
+    agent_params: dict,
+    episodes: int,
+    max_steps: int,
+    start_position: tuple[int, int],
+    chunk_size: int,
+):
+    maze, solution_position = _worker_mazes[map_seed]
+    agent = QLearningAgent(
+        action_space=list(maze.actions),
+        state_space_dim=maze.grid_size,
+        rng=RunSeeds(agent_seed).agent_rng(),
+        **agent_params,
+    )
+    runner = FastEpisodeRunner(
+        maze,
+        agent,
+        solution_position=solution_position,
+        start_position=start_position,
+        max_steps=max_steps,
+    )
+
+    chunk = []
+
+    def stream(episode, steps, total_reward, success):
+        chunk.append((episode, steps, total_reward, success))
+        if len(chunk) == chunk_size:
+            _worker_queue.put(("episodes", job_id, chunk.copy()))
+            chunk.clear()
+
+    runner.run(episodes, callback=stream)
+    if chunk:
+        _worker_queue.put(("episodes", job_id, chunk))
+    _worker_queue.put(("done", job_id, None))
+
+
+class ExperimentRunner:
+    """
+    Fans out (map seed, agent params) jobs over a `ProcessPoolExecutor`.
+
+    Mazes are generated and compiled once in the parent and shipped to each worker
+    through the pool initializer, so jobs only carry seeds and hyperparameters.
+    Per-episode results are streamed back through a queue while the jobs run and
+    aggregated into a single structured array (`RESULTS_DTYPE`).
+    """
+
+    def __init__(
+        self,
+        build_maze: Callable[[int], tuple[Grid, Tile]] = generate_maze,
+        episodes: int = 1_000,
+        max_steps: int = 1_000,
+        start_position: tuple[int, int] = (0, 0),
+        max_workers: int | None = None,
+        chunk_size: int = 100,
+        progress: Callable[[int, int, int, int], None] | None = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            build_maze (Callable): Builds the (grid, solution) of a map seed. Only
+                called in the parent process.
+            episodes (int): Episodes per job.
+            max_steps (int): The maximum number of steps per episode.
+            start_position (tuple[int, int]): The start cell of every episode.
+            max_workers (int | None): Number of worker processes. Defaults to every
+                CPU available to this process.
+            chunk_size (int): How many episode results a worker sends at once.
+            progress (Callable | None): Called with (completed_jobs, total_jobs,
+                completed_episodes, total_episodes) whenever results arrive.
+                Defaults to printing a line per finished job.
+        """
+        self.build_maze = build_maze
+        self.episodes = episodes
+        self.max_steps = max_steps
+        self.start_position = start_position
+        self.max_workers = max_workers or available_cpus()
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    def compile_mazes(
+        self, map_seeds: list[int]
+    ) -> dict[int, tuple[CompiledMaze, tuple[int, int]]]:
+        """
+        Generates and compiles the maze of each map seed.
+
+        Args:
+            map_seeds (list[int]): The map seeds.
+
+        Returns:
+            dict[int, tuple[CompiledMaze, tuple[int, int]]]: Compiled maze and solution
+            position per map seed.
+        """
+        mazes = {}
+        for map_seed in dict.fromkeys(map_seeds):
+            grid, solution = self.build_maze(map_seed)
+            mazes[map_seed] = (
+                grid.compile(Envoriment.INVALID_ACTION_PENALTY),
+                solution.grid_position,
+            )
+        return mazes
+
+    def run(
+        self,
+        map_seeds: list[int],
+        param_grid: dict[str, list],
+        agent_seeds: list[int] = (0,),
+    ) -> np.ndarray:
+        """
+        Runs one job per combination of map seed, agent seed and hyperparameters.
+
+        Args:
+            map_seeds (list[int]): The map seeds.
+            param_grid (dict[str, list]): Values of each `QLearningAgent` keyword
+                argument, e.g. {"learning_rate": [0.1, 0.5], "discount_factor": [0.9]}.
+            agent_seeds (list[int]): Root seeds of the agents' random generators, each
+                drawn from the `agent_rng` stream of `RunSeeds(agent_seed)`. Jobs that
+                share an agent seed share the stream, whatever their hyperparameters.
+
+        Returns:
+            np.ndarray: One `RESULTS_DTYPE` record per episode of every job.
+        """
+        names = list(param_grid)
+        jobs = [
+            (job_id, map_seed, agent_seed, dict(zip(names, values)))
+            for job_id, (map_seed, agent_seed, values) in enumerate(
+                itertools.product(
+                    map_seeds, agent_seeds, itertools.product(*param_grid.values())
+                )
+            )
+        ]
+        mazes = self.compile_mazes(map_seeds)
+
+        results = np.zeros(len(jobs) * self.episodes, dtype=RESULTS_DTYPE)
+        defaults = QLearningAgent.__init__.__kwdefaults__
+        for job_id, map_seed, agent_seed, params in jobs:
+            rows = results[job_id * self.episodes : (job_id + 1) * self.episodes]
+            rows["job"] = job_id
+            rows["map_seed"] = map_seed
+            rows["agent_seed"] = agent_seed
+            for name in ("learning_rate", "discount_factor", "exploration_decay"):
+                rows[name] = params.get(name, defaults[name])
+
+        total_episodes = len(results)
+        completed_episodes = 0
+        completed_jobs = 0
+
+        context = multiprocessing.get_context("spawn")
+        results_queue = context.Queue()
+        with single_threaded_numpy(), ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(jobs)) or 1,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(mazes, results_queue),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _run_job,
+                    job_id,
+                    map_seed,
+                    agent_seed,
+                    params,
+                    self.episodes,
+                    self.max_steps,
+                    self.start_position,
+                    self.chunk_size,
+                )
+                for job_id, map_seed, agent_seed, params in jobs
+            ]
+
+            while completed_jobs < len(jobs):
+                try:
+                    kind, job_id, chunk = results_queue.get(timeout=1.0)
+                except queue.Empty:
+                    # propaga erros dos workers em vez de esperar para sempre
+                    for future in futures:
+                        if future.done() and future.exception() is not None:
+                            raise future.exception()
+                    continue
+
+                if kind == "done":
+                    completed_jobs += 1
+                else:
+                    episode, steps, total_reward, success = zip(*chunk)
+                    rows = job_id * self.episodes + np.array(episode)
+                    results["episode"][rows] = episode
+                    results["steps"][rows] = steps
+                    results["total_reward"][rows] = total_reward
+                    results["success"][rows] = success
+                    completed_episodes += len(chunk)
+
+                if self.progress is not None:
+                    self.progress(
+                        completed_jobs, len(jobs), completed_episodes, total_episodes
+                    )
+                elif kind == "done":
+                    print(
+                        f"[{completed_jobs}/{len(jobs)} jobs] "
+                        f"{completed_episodes}/{total_episodes} episodes"
+                    )
+
+        return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.setrecursionlimit(10**6)
+
+    runner = ExperimentRunner(episodes=200)
+    table = runner.run(
+        map_seeds=[41, 42],
+        param_grid={
+            "learning_rate": [0.1, 0.5],
+            "discount_factor": [0.9, 0.99],
+            "exploration_decay": [0.99, 0.999],
+        },
+    )
+    for job in np.unique(table["job"]):
+        rows = table[table["job"] == job]
+        print(
+            f"job {job}: map_seed={rows['map_seed'][0]} "
+            f"lr={rows['learning_rate'][0]} gamma={rows['discount_factor'][0]} "
+            f"decay={rows['exploration_decay'][0]} "
+            f"success_rate={rows['success'].mean():.2f}"
+        )
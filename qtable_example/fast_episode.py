@@ -0,0 +1,185 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.internal.compiled_maze import CompiledMaze
+
+import numpy as np
+
+from typing import Callable
+
+# resultado de cada episódio executado
+EPISODE_DTYPE = np.dtype(
+    [("steps", np.int64), ("total_reward", np.float64), ("success", np.bool_)]
+)
+
+
+class FastEpisodeRunner:
+    """
+    Headless engine that runs whole Q-learning episodes (act + transition + TD update)
+    in a tight loop over the flat tables of a `CompiledMaze`.
+
+    Randomness comes from `agent.rng`, drawn in large blocks: every step consumes two
+    uniforms (exploration and tie-break), in the same order as `QLearningAgent.act`.
+    Given the same seed, the resulting Q-table is bit-for-bit identical to the one
+    produced by `Envoriment.run` with that agent.
+
+    Agents with an `exploration` strategy select through its scalar `select` with
+    the agent's generator instead, as `QLearningAgent.act_index` does. The update is
+    always the Q-learning one: the SARSA, Expected SARSA, Double Q and λ agents are
+    rejected and run through `Envoriment` (optionally compiled).
+    """
+
+    def __init__(
+        self,
+        maze: CompiledMaze,
+        agent: QLearningAgent,
+        solution_position: tuple[int, int],
+        start_position: tuple[int, int] = (0, 0),
+        max_steps: int = 1_000,
+        block_size: int = 1 << 16,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            maze (CompiledMaze): The compiled maze.
+            agent (QLearningAgent): The agent to train. Must have an `rng`.
+            solution_position (tuple[int, int]): The solution cell.
+            start_position (tuple[int, int]): The start cell of every episode.
+            max_steps (int): The maximum number of steps per episode.
+            block_size (int): How many uniforms are drawn from the generator at once.
+        """
+        assert agent.rng is not None, "FastEpisodeRunner requires an agent with rng."
+        assert (
+            type(agent).act_index is QLearningAgent.act_index
+            and type(agent).learn_index is QLearningAgent.learn_index
+        ), "FastEpisodeRunner only reproduces the Q-learning update."
+        assert (
+            agent.q_matrix.shape[0] == maze.n_states
+        ), "The agent's Q-table does not match the maze state space."
+
+        self.maze = maze
+        self.agent = agent
+        self.start_state = maze.state_id(start_position)
+        self.solution_state = maze.state_id(solution_position)
+        self.max_steps = max_steps
+        # cada passo consome um par de uniformes, então o bloco precisa ser par
+        self.block_size = block_size + block_size % 2
+
+        self._next_state = maze.next_state.tolist()
+        self._reward = maze.reward.tolist()
+        self._valid_mask = maze.valid_mask.tolist()
+        self._valid_actions = maze.valid_actions_table
+
+    def run(
+        self,
+        episodes: int,
+        callback: Callable[[int, int, float, bool], None] | None = None,
+    ) -> np.ndarray:
+        """
+        Runs `episodes` episodes, updating the agent's Q-table and exploration rate.
+        With the built-in epsilon-greedy, the agent's generator ends up ahead of the
+        uniforms actually consumed, since the last block is drawn in full.
+
+        Args:
+            episodes (int): Number of episodes to run.
+            callback (Callable | None): Called after each episode with
+                (episode, steps, total_reward, success).
+
+        Returns:
+            np.ndarray: One `EPISODE_DTYPE` record per episode.
+        """
+        agent = self.agent
+        rng = agent.rng
+        exploration = agent.exploration
+        q_matrix = agent.q_matrix
+        q_values = q_matrix.tolist()
+        # tabelas de menor precisão são arredondadas a cada escrita, como em learn_index
+        quantize = None if q_matrix.dtype == np.float64 else q_matrix.dtype.type
+
+        next_state_table = self._next_state
+        reward_table = self._reward
+        valid_mask = self._valid_mask
+        valid_actions_table = self._valid_actions
+        start_state = self.start_state
+        solution_state = self.solution_state
+        max_steps = self.max_steps
+        block_size = self.block_size
+
+        learning_rate = agent.learning_rate
+        discount_factor = agent.discount_factor
+        exploration_decay = agent.exploration_decay
+        min_exploration_rate = agent.min_exploration_rate
+        exploration_rate = agent.exploration_rate
+
+        results = np.zeros(episodes, dtype=EPISODE_DTYPE)
+        uniforms = []
+        cursor = 0
+
+        for episode in range(episodes):
+            # mesmo comportamento de QLearningAgent.reset
+            if exploration is None:
+                exploration_rate = 1.0
+            else:
+                agent.reset()
+            state = start_state
+            steps = 0
+            total_reward = 0.0
+            done = False
+
+            while not done and steps < max_steps:
+                valid_actions = valid_actions_table[valid_mask[state]]
+                state_q = q_values[state]
+                if exploration is not None:
+                    action = exploration.select(state_q, valid_actions, rng, state)
+                else:
+                    if cursor == len(uniforms):
+                        uniforms = rng.random(block_size).tolist()
+                        cursor = 0
+                    explore_draw = uniforms[cursor]
+                    pick_draw = uniforms[cursor + 1]
+                    cursor += 2
+
+                    if explore_draw < exploration_rate:
+                        action = valid_actions[int(pick_draw * len(valid_actions))]
+                    else:
+                        max_q_value = max([state_q[a] for a in valid_actions])
+                        best_actions = [
+                            a for a in valid_actions if state_q[a] == max_q_value
+                        ]
+                        action = best_actions[int(pick_draw * len(best_actions))]
+
+                next_state = next_state_table[state][action]
+                reward = reward_table[state][action]
+
+                # mesma ordem de operações de QLearningAgent.learn
+                current_q_value = state_q[action]
+                td_error = (
+                    reward
+                    + discount_factor * max(q_values[next_state])
+                    - current_q_value
+                )
+                new_q_value = current_q_value + learning_rate * td_error
+                if quantize is not None:
+                    new_q_value = float(quantize(new_q_value))
+                state_q[action] = new_q_value
+                if exploration is None:
+                    exploration_rate = max(
+                        min_exploration_rate, exploration_rate * exploration_decay
+                    )
+                else:
+                    exploration.on_step()
+
+                total_reward += reward
+                state = next_state
+                steps += 1
+                done = state == solution_state
+
+            results[episode] = (steps, total_reward, done)
+            if callback is not None:
+                callback(episode, steps, total_reward, done)
+
+        q_matrix[...] = q_values
+        if exploration is None:
+            agent.exploration_rate = exploration_rate
+        else:
+            agent.exploration_rate = exploration.exploration_rate
+        return results
@@ -0,0 +1,249 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.envoriment import Envoriment
+from qtable_example.internal.grid import Grid
+from qtable_example.enums import Directions
+
+import numpy as np
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+
+class SharedQTable:
+    """
+    Q-table stored in a `multiprocessing.shared_memory` block, so several processes
+    can read and write the same array.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, ...],
+        name: str | None = None,
+        dtype: np.dtype = np.float64,
+    ):
+        """
+        Creates a new zeroed shared table, or attaches to an existing one by name.
+
+        Args:
+            shape (tuple[int, ...]): Shape of the table.
+            name (str | None): Name of an existing shared memory block to attach to.
+            dtype (np.dtype): Type of the values.
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=nbytes)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+        if self.owner:
+            self.array.fill(0.0)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        """
+        Detaches from the shared block. The owner also frees it.
+        """
+        # o array precisa ser liberado antes de fechar o buffer
+        del self.array
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class StripedLockQLearningAgent(QLearningAgent):
+    """
+    Q-learning agent that serializes writes to its Q-table with striped locks:
+    the row of state `s` is protected by `locks[s % len(locks)]`.
+    """
+
+    def __init__(self, *args, locks: list, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.locks = locks
+
+    def learn(self, state, action, reward, next_state):
+        with self.locks[self.state_id(state) % len(self.locks)]:
+            super().learn(state, action, reward, next_state)
+
+    def learn_index(self, state, action, reward, next_state):
+        with self.locks[state % len(self.locks)]:
+            super().learn_index(state, action, reward, next_state)
+
+
+def _actor(
+    grid: Grid,
+    solution_position: tuple[int, int],
+    action_space: list[Directions],
+    table_name: str,
+    table_shape: tuple[int, ...],
+    seed: np.random.SeedSequence,
+    agent_params: dict,
+    locks: list | None,
+    episodes: int,
+    max_steps: int,
+    compiled: bool,
+):
+    table = SharedQTable(
+        table_shape, name=table_name, dtype=agent_params.get("dtype", np.float64)
+    )
+    agent_cls, extra = QLearningAgent, {}
+    if locks:
+        agent_cls, extra = StripedLockQLearningAgent, {"locks": locks}
+
+    agent = agent_cls(
+        action_space,
+        grid.grid_size,
+        rng=np.random.default_rng(seed),
+        q_table=table.array,
+        **agent_params,
+        **extra,
+    )
+    env = Envoriment(
+        grid=grid,
+        agent=agent,
+        solution_position=solution_position,
+        max_steps=max_steps,
+        compiled=compiled,
+    )
+    env.run(episodes, verbose=False)
+
+    del agent, env
+    table.close()
+
+
+class HogwildTrainer:
+    """
+    Trains a single maze with several actor processes writing into one shared Q-table.
+
+    Each actor runs its own `Envoriment` on a copy of the same `Grid`, with an
+    independent random stream spawned from `seed`. Updates are lock-free (Hogwild)
+    by default; `lock_stripes > 0` serializes writes per group of states instead.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        solution_position: tuple[int, int],
+        action_space: list[Directions] | None = None,
+        n_actors: int = 4,
+        episodes_per_actor: int = 250,
+        max_steps: int = 1_000,
+        seed: int | None = None,
+        lock_stripes: int = 0,
+        compiled: bool = True,
+        agent_params: dict | None = None,
+    ):
+        """
+        Initialize the trainer.
+
+        Args:
+            grid (Grid): The maze.
+            solution_position (tuple[int, int]): The solution cell.
+            action_space (list[Directions] | None): Defaults to UP, DOWN, LEFT, RIGHT.
+            n_actors (int): Number of actor processes.
+            episodes_per_actor (int): Episodes run by each actor.
+            max_steps (int): The maximum number of steps per episode.
+            seed (int | None): Root seed of the actors' random streams.
+            lock_stripes (int): Number of striped locks. 0 means lock-free.
+            compiled (bool): Whether the actors use `Envoriment`'s compiled mode.
+            agent_params (dict | None): Keyword arguments for `QLearningAgent`. A
+                `state_index` and `dtype` also shape the shared table.
+        """
+        self.grid = grid
+        self.solution_position = solution_position
+        self.action_space = action_space or [
+            Directions.UP,
+            Directions.DOWN,
+            Directions.LEFT,
+            Directions.RIGHT,
+        ]
+        self.n_actors = n_actors
+        self.episodes_per_actor = episodes_per_actor
+        self.max_steps = max_steps
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.lock_stripes = lock_stripes
+        self.compiled = compiled
+        self.agent_params = agent_params or {}
+
+    def run(self, initial_q_table: np.ndarray | None = None) -> np.ndarray:
+        """
+        Runs all actors to completion.
+
+        Args:
+            initial_q_table (np.ndarray | None): Q-table to start from (e.g. an
+                agent's `q_table`). Starts from zeros by default.
+
+        Returns:
+            np.ndarray: The trained Q-table.
+        """
+        context = multiprocessing.get_context("spawn")
+        state_index = self.agent_params.get("state_index")
+        if state_index is not None:
+            shape = (len(state_index), len(self.action_space))
+        else:
+            shape = (*self.grid.grid_size, len(self.action_space))
+        table = SharedQTable(shape, dtype=self.agent_params.get("dtype", np.float64))
+        if initial_q_table is not None:
+            table.array[...] = initial_q_table
+
+        locks = [context.Lock() for _ in range(self.lock_stripes)] or None
+        actors = [
+            context.Process(
+                target=_actor,
+                args=(
+                    self.grid,
+                    self.solution_position,
+                    self.action_space,
+                    table.name,
+                    shape,
+                    seed,
+                    self.agent_params,
+                    locks,
+                    self.episodes_per_actor,
+                    self.max_steps,
+                    self.compiled,
+                ),
+            )
+            for seed in self.seed_sequence.spawn(self.n_actors)
+        ]
+
+        try:
+            for actor in actors:
+                actor.start()
+            for actor in actors:
+                actor.join()
+            failed = [actor.exitcode for actor in actors if actor.exitcode != 0]
+            if failed:
+                raise RuntimeError(f"{len(failed)} actor(s) failed: {failed}")
+            return table.array.copy()
+        finally:
+            table.close()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from qtable_example.experiments import generate_maze
+
+    sys.setrecursionlimit(10**6)
+
+    grid, solution = generate_maze(41, grid_size=(60, 60), map_max_length=2_000)
+    for lock_stripes in (0, 64):
+        trainer = HogwildTrainer(
+            grid,
+            solution.grid_position,
+            n_actors=os.cpu_count() or 1,
+            episodes_per_actor=100,
+            seed=41,
+            lock_stripes=lock_stripes,
+        )
+        start = time.perf_counter()
+        q_table = trainer.run()
+        print(
+            f"lock_stripes={lock_stripes}: {time.perf_counter() - start:.2f}s, "
+            f"non-zero Q-values: {np.count_nonzero(q_table)}"
+        )
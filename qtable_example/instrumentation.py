@@ -0,0 +1,248 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from qtable_example.envoriment import Envoriment
+
+# fases medidas, na ordem em que aparecem nos relatórios
+STEP = "step"
+NEIGHBORS = "neighbors"
+ACT = "act"
+LEARN = "learn"
+EPISODE = "episode"
+# tempo de `step` fora das fases internas (transição, recompensa, contadores)
+BOOKKEEPING = "bookkeeping"
+
+# fases medidas dentro de `Envoriment.step`
+STEP_PHASES = (NEIGHBORS, ACT, LEARN)
+
+
+class PhaseStats:
+    """
+    Accumulated wall time and call count of one phase.
+    """
+
+    __slots__ = ("name", "calls", "total_time")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"PhaseStats({self.name!r}, calls={self.calls}, "
+            f"total_time={self.total_time:.3f}s, mean_time={self.mean_time * 1e6:.2f}us)"
+        )
+
+
+class TrainingStats:
+    """
+    Live view of an instrumented training loop: per-phase times and steps/episodes
+    throughput. Counters are plain attributes updated by the training thread, so the
+    object can be polled from another thread (e.g. the UI) without locking.
+    """
+
+    def __init__(self, window: float = 1.0):
+        """
+        Args:
+            window (float): Minimum length, in seconds, of the window over which the
+                live rates are computed.
+        """
+        self.window = window
+        self.phases = {name: PhaseStats(name) for name in (STEP, *STEP_PHASES, EPISODE)}
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self._mark = (self.started_at, 0, 0)
+        self._rates = (0.0, 0.0)
+
+    @property
+    def steps(self) -> int:
+        return self.phases[STEP].calls
+
+    @property
+    def episodes(self) -> int:
+        return self.phases[EPISODE].calls
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def _update_rates(self) -> tuple[float, float]:
+        with self._lock:
+            now = time.perf_counter()
+            mark_time, mark_steps, mark_episodes = self._mark
+            if now - mark_time >= self.window:
+                steps, episodes = self.steps, self.episodes
+                self._rates = (
+                    (steps - mark_steps) / (now - mark_time),
+                    (episodes - mark_episodes) / (now - mark_time),
+                )
+                self._mark = (now, steps, episodes)
+            elif self._mark[0] == self.started_at:
+                # antes da primeira janela completa, usa a média desde o início
+                elapsed = max(now - self.started_at, 1e-9)
+                self._rates = (self.steps / elapsed, self.episodes / elapsed)
+            return self._rates
+
+    @property
+    def steps_per_second(self) -> float:
+        """
+        Steps per second over the last window of at least `window` seconds.
+        """
+        return self._update_rates()[0]
+
+    @property
+    def episodes_per_second(self) -> float:
+        """
+        Episodes per second over the last window of at least `window` seconds.
+        """
+        return self._update_rates()[1]
+
+    def phase_times(self) -> dict[str, float]:
+        """
+        Total seconds spent in each phase of `Envoriment.step`, including
+        `BOOKKEEPING`, the part of the step outside the other phases.
+        """
+        times = {name: self.phases[name].total_time for name in STEP_PHASES}
+        times[BOOKKEEPING] = max(
+            0.0, self.phases[STEP].total_time - sum(times.values())
+        )
+        return times
+
+    def snapshot(self) -> dict:
+        """
+        JSON-serializable summary, e.g. for logging.
+        """
+        step_time = self.phases[STEP].total_time
+        steps_per_second, episodes_per_second = self._update_rates()
+        return {
+            "elapsed": self.elapsed,
+            "steps": self.steps,
+            "episodes": self.episodes,
+            "steps_per_second": steps_per_second,
+            "episodes_per_second": episodes_per_second,
+            "phases": {
+                name: {
+                    "time": phase_time,
+                    "fraction": phase_time / step_time if step_time else 0.0,
+                    "calls": self.phases[name].calls if name in self.phases else None,
+                }
+                for name, phase_time in self.phase_times().items()
+            },
+        }
+
+    def reset(self):
+        """
+        Zeroes every counter and restarts the clock.
+        """
+        with self._lock:
+            for phase in self.phases.values():
+                phase.calls = 0
+                phase.total_time = 0.0
+            self.started_at = time.perf_counter()
+            self._mark = (self.started_at, 0, 0)
+            self._rates = (0.0, 0.0)
+
+    def __str__(self) -> str:
+        snapshot = self.snapshot()
+        phases = " ".join(
+            f"{name}={phase['fraction']:.0%}"
+            for name, phase in snapshot["phases"].items()
+        )
+        return (
+            f"{snapshot['steps_per_second']:.0f} steps/s "
+            f"{snapshot['episodes_per_second']:.2f} episodes/s | {phases}"
+        )
+
+
+class Instrumentation:
+    """
+    Opt-in timing of an `Envoriment`'s training loop.
+
+    `attach` wraps, on the given instances only, the methods of each phase with a
+    timer: `Envoriment.step`/`step_compiled` (STEP), `Grid.get_neighbors`
+    (NEIGHBORS), the agent's `act`/`act_index` (ACT), its `learn`/`learn_index` or the
+    replay learner's `observe` (LEARN) and `Envoriment.run_episode` (EPISODE). Only the
+    agent method the environment calls is wrapped (`act_index`/`learn_index` when it
+    is compiled), since agents may implement one through the other, e.g. `learn`
+    calling `learn_index`, and the phase would be timed twice. Nothing
+    in the loop checks whether instrumentation is enabled, so an environment without
+    it (or after `detach`) runs exactly the uninstrumented code.
+    """
+
+    def __init__(self, stats: TrainingStats | None = None):
+        """
+        Args:
+            stats (TrainingStats | None): Where the measurements go. Defaults to a new
+                `TrainingStats`.
+        """
+        self.stats = stats or TrainingStats()
+        self._patched: list[tuple[object, str, bool, object]] = []
+
+    @property
+    def attached(self) -> bool:
+        return bool(self._patched)
+
+    def attach(self, env: "Envoriment") -> TrainingStats:
+        """
+        Starts timing `env`.
+
+        Returns:
+            TrainingStats: The stats being filled.
+        """
+        assert not self.attached, "Instrumentation is already attached."
+        phases = self.stats.phases
+
+        self._wrap(env, "step", phases[STEP])
+        self._wrap(env, "step_compiled", phases[STEP])
+        self._wrap(env, "run_episode", phases[EPISODE])
+        self._wrap(env.grid, "get_neighbors", phases[NEIGHBORS])
+        if env.compiled:
+            act, learn = "act_index", "learn_index"
+        else:
+            act, learn = "act", "learn"
+        self._wrap(env.agent, act, phases[ACT])
+        if env.replay is None:
+            self._wrap(env.agent, learn, phases[LEARN])
+        else:
+            self._wrap(env.replay, "observe", phases[LEARN])
+        return self.stats
+
+    def detach(self):
+        """
+        Restores the original methods.
+        """
+        for owner, name, had_attribute, original in reversed(self._patched):
+            if had_attribute:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self._patched.clear()
+
+    def _wrap(self, owner: object, name: str, phase: PhaseStats):
+        had_attribute = name in vars(owner)
+        original = getattr(owner, name)
+        self._patched.append(
+            (owner, name, had_attribute, original if had_attribute else None)
+        )
+        setattr(owner, name, _timed(original, phase))
+
+
+def _timed(function: Callable, phase: PhaseStats) -> Callable:
+    perf_counter = time.perf_counter
+
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            phase.total_time += perf_counter() - start
+            phase.calls += 1
+
+    return timed
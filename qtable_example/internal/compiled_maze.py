@@ -0,0 +1,124 @@
+from qtable_example.enums import Directions
+from qtable_example.internal.state_index import StateIndex
+
+import numpy as np
+
+
+class CompiledMaze:
+    """
+    Representação densa de um `Grid`, pensada para o caminho crítico do treinamento.
+
+    Cada célula do grid recebe um id inteiro (`linha * colunas + coluna`) e as transições
+    ficam em tabelas indexadas por `[estado, ação]`, onde a ação é o índice em `actions`:
+
+    - `next_state`: id da célula alcançada (ações inválidas mantêm o agente na célula).
+    - `reward`: recompensa da célula alcançada (ou a penalidade de ação inválida).
+    - `valid_mask`: bitmask uint8 com o bit `i` ligado se a ação `i` é válida na célula.
+    - `occupied`: indica se a célula está ocupada (não vazia).
+
+    Com um `state_index`, os ids são os ids compactos do índice e só as células
+    ocupadas têm linhas nas tabelas.
+    """
+
+    def __init__(
+        self,
+        grid_size: tuple[int, int],
+        actions: tuple[Directions, ...],
+        next_state: np.ndarray,
+        reward: np.ndarray,
+        valid_mask: np.ndarray,
+        occupied: np.ndarray,
+        state_index: StateIndex | None = None,
+    ):
+        """
+        Inicializa um labirinto compilado. Normalmente criado por `Grid.compile`.
+
+        Args:
+            grid_size (tuple[int, int]): Tamanho do grid (linhas, colunas).
+            actions (tuple[Directions, ...]): Ações, na ordem das colunas das tabelas.
+            next_state (np.ndarray): Tabela de transições (n_states, n_actions).
+            reward (np.ndarray): Tabela de recompensas (n_states, n_actions).
+            valid_mask (np.ndarray): Bitmask de ações válidas por célula (n_states,).
+            occupied (np.ndarray): Ocupação de cada célula (n_states,).
+            state_index (StateIndex | None): Índice compacto dos ids de estado, se houver.
+        """
+        assert len(actions) <= 8, "A bitmask uint8 suporta no máximo 8 ações."
+
+        self.grid_size = grid_size
+        self.actions = actions
+        self.state_index = state_index
+        self.n_states = (
+            len(state_index) if state_index is not None else grid_size[0] * grid_size[1]
+        )
+        self.n_actions = len(actions)
+        self.next_state = next_state
+        self.reward = reward
+        self.valid_mask = valid_mask
+        self.occupied = occupied
+
+        # tabela de consulta: bitmask -> tupla com os índices das ações válidas
+        self._mask_to_actions = tuple(
+            tuple(a for a in range(self.n_actions) if mask >> a & 1)
+            for mask in range(1 << self.n_actions)
+        )
+
+    def state_id(self, position: tuple[int, int]) -> int:
+        """
+        Converte uma posição (linha, coluna) no id da célula.
+
+        Args:
+            position (tuple[int, int]): Posição no grid (linha, coluna).
+
+        Returns:
+            int: Id da célula.
+        """
+        if self.state_index is not None:
+            return self.state_index.state_id(position)
+        return position[0] * self.grid_size[1] + position[1]
+
+    def position(self, state_id: int) -> tuple[int, int]:
+        """
+        Converte o id de uma célula em sua posição (linha, coluna).
+
+        Args:
+            state_id (int): Id da célula.
+
+        Returns:
+            tuple[int, int]: Posição no grid (linha, coluna).
+        """
+        if self.state_index is not None:
+            return self.state_index.position(state_id)
+        return divmod(int(state_id), self.grid_size[1])
+
+    def valid_actions(self, state_id: int) -> tuple[int, ...]:
+        """
+        Retorna os índices das ações válidas em uma célula.
+
+        Args:
+            state_id (int): Id da célula.
+
+        Returns:
+            tuple[int, ...]: Índices (em `actions`) das ações válidas.
+        """
+        return self._mask_to_actions[self.valid_mask[state_id]]
+
+    @property
+    def valid_actions_table(self) -> tuple[tuple[int, ...], ...]:
+        """
+        Retorna, para cada bitmask possível, a tupla de índices de ações válidas.
+        Útil para laços que indexam a tabela diretamente com `valid_mask`.
+        """
+        return self._mask_to_actions
+
+    @property
+    def valid_matrix(self) -> np.ndarray:
+        """
+        Retorna a bitmask expandida em uma matriz booleana (n_states, n_actions).
+        """
+        return (self.valid_mask[:, None] >> np.arange(self.n_actions)) & 1 == 1
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledMaze(grid_size={self.grid_size}, n_states={self.n_states}, "
+            f"n_actions={self.n_actions})"
+        )
@@ -1,13 +1,25 @@
-from qtable_example.internal.tile import Tile
+from qtable_example.internal.tile import Tile, TileView
+from qtable_example.internal.compiled_maze import CompiledMaze
+from qtable_example.internal.state_index import StateIndex
 from qtable_example.enums import Directions
 from qtable_example.exceptions import OutOfBoundsError, AlreadyOccupiedError
 
+import numpy as np
+import hashlib
 import random
 
 
 class Grid:
     """
     Representa o tabuleiro de um jogo, armazenando informações sobre as tiles (células) que o compõem.
+
+    As células ficam em dois arrays, `occupied` (bool) e `rewards`, indexados por
+    (linha, coluna); `get_tile`, `non_empty_tiles` e afins devolvem `TileView`s, que
+    leem e escrevem nesses arrays.
+
+    A contagem de vizinhos ocupados de cada célula e os conjuntos de células ocupadas
+    e terminais são mantidos a cada mudança de ocupação, então `occupied` só deve ser
+    alterado por `set_empty` (ou `add_on`, `set_tile` e as `TileView`s).
     """
 
     DIRECTIONS_DELTA_MAP = {
@@ -26,13 +38,23 @@ class Grid:
         tile_size: int = 32,
         grid_size: tuple[int, int] = (10, 10),
         max_reward: float = 10.0,
+        reward_dtype: np.dtype = np.float64,
     ):
+        """
+        Args:
+            tile_size (int): Tamanho de cada célula, em pixels.
+            grid_size (tuple[int, int]): Tamanho do grid (linhas, colunas).
+            max_reward (float): Recompensa da solução.
+            reward_dtype (np.dtype): Tipo do array de recompensas. `np.float32` usa
+                metade da memória em grids muito grandes, mas arredonda as recompensas.
+        """
         self.grid_size = grid_size
         self.tile_size = tile_size
-        self._grid = self.generate_base_grid(tile_size)
+        self.reward_dtype = np.dtype(reward_dtype)
+        self.generate_base_grid(tile_size)
         self.max_reward = max_reward
 
-    def get_tile(self, position: tuple[int, int]) -> Tile:
+    def get_tile(self, position: tuple[int, int]) -> TileView | None:
         """
         Retorna a tile em uma posição específica.
 
@@ -40,50 +62,137 @@ class Grid:
             position (tuple[int, int]): Posição no grid (linha, coluna).
 
         Returns:
-            Tile: Tile na posição especificada.
+            TileView | None: Tile na posição especificada, ou None se fora do grid.
         """
-        return self._grid.get(position, None)
+        if self.is_out_of_bounds(position):
+            return None
+        return TileView(self, position)
 
-    def set_tile(self, position: tuple[int, int], tile: Tile):
+    def set_tile(self, position: tuple[int, int], tile: Tile | TileView):
         """
-        Define uma tile em uma posição específica.
+        Define uma tile em uma posição específica, copiando `empty` e `reward` de `tile`.
 
         Args:
             position (tuple[int, int]): Posição no grid (linha, coluna).
-            tile (Tile): Tile a ser definida na posição especificada.
+            tile (Tile | TileView): Tile a ser definida na posição especificada.
         """
-        if not self.is_out_of_bounds(position):
-            self._grid[position] = tile
-        else:
-            raise OutOfBoundsError(
-                f"Position {position} is out of bounds for the grid size {self.grid_size}."
-            )
+        self.set_empty(position, tile.empty)
+        self.set_reward(position, tile.reward)
 
-    def generate_base_grid(self, tile_size: int) -> dict[tuple[int, int], Tile]:
-        grid = {}
+    def generate_base_grid(self, tile_size: int) -> None:
+        """
+        Cria os arrays do grid com todas as células vazias e sem recompensa.
+        """
+        self.tile_size = tile_size
+        self.occupied = np.zeros(self.grid_size, dtype=bool)
+        self.rewards = np.zeros(self.grid_size, dtype=self.reward_dtype)
+
+        # índices mantidos por `set_empty`; as listas ordenadas são refeitas só depois
+        # de uma mudança nos conjuntos
+        self._neighbor_counts = np.zeros(self.grid_size, dtype=np.uint8)
+        self._occupied_cells: set[tuple[int, int]] = set()
+        self._terminal_cells: set[tuple[int, int]] = set()
+        self._sorted_occupied: list[tuple[int, int]] | None = []
+        self._sorted_terminal: list[tuple[int, int]] | None = []
+
+    def tiles(self):
+        """
+        Percorre todas as células do grid, linha a linha.
 
+        Yields:
+            TileView: Cada célula do grid.
+        """
         for row in range(self.grid_size[0]):
             for col in range(self.grid_size[1]):
-                grid[(row, col)] = Tile(
-                    grid_position=(row, col),
-                    size=tile_size,
-                    empty=True,
-                    reward=0.0,
-                )
-
-        return grid
+                yield TileView(self, (row, col))
 
     @property
-    def non_empty_tiles(self) -> dict[tuple[int, int], Tile]:
+    def non_empty_tiles(self) -> dict[tuple[int, int], TileView]:
         """
         Retorna um dicionário com as tiles não vazias do grid.
 
         Returns:
-            dict[tuple[int, int], Tile]: Dicionário com as tiles não vazias.
+            dict[tuple[int, int], TileView]: Dicionário com as tiles não vazias.
+        """
+        if self._sorted_occupied is None:
+            self._sorted_occupied = sorted(self._occupied_cells)
+        return self._views(self._sorted_occupied)
+
+    def _views(
+        self, positions: list[tuple[int, int]]
+    ) -> dict[tuple[int, int], TileView]:
+        return {position: TileView(self, position) for position in positions}
+
+    def _check_bounds(self, position: tuple[int, int]):
+        if self.is_out_of_bounds(position):
+            raise OutOfBoundsError(
+                f"Position {position} is out of bounds for the grid size {self.grid_size}."
+            )
+
+    def set_empty(self, position: tuple[int, int], empty: bool):
+        """
+        Marca uma posição do grid como vazia ou ocupada.
+
+        Args:
+            position (tuple[int, int]): Posição no grid (linha, coluna).
+            empty (bool): True para vazia, False para ocupada.
+        """
+        self._check_bounds(position)
+        row, col = int(position[0]), int(position[1])
+        occupied = not empty
+        if self.occupied[row, col] == occupied:
+            return
+        self.occupied[row, col] = occupied
+
+        if occupied:
+            self._occupied_cells.add((row, col))
+        else:
+            self._occupied_cells.discard((row, col))
+        self._sorted_occupied = None
+
+        # só os 4 vizinhos mudam de contagem e, portanto, de condição de terminal
+        delta = 1 if occupied else -1
+        rows, cols = self.grid_size
+        counts = self._neighbor_counts
+        for d_row, d_col in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            neighbor_row, neighbor_col = row + d_row, col + d_col
+            if not (0 <= neighbor_row < rows and 0 <= neighbor_col < cols):
+                continue
+            count = counts.item(neighbor_row, neighbor_col) + delta
+            counts[neighbor_row, neighbor_col] = count
+
+            neighbor = (neighbor_row, neighbor_col)
+            if count == 1:
+                self._terminal_cells.add(neighbor)
+            elif neighbor in self._terminal_cells:
+                self._terminal_cells.discard(neighbor)
+            else:
+                continue
+            self._sorted_terminal = None
+
+    def get_reward(self, position: tuple[int, int]) -> float:
+        """
+        Retorna a recompensa de uma posição do grid.
+
+        Args:
+            position (tuple[int, int]): Posição no grid (linha, coluna).
+
+        Returns:
+            float: Recompensa da posição.
         """
-        return {
-            position: tile for position, tile in self._grid.items() if not tile.empty
-        }
+        self._check_bounds(position)
+        return self.rewards.item(position)
+
+    def set_reward(self, position: tuple[int, int], reward: float):
+        """
+        Define a recompensa de uma posição do grid.
+
+        Args:
+            position (tuple[int, int]): Posição no grid (linha, coluna).
+            reward (float): Nova recompensa.
+        """
+        self._check_bounds(position)
+        self.rewards[position] = reward
 
     def get_position_following_direction(
         self,
@@ -163,28 +272,18 @@ class Grid:
             direction (Directions): Direção a seguir.
 
         Returns:
-            Tile: Nova tile adicionada.
+            TileView: Nova tile adicionada.
         """
 
         new_position = self.get_position_following_direction(
-            tile.grid_position, direction
-        )
-        new_tile = Tile(
-            grid_position=new_position,
-            size=tile.size,
-            empty=False,
-            reward=tile.reward,
+            tile.grid_position, direction, ignore_out_of_bounds=True
         )
-        if self.is_out_of_bounds(new_position):
-            raise OutOfBoundsError(
-                f"Position {new_position} is out of bounds for the grid size {self.grid_size}."
-            )
-
         if not self.is_empty(new_position):
             raise AlreadyOccupiedError(f"Position {new_position} is already occupied.")
 
-        self._grid[new_position] = new_tile
-        return new_tile
+        self.set_empty(new_position, False)
+        self.set_reward(new_position, tile.reward)
+        return TileView(self, new_position)
 
     def is_empty(self, position: tuple[int, int]) -> bool:
         """
@@ -196,11 +295,8 @@ class Grid:
         Returns:
             bool: True se a posição estiver vazia, False caso contrário.
         """
-        if not position in self._grid:
-            raise OutOfBoundsError(
-                f"Position {position} is out of bounds for the grid size {self.grid_size}."
-            )
-        return self._grid[position].empty
+        self._check_bounds(position)
+        return not self.occupied[position]
 
     def is_out_of_bounds(self, position: tuple[int, int]) -> bool:
         """
@@ -212,7 +308,8 @@ class Grid:
         Returns:
             bool: True se a posição estiver fora dos limites, False caso contrário.
         """
-        return position not in self._grid
+        row, col = position
+        return not (0 <= row < self.grid_size[0] and 0 <= col < self.grid_size[1])
 
     def get_grid_center(self) -> tuple[int, int]:
         """
@@ -233,31 +330,178 @@ class Grid:
         Returns:
             bool: True se a posição for uma célula terminal, False caso contrário.
         """
-        neighbors = self.get_neighbors(position)
-        return sum(1 for neighbor in neighbors.values() if neighbor is not None) == 1
+        return self.count_neighbors(position) == 1
+
+    def count_neighbors(self, position: tuple[int, int]) -> int:
+        """
+        Retorna quantos vizinhos ocupados (sem diagonais) uma posição tem.
+
+        Args:
+            position (tuple[int, int]): Posição no grid (linha, coluna).
+
+        Returns:
+            int: Número de vizinhos ocupados.
+        """
+        self._check_bounds(position)
+        return self._neighbor_counts.item(position)
+
+    def neighbor_counts(self) -> np.ndarray:
+        """
+        Retorna a contagem de vizinhos ocupados (sem diagonais) de cada célula do grid.
+        O array é o índice mantido pelo grid: não deve ser alterado.
+
+        Returns:
+            np.ndarray: Array (linhas, colunas) com a contagem de cada célula.
+        """
+        return self._neighbor_counts
 
     @property
-    def terminal_cells(self) -> dict[tuple[int, int], Tile]:
+    def terminal_cells(self) -> dict[tuple[int, int], TileView]:
         """
         Retorna um dicionário com as células terminais do grid.
 
         Returns:
-            dict[tuple[int, int], Tile]: Dicionário com as células terminais.
+            dict[tuple[int, int], TileView]: Dicionário com as células terminais.
         """
-        return {
-            position: tile
-            for position, tile in self._grid.items()
-            if self.is_terminal(position)
-        }
+        return self._views(self._terminal_positions())
+
+    def _terminal_positions(self) -> list[tuple[int, int]]:
+        if self._sorted_terminal is None:
+            self._sorted_terminal = sorted(self._terminal_cells)
+        return self._sorted_terminal
 
-    def generate_random_solution(self, only_terminal: bool = False) -> Tile:
+    def generate_random_solution(
+        self, only_terminal: bool = False, rng: random.Random | None = None
+    ) -> TileView:
         """
         Gera uma solução aleatória para o grid.
+
+        Args:
+            only_terminal (bool): Se True, escolhe apenas entre as células terminais.
+            rng (random.Random | None): Gerador a ser usado. Por padrão, o `random` global.
         """
+        choice = (rng if rng is not None else random).choice
         if only_terminal:
-            solution = random.choice(list(self.terminal_cells.values()))
+            solution = TileView(self, choice(self._terminal_positions()))
         else:
-            solution = random.choice(list(self._grid.values()))
+            rows, cols = self.grid_size
+            solution = TileView(self, divmod(choice(range(rows * cols)), cols))
         solution.reward = self.max_reward
         solution.empty = False
         return solution
+
+    def fingerprint(self) -> str:
+        """
+        Identifica o labirinto: hash do tamanho, das células ocupadas e das recompensas.
+
+        Returns:
+            str: Hash hexadecimal (sha256).
+        """
+        occupied = self.occupied
+        cell_reward = self.cell_rewards()
+
+        digest = hashlib.sha256()
+        digest.update(np.asarray(self.grid_size, dtype=np.int64).tobytes())
+        digest.update(occupied.tobytes())
+        digest.update(cell_reward.tobytes())
+        return digest.hexdigest()
+
+    def state_index(self) -> StateIndex:
+        """
+        Cria o índice compacto das células ocupadas do grid.
+
+        Returns:
+            StateIndex: Índice com um id denso por célula não vazia.
+        """
+        positions = np.argwhere(self.occupied).astype(np.int64)
+        return StateIndex(self.grid_size, positions)
+
+    def cell_rewards(self, empty_value: float = 0.0) -> np.ndarray:
+        """
+        Retorna as recompensas das células ocupadas, em float64.
+
+        Args:
+            empty_value (float): Valor das células vazias.
+
+        Returns:
+            np.ndarray: Array (linhas, colunas) de recompensas.
+        """
+        return np.where(self.occupied, self.rewards.astype(np.float64), empty_value)
+
+    def compile(
+        self,
+        invalid_action_penalty: float,
+        actions: list[Directions] | None = None,
+        state_index: StateIndex | None = None,
+    ) -> CompiledMaze:
+        """
+        Compila o grid em tabelas densas de transição, recompensa e ações válidas.
+
+        Args:
+            invalid_action_penalty (float): Recompensa de uma ação que leva a uma célula
+                vazia ou fora do grid.
+            actions (list[Directions] | None): Ações, na ordem das colunas das tabelas.
+                Por padrão, as quatro direções não diagonais.
+            state_index (StateIndex | None): Se informado, as tabelas têm uma linha por
+                célula ocupada, indexada pelos ids compactos do índice, em vez de uma
+                linha por célula do grid.
+
+        Returns:
+            CompiledMaze: Labirinto compilado.
+        """
+        if actions is None:
+            actions = [
+                Directions.UP,
+                Directions.DOWN,
+                Directions.LEFT,
+                Directions.RIGHT,
+            ]
+
+        rows, cols = self.grid_size
+        occupied = self.occupied
+        cell_reward = self.cell_rewards()
+
+        # células de origem de cada linha das tabelas e o id de estado de cada célula
+        if state_index is None:
+            row_ids, col_ids = (ids.ravel() for ids in np.indices(self.grid_size))
+            cell_state = np.arange(rows * cols)
+        else:
+            row_ids, col_ids = state_index.positions.T
+            cell_state = state_index.cell_to_state()
+        state_ids = cell_state[row_ids * cols + col_ids]
+
+        next_state = np.empty((len(state_ids), len(actions)), dtype=np.int64)
+        reward = np.empty((len(state_ids), len(actions)))
+        valid_mask = np.zeros(len(state_ids), dtype=np.uint8)
+
+        for a, direction in enumerate(actions):
+            d_row, d_col = self.DIRECTIONS_DELTA_MAP[direction]
+            next_rows = row_ids + d_row
+            next_cols = col_ids + d_col
+            in_bounds = (
+                (next_rows >= 0)
+                & (next_rows < rows)
+                & (next_cols >= 0)
+                & (next_cols < cols)
+            )
+            next_rows = np.where(in_bounds, next_rows, row_ids)
+            next_cols = np.where(in_bounds, next_cols, col_ids)
+            valid = in_bounds & occupied[next_rows, next_cols]
+
+            next_state[:, a] = np.where(
+                valid, cell_state[next_rows * cols + next_cols], state_ids
+            )
+            reward[:, a] = np.where(
+                valid, cell_reward[next_rows, next_cols], invalid_action_penalty
+            )
+            valid_mask |= valid.astype(np.uint8) << a
+
+        return CompiledMaze(
+            grid_size=self.grid_size,
+            actions=tuple(actions),
+            next_state=next_state,
+            reward=reward,
+            valid_mask=valid_mask,
+            occupied=occupied[row_ids, col_ids],
+            state_index=state_index,
+        )
@@ -1,4 +1,5 @@
 import random
+import numpy as np
 from qtable_example.internal.grid import Grid
 from qtable_example.internal.tile import Tile
 from qtable_example.enums import Directions
@@ -14,8 +15,16 @@ class MapGenerator:
         min_reward: float = 0.0,
         max_cell_neighbors: int = 2,
         map_generation_create_subpath_probability: float = 0.5,
+        rng: random.Random | None = None,
     ):
+        """
+        Args:
+            rng (random.Random | None): Gerador próprio do mapa. Se não informado, usa o
+                módulo global `random`.
+        """
         self.grid = grid
+        self.rng = rng
+        self._random = rng if rng is not None else random
         self.map_max_length = map_max_length
         self.max_reward = max_reward
         self.min_reward = min_reward
@@ -27,13 +36,20 @@ class MapGenerator:
     def generate_map(self, start_cell_position: tuple[int, int], seed: int = 0) -> None:
         """
         Gera um mapa a partir de uma célula inicial.
+
+        Com um `rng` próprio, `seed` (se diferente de 0) apenas o reinicia; sem `seed`,
+        o mapa continua a sequência do gerador. Sem `rng`, o `random` global é
+        re-semeado.
         """
 
         assert (
             self.grid.get_tile(start_cell_position) is not None
         ), "Célula inicial não existe no grid."
 
-        if seed:
+        if self.rng is not None:
+            if seed:
+                self.rng.seed(seed)
+        elif seed:
             random.seed(seed)
         else:
             random.seed(random.randint(0, 1000))
@@ -68,7 +84,7 @@ class MapGenerator:
         while current_length < max_length:
 
             # verifica se deve criar um subcaminho
-            p = random.random()
+            p = self._random.random()
             if p < self.map_generation_create_subpath_probability:
                 # cria um subcaminho
                 self.generate_path(
@@ -83,15 +99,13 @@ class MapGenerator:
             # tenta adicionar uma célula numa direção aleatória(válida)
             # tal que a quatidade de células vizinhas á ela seja menor que 2
             while available_directions:
-                direction = random.choice(available_directions)
+                direction = self._random.choice(available_directions)
                 available_directions.remove(direction)
 
                 future_cell_pos = self.grid.get_position_following_direction(
                     position=last_tile.grid_position, direction=direction
                 )
-                neighbors = self.grid.get_neighbors(future_cell_pos, diagonal=False)
-
-                if self._count_neighbors(neighbors) < self.max_cell_neighbors:
+                if self.grid.count_neighbors(future_cell_pos) < self.max_cell_neighbors:
                     break
                 direction = None
 
@@ -123,7 +137,7 @@ class MapGenerator:
             and self.grid.get_position_following_direction(  # verifica se a posição está dentro do mapa
                 position=tile.grid_position, direction=direction
             )
-            in self.grid._grid
+            is not None
         ]
 
         return valid_directions
@@ -166,29 +180,30 @@ class MapGenerator:
         enquanto as células mais distantes terão recompensas mais baixas.
         As células que são terminais que não a solução terão uma punição negativa.
 
+        O cálculo é feito de uma vez sobre os arrays do grid, com a mesma distância de
+        `calculate_distance`.
+
         Args:
             solution (Tile): Célula de solução.
 
         Returns:
             None
         """
-
-        for tile in self.grid._grid.values():
-            if tile.empty:
-                continue
-
-            if self.grid.is_terminal(tile.grid_position) and tile != solution:
-                tile.reward = self.min_reward
-            elif tile != solution:
-                distance = self.calculate_distance(tile, solution)
-                grid_screen_size = self.grid.tile_size * self.grid.grid_size[0]
-                normalized_distance = distance / grid_screen_size
-                reward = 1 - normalized_distance
-
-                # Normaliza a recompensa para o intervalo [min_reward, max_reward]
-                reward = self.min_reward + (
-                    reward * (self.max_reward - self.min_reward)
-                )
-                tile.reward = reward
-            else:
-                tile.reward = self.max_reward
+        solution_row, solution_col = solution.grid_position
+        rows, cols = np.nonzero(self.grid.occupied)
+
+        dx = (rows - solution_row) * self.grid.tile_size
+        dy = (cols - solution_col) * self.grid.tile_size
+        # `** 0.5` do Python, como em `calculate_distance`: np.sqrt difere dele no
+        # último bit em alguns casos, o que mudaria as recompensas de mapas já gerados
+        distance = np.array([d**0.5 for d in (dx**2 + dy**2).tolist()])
+        grid_screen_size = self.grid.tile_size * self.grid.grid_size[0]
+        reward = 1 - distance / grid_screen_size
+
+        # Normaliza a recompensa para o intervalo [min_reward, max_reward]
+        reward = self.min_reward + (reward * (self.max_reward - self.min_reward))
+
+        # terminais (que não a solução) são punidas
+        reward[self.grid.neighbor_counts()[rows, cols] == 1] = self.min_reward
+        reward[(rows == solution_row) & (cols == solution_col)] = self.max_reward
+        self.grid.rewards[rows, cols] = reward
@@ -0,0 +1,90 @@
+import numpy as np
+
+
+class StateIndex:
+    """
+    Índice compacto de estados: associa cada célula ocupada do grid a um id denso em
+    `[0, n_ocupadas)`, em ordem de linha e coluna.
+
+    Permite Q-tables de formato (n_ocupadas, n_ações), sem linhas para as células vazias,
+    onde o agente nunca pode estar. A busca posição → id usa um vetor int32 com uma
+    entrada por célula do grid (4 bytes por célula), bem menor que a própria Q-table
+    densa que o índice substitui.
+    """
+
+    def __init__(self, grid_size: tuple[int, int], positions: np.ndarray):
+        """
+        Inicializa o índice. Normalmente criado por `Grid.state_index`.
+
+        Args:
+            grid_size (tuple[int, int]): Tamanho do grid (linhas, colunas).
+            positions (np.ndarray): Posições (linha, coluna) das células ocupadas,
+                matriz (n_ocupadas, 2) em ordem de linha e coluna.
+        """
+        self.grid_size = grid_size
+        self.positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+
+        rows, cols = grid_size
+        self._cell_state = np.full(rows * cols, -1, dtype=np.int32)
+        self._cell_state[self.positions[:, 0] * cols + self.positions[:, 1]] = (
+            np.arange(len(self.positions), dtype=np.int32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, position: tuple[int, int]) -> bool:
+        return self._lookup(position) >= 0
+
+    def _lookup(self, position: tuple[int, int]) -> int:
+        row, col = position
+        rows, cols = self.grid_size
+        if not (0 <= row < rows and 0 <= col < cols):
+            return -1
+        return self._cell_state.item(row * cols + col)
+
+    def state_id(self, position: tuple[int, int]) -> int:
+        """
+        Converte uma posição (linha, coluna) no id compacto da célula.
+
+        Args:
+            position (tuple[int, int]): Posição de uma célula ocupada.
+
+        Returns:
+            int: Id compacto.
+        """
+        state_id = self._lookup(position)
+        if state_id < 0:
+            raise KeyError(position)
+        return state_id
+
+    def position(self, state_id: int) -> tuple[int, int]:
+        """
+        Converte um id compacto na posição (linha, coluna) da célula.
+
+        Args:
+            state_id (int): Id compacto.
+
+        Returns:
+            tuple[int, int]: Posição no grid (linha, coluna).
+        """
+        row, col = self.positions[state_id]
+        return int(row), int(col)
+
+    def cell_to_state(self) -> np.ndarray:
+        """
+        Retorna um vetor int32 (linhas * colunas,) com o id compacto de cada célula do
+        grid, indexado por `linha * colunas + coluna`, e -1 nas células vazias.
+        É o vetor usado pelo próprio índice: não deve ser alterado.
+        """
+        return self._cell_state
+
+    @property
+    def occupancy(self) -> float:
+        """
+        Fração das células do grid que estão ocupadas.
+        """
+        return len(self) / (self.grid_size[0] * self.grid_size[1])
+
+    def __repr__(self) -> str:
+        return f"StateIndex(grid_size={self.grid_size}, n_states={len(self)})"
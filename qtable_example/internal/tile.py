@@ -1,3 +1,9 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from qtable_example.internal.grid import Grid
+
+
 class Tile:
     """
     Representa uma tile (ou célula) em um tabuleiro de jogo.
@@ -29,3 +35,53 @@ class Tile:
 
     def __repr__(self) -> str:
         return f"Tile(grid_position={self.grid_position}, size={self.size}, empty={self.empty}, reward={self.reward})"
+
+
+class TileView:
+    """
+    Visão de uma célula de um `Grid`, com a mesma interface da `Tile`.
+    Não guarda estado: lê e escreve direto nos arrays do grid, então é barata de criar
+    e qualquer alteração feita por ela é vista pelo grid (e vice-versa).
+    """
+
+    __slots__ = ("grid", "grid_position")
+
+    def __init__(self, grid: "Grid", grid_position: tuple[int, int]):
+        """
+        Args:
+            grid (Grid): Grid dono da célula.
+            grid_position (tuple[int, int]): Posição da célula no grid.
+        """
+        self.grid = grid
+        self.grid_position = grid_position
+
+    @property
+    def size(self) -> int:
+        return self.grid.tile_size
+
+    @property
+    def empty(self) -> bool:
+        return self.grid.is_empty(self.grid_position)
+
+    @empty.setter
+    def empty(self, empty: bool):
+        self.grid.set_empty(self.grid_position, empty)
+
+    @property
+    def reward(self) -> float:
+        return self.grid.get_reward(self.grid_position)
+
+    @reward.setter
+    def reward(self, reward: float):
+        self.grid.set_reward(self.grid_position, reward)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TileView):
+            return NotImplemented
+        return self.grid is other.grid and self.grid_position == other.grid_position
+
+    def __hash__(self) -> int:
+        return hash((id(self.grid), self.grid_position))
+
+    def __repr__(self) -> str:
+        return f"TileView(grid_position={self.grid_position}, size={self.size}, empty={self.empty}, reward={self.reward})"
@@ -1,16 +1,25 @@
 import pygame
 
 from qtable_example.renders.camera_render import CameraGroup
+from qtable_example.renders.frame_pacer import FramePacer
 from qtable_example.renders.grid_renderer import GridRenderer
 
+from qtable_example.sprites.agent_sprite import AgentSprite
 from qtable_example.sprites.camera_center import CameraCenter
 from qtable_example.sprites.tile_sprite import TileSprite
 
 from qtable_example.internal.grid import Grid
 from qtable_example.internal.map_generator import MapGenerator
 
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.background_training import SnapshotBuffer, TrainingWorker
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+
 from qtable_example.ui.ui_manager import UIManager
 
+import numpy as np
+
 import sys
 
 sys.setrecursionlimit(10**6)
@@ -25,77 +34,117 @@ GAME_MAX_REWARD = 10.0  # max reward for the game
 GAME_MIN_REWARD = -10  # min reward for the game
 MAX_CELL_NEIGHBORS = 2  # max number of neighbors for each cell when generating the map
 MAP_GENERATION_CREATE_SUBPATH_PROBABILITY = 0.9  # probability of creating a subpath
-
-
-pygame.init()
-screen = pygame.display.set_mode(
-    SCREEN_SIZE, pygame.RESIZABLE | pygame.DOUBLEBUF, pygame.SRCALPHA
-)
-pygame.display.set_caption("Grid Renderer Example")
-clock = pygame.time.Clock()
-running = True
-
-
-game_surface_w = SCREEN_SIZE[0] * 0.7
-game_surface_h = SCREEN_SIZE[1] * 1
-game_surface = screen.subsurface(((0, 0, game_surface_w, game_surface_h)))
-
-ui_surface_w = SCREEN_SIZE[0] * 0.3
-ui_surface_h = SCREEN_SIZE[1] * 1
-ui_surface = screen.subsurface((game_surface_w, 0, ui_surface_w, ui_surface_h))
-
-grid_size = (GRID_SIZE[0] * TILE_SIZE, GRID_SIZE[1] * TILE_SIZE)
-
-camera = CameraGroup(game_surface)
-
-grid = Grid(
-    tile_size=TILE_SIZE,
-    grid_size=GRID_SIZE,
-    max_reward=GAME_MAX_REWARD,
-)
-
-map_generator = MapGenerator(
-    grid=grid,
-    map_max_length=MAX_MAX_LENGTH,
-    max_reward=GAME_MAX_REWARD,
-    min_reward=GAME_MIN_REWARD,
-    max_cell_neighbors=MAX_CELL_NEIGHBORS,
-    map_generation_create_subpath_probability=MAP_GENERATION_CREATE_SUBPATH_PROBABILITY,
-)
-
-# WARNING: Map Generator will overwrite the grid
-map_generator.generate_map(
-    # seed=SEED,
-    start_cell_position=grid.get_grid_center(),
-)
-
-solution = grid.generate_random_solution(only_terminal=False)
-map_generator.generate_euclidian_rewards(solution)
-
-camera_center = CameraCenter(camera_group=camera)
-grid_render = GridRenderer(
-    grid=grid, grid_start_position=GRID_START_POSITION, camera_group=camera
-)
-
-grid_render._initialize_tiles()
-grid_render.update()
-
-MAX_ZOOM = 1.5
-MIN_ZOOM = 0.5
-
-ui = UIManager(ui_surface)
-ui.draw()
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        if event.type == pygame.MOUSEWHEEL:
-            new_zoom = camera.zoom_scale + event.y * 0.03
-            camera.zoom_scale = min(max(new_zoom, MIN_ZOOM), MAX_ZOOM)
-
-    camera.update()
-    camera.custom_draw(camera_center)
-    ui.update()
-    pygame.display.update()
-    clock.tick(30)
+FPS = 30  # render frame budget
+TRAIN_IN_PROCESS = True  # train in a separate process instead of a thread
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode(
+        SCREEN_SIZE, pygame.RESIZABLE | pygame.DOUBLEBUF, pygame.SRCALPHA
+    )
+    pygame.display.set_caption("Grid Renderer Example")
+    running = True
+
+    game_surface_w = SCREEN_SIZE[0] * 0.7
+    game_surface_h = SCREEN_SIZE[1] * 1
+    game_surface = screen.subsurface(((0, 0, game_surface_w, game_surface_h)))
+
+    ui_surface_w = SCREEN_SIZE[0] * 0.3
+    ui_surface_h = SCREEN_SIZE[1] * 1
+    ui_surface = screen.subsurface((game_surface_w, 0, ui_surface_w, ui_surface_h))
+
+    grid_size = (GRID_SIZE[0] * TILE_SIZE, GRID_SIZE[1] * TILE_SIZE)
+
+    camera = CameraGroup(game_surface)
+
+    grid = Grid(
+        tile_size=TILE_SIZE,
+        grid_size=GRID_SIZE,
+        max_reward=GAME_MAX_REWARD,
+    )
+
+    map_generator = MapGenerator(
+        grid=grid,
+        map_max_length=MAX_MAX_LENGTH,
+        max_reward=GAME_MAX_REWARD,
+        min_reward=GAME_MIN_REWARD,
+        max_cell_neighbors=MAX_CELL_NEIGHBORS,
+        map_generation_create_subpath_probability=MAP_GENERATION_CREATE_SUBPATH_PROBABILITY,
+    )
+
+    # WARNING: Map Generator will overwrite the grid
+    map_generator.generate_map(
+        # seed=SEED,
+        start_cell_position=grid.get_grid_center(),
+    )
+
+    solution = grid.generate_random_solution(only_terminal=False)
+    map_generator.generate_euclidian_rewards(solution)
+
+    camera_center = CameraCenter(camera_group=camera)
+    grid_render = GridRenderer(
+        grid=grid, grid_start_position=GRID_START_POSITION, camera_group=camera
+    )
+
+    grid_render._initialize_tiles()
+    grid_render.update()
+    agent_sprite = AgentSprite(camera_group=camera, tile_size=TILE_SIZE)
+
+    # treino em segundo plano, começando do centro, onde o mapa foi gerado
+    agent = QLearningAgent(ACTIONS, GRID_SIZE, rng=np.random.default_rng(SEED))
+    env = Envoriment(
+        grid,
+        agent,
+        solution.grid_position,
+        compiled=True,
+        start_position=grid.get_grid_center(),
+    )
+    snapshots = SnapshotBuffer(agent.q_table.shape, agent.dtype)
+    worker = TrainingWorker(env, snapshots, use_process=TRAIN_IN_PROCESS)
+    worker.start()
+
+    MAX_ZOOM = 1.5
+    MIN_ZOOM = 0.5
+
+    ui = UIManager(ui_surface)
+    ui.draw()
+    pacer = FramePacer(FPS)
+    drawn_version = -1
+    try:
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                if event.type == pygame.MOUSEWHEEL:
+                    new_zoom = camera.zoom_scale + event.y * 0.03
+                    camera.zoom_scale = min(max(new_zoom, MIN_ZOOM), MAX_ZOOM)
+
+            snapshot = snapshots.read(newer_than=drawn_version)
+            if snapshot is not None:
+                drawn_version = snapshot.version
+                agent_sprite.move_to(
+                    grid_render._grid_to_screen_coordinates(snapshot.position)
+                )
+                state_value = snapshot.q_table[snapshot.position].max()
+                pygame.display.set_caption(
+                    f"Episode {snapshot.episode} | step {snapshot.step} | "
+                    f"epsilon {snapshot.exploration_rate:.3f} | "
+                    f"V(s) {state_value:.2f} | skipped frames {pacer.skipped_frames}"
+                )
+
+            camera.update()
+            camera.custom_draw(camera_center)
+            ui.update()
+            pygame.display.update()
+            pacer.wait()
+    finally:
+        worker.stop()
+        snapshots.close()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
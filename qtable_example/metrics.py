@@ -0,0 +1,228 @@
+import numpy as np
+
+import os
+import time
+from typing import Callable
+
+# colunas registradas por episódio
+METRIC_COLUMNS = {
+    "steps": np.dtype(np.int64),
+    "total_reward": np.dtype(np.float64),
+    "success": np.dtype(np.bool_),
+    "exploration_rate": np.dtype(np.float64),
+    "wall_time": np.dtype(np.float64),
+    "max_delta_q": np.dtype(np.float64),
+}
+
+
+class ColumnFile:
+    """
+    Append-only `.npy` file holding a single 1-D column.
+
+    The header has a fixed size and is rewritten in place after each append, always
+    after the data it describes, so `np.load(path, mmap_mode="r")` can read a
+    consistent prefix while the file is still being written.
+    """
+
+    HEADER_SIZE = 128
+
+    def __init__(self, path: str, dtype: np.dtype):
+        """
+        Creates (or truncates) the column file.
+
+        Args:
+            path (str): Path of the `.npy` file.
+            dtype (np.dtype): Type of the column.
+        """
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self._file = open(path, "w+b")
+        self._write_header()
+
+    def _write_header(self):
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(self.dtype),
+                "fortran_order": False,
+                "shape": (self.length,),
+            }
+        )
+        # magic (6) + versão (2) + tamanho do header (2) + header preenchido + "\n"
+        padding = self.HEADER_SIZE - 10 - len(header) - 1
+        header = (header + " " * padding + "\n").encode("latin1")
+        self._file.seek(0)
+        self._file.write(b"\x93NUMPY\x01\x00")
+        self._file.write(len(header).to_bytes(2, "little"))
+        self._file.write(header)
+        self._file.flush()
+
+    def append(self, values: np.ndarray):
+        """
+        Appends values to the end of the column.
+        """
+        if not len(values):
+            return
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self._file.flush()
+        self.length += len(values)
+        self._write_header()
+
+    def close(self):
+        self._file.close()
+
+
+def read_metrics(directory: str) -> dict[str, np.ndarray]:
+    """
+    Memory-maps the columns written by a `MetricsRecorder`. Safe to call while the
+    recorder is still writing; each column holds the episodes flushed so far.
+
+    Args:
+        directory (str): Directory of the recorder.
+
+    Returns:
+        dict[str, np.ndarray]: One read-only array per column.
+    """
+    columns = {}
+    for name, dtype in METRIC_COLUMNS.items():
+        path = os.path.join(directory, f"{name}.npy")
+        if not os.path.exists(path):
+            continue
+        try:
+            columns[name] = np.load(path, mmap_mode="r")
+        except ValueError:
+            # numpy não consegue mapear um arquivo sem dados
+            columns[name] = np.zeros(0, dtype=dtype)
+    return columns
+
+
+class PrintSink:
+    """
+    Rate-limited printer of episode metrics, for use as a `MetricsRecorder` sink.
+    """
+
+    def __init__(self, min_interval: float = 1.0):
+        """
+        Args:
+            min_interval (float): Minimum number of seconds between two printed lines.
+        """
+        self.min_interval = min_interval
+        self._last_print = -np.inf
+
+    def __call__(self, episode: int, metrics: dict[str, float]):
+        now = time.perf_counter()
+        if now - self._last_print < self.min_interval:
+            return
+        self._last_print = now
+
+        outcome = "reached the solution" if metrics["success"] else "max steps reached"
+        print(
+            f"Episode {episode}: {outcome} "
+            f"(steps={metrics['steps']}, return={metrics['total_reward']:.2f}, "
+            f"epsilon={metrics['exploration_rate']:.3f})"
+        )
+
+
+class MetricsRecorder:
+    """
+    Accumulates per-episode metrics (`METRIC_COLUMNS`) in preallocated NumPy ring
+    buffers.
+
+    With a `directory`, full buffers are flushed in bulk to one append-only `.npy` file
+    per column (see `read_metrics`). Without one, the buffers keep the last `capacity`
+    episodes in memory. Sinks are called with every recorded episode.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        capacity: int = 1024,
+        sinks: list[Callable[[int, dict[str, float]], None]] | None = None,
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            directory (str | None): Where to write the columns. Created if needed.
+            capacity (int): Number of episodes buffered between flushes.
+            sinks (list[Callable] | None): Called with (episode, metrics) per episode.
+        """
+        self.directory = directory
+        self.capacity = capacity
+        self.sinks = sinks or []
+        self.episodes = 0
+
+        self._buffers = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in METRIC_COLUMNS.items()
+        }
+        self._cursor = 0
+        self._files: dict[str, ColumnFile] = {}
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._files = {
+                name: ColumnFile(os.path.join(directory, f"{name}.npy"), dtype)
+                for name, dtype in METRIC_COLUMNS.items()
+            }
+
+    def record(
+        self,
+        steps: int,
+        total_reward: float,
+        success: bool,
+        exploration_rate: float = np.nan,
+        wall_time: float = np.nan,
+        max_delta_q: float = np.nan,
+    ):
+        """
+        Records the metrics of one episode.
+        """
+        metrics = {
+            "steps": steps,
+            "total_reward": total_reward,
+            "success": success,
+            "exploration_rate": exploration_rate,
+            "wall_time": wall_time,
+            "max_delta_q": max_delta_q,
+        }
+        for name, value in metrics.items():
+            self._buffers[name][self._cursor] = value
+
+        for sink in self.sinks:
+            sink(self.episodes, metrics)
+
+        self.episodes += 1
+        self._cursor += 1
+        if self._cursor == self.capacity:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered episodes to disk. Without a directory, only wraps the ring.
+        """
+        if self._files:
+            for name, column in self._files.items():
+                column.append(self._buffers[name][: self._cursor])
+            # o que foi gravado sai do buffer, senão um novo flush o gravaria de novo
+            self._cursor = 0
+        else:
+            self._cursor %= self.capacity
+
+    def recent(self, name: str) -> np.ndarray:
+        """
+        Returns the buffered values of a column, oldest first.
+        """
+        buffer = self._buffers[name]
+        if self._files or self.episodes < self.capacity:
+            return buffer[: self._cursor].copy()
+        return np.roll(buffer, -self._cursor)
+
+    def close(self):
+        """
+        Flushes the remaining episodes and closes the column files.
+        """
+        self.flush()
+        for column in self._files.values():
+            column.close()
+        self._files = {}
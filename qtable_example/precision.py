@@ -0,0 +1,142 @@
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.fast_episode import FastEpisodeRunner
+from qtable_example.internal.grid import Grid
+
+import numpy as np
+
+
+class DriftReport:
+    """
+    How far a Q-table trained with a reduced-precision dtype ends up from the same
+    training run in float64.
+    """
+
+    def __init__(
+        self,
+        dtype: np.dtype,
+        episodes: int,
+        max_abs_error: float,
+        mean_abs_error: float,
+        max_relative_error: float,
+        policy_agreement: float,
+        nbytes: int,
+        reference_nbytes: int,
+    ):
+        """
+        Args:
+            dtype (np.dtype): The reduced-precision dtype.
+            episodes (int): Training episodes of both runs.
+            max_abs_error (float): Max |Q - Q64| over the valid pairs of visited states.
+            mean_abs_error (float): Mean |Q - Q64| over the same pairs.
+            max_relative_error (float): Max |Q - Q64| / max(|Q64|, 1).
+            policy_agreement (float): Fraction of visited states where both tables pick
+                the same greedy valid action.
+            nbytes (int): Size of the reduced-precision Q-table.
+            reference_nbytes (int): Size of the float64 Q-table.
+        """
+        self.dtype = dtype
+        self.episodes = episodes
+        self.max_abs_error = max_abs_error
+        self.mean_abs_error = mean_abs_error
+        self.max_relative_error = max_relative_error
+        self.policy_agreement = policy_agreement
+        self.nbytes = nbytes
+        self.reference_nbytes = reference_nbytes
+
+    def __repr__(self) -> str:
+        return (
+            f"DriftReport(dtype={self.dtype}, episodes={self.episodes}, "
+            f"max_abs_error={self.max_abs_error:.3g}, "
+            f"mean_abs_error={self.mean_abs_error:.3g}, "
+            f"max_relative_error={self.max_relative_error:.3g}, "
+            f"policy_agreement={self.policy_agreement:.3f}, "
+            f"memory={self.nbytes / self.reference_nbytes:.2f}x)"
+        )
+
+
+def measure_dtype_drift(
+    dtype: np.dtype,
+    grid: Grid,
+    solution_position: tuple[int, int],
+    episodes: int = 200,
+    max_steps: int = 1_000,
+    seed: int = 0,
+    agent_params: dict | None = None,
+) -> DriftReport:
+    """
+    Trains two agents on the same maze with the same random stream, one in float64
+    and one in `dtype`, and reports how far the reduced-precision Q-table drifted.
+
+    Both runs make the same choices until rounding changes a greedy action, so the
+    report measures the combined effect of rounding and of the trajectories diverging.
+
+    Args:
+        dtype (np.dtype): The reduced-precision dtype, e.g. np.float32 or np.float16.
+        grid (Grid): The reference maze.
+        solution_position (tuple[int, int]): The solution cell.
+        episodes (int): Training episodes of each run.
+        max_steps (int): The maximum number of steps per episode.
+        seed (int): Seed of the agents' random generator.
+        agent_params (dict | None): Keyword arguments for `QLearningAgent`.
+
+    Returns:
+        DriftReport: The drift statistics.
+    """
+    action_space = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+    maze = grid.compile(Envoriment.INVALID_ACTION_PENALTY, actions=action_space)
+
+    q_tables = []
+    for table_dtype in (np.float64, dtype):
+        agent = QLearningAgent(
+            action_space,
+            grid.grid_size,
+            rng=np.random.default_rng(seed),
+            dtype=table_dtype,
+            **(agent_params or {}),
+        )
+        FastEpisodeRunner(maze, agent, solution_position, max_steps=max_steps).run(
+            episodes
+        )
+        q_tables.append(agent.q_table)
+
+    reference, reduced = q_tables
+    reference_matrix = reference.reshape(-1, maze.n_actions)
+    reduced_matrix = reduced.reshape(-1, maze.n_actions).astype(np.float64)
+
+    valid = maze.valid_matrix
+    visited = np.flatnonzero((reference_matrix != 0).any(axis=1) & valid.any(axis=1))
+    valid = valid[visited]
+    reference_matrix = reference_matrix[visited]
+    reduced_matrix = reduced_matrix[visited]
+
+    error = np.abs(reduced_matrix - reference_matrix)[valid]
+    scale = np.maximum(np.abs(reference_matrix[valid]), 1.0)
+    greedy_reference = np.where(valid, reference_matrix, -np.inf).argmax(axis=1)
+    greedy_reduced = np.where(valid, reduced_matrix, -np.inf).argmax(axis=1)
+
+    return DriftReport(
+        dtype=np.dtype(dtype),
+        episodes=episodes,
+        max_abs_error=float(error.max(initial=0.0)),
+        mean_abs_error=float(error.mean()) if error.size else 0.0,
+        max_relative_error=float((error / scale).max(initial=0.0)),
+        policy_agreement=(
+            float((greedy_reference == greedy_reduced).mean()) if visited.size else 1.0
+        ),
+        nbytes=reduced.nbytes,
+        reference_nbytes=reference.nbytes,
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    from qtable_example.experiments import generate_maze
+
+    sys.setrecursionlimit(10**6)
+
+    grid, solution = generate_maze(41)
+    for dtype in (np.float32, np.float16):
+        print(measure_dtype_drift(dtype, grid, solution.grid_position))
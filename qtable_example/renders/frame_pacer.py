@@ -0,0 +1,45 @@
+import time
+
+
+class FramePacer:
+    """
+    Mantém o loop de renderização numa taxa fixa de quadros.
+
+    Quando um quadro demora mais que o orçamento, os quadros perdidos são pulados em
+    vez de renderizados em sequência para recuperar o atraso: o próximo quadro
+    começa no próximo horário do cronograma.
+    """
+
+    def __init__(self, fps: float = 30.0):
+        """
+        Inicializa o controlador de quadros.
+
+        Args:
+            fps (float): Quadros por segundo desejados.
+        """
+        assert fps > 0, "fps deve ser positivo."
+        self.frame_time = 1.0 / fps
+        self.frames = 0
+        self.skipped_frames = 0
+        self._deadline = time.perf_counter() + self.frame_time
+
+    def wait(self) -> int:
+        """
+        Espera até o início do próximo quadro.
+
+        Returns:
+            int: Quantos quadros foram pulados porque o quadro atual passou do
+            orçamento.
+        """
+        self.frames += 1
+        now = time.perf_counter()
+        if now < self._deadline:
+            time.sleep(self._deadline - now)
+            self._deadline += self.frame_time
+            return 0
+
+        # atrasado: pula os quadros perdidos e volta ao cronograma
+        skipped = int((now - self._deadline) // self.frame_time) + 1
+        self._deadline += (skipped + 1) * self.frame_time
+        self.skipped_frames += skipped
+        return skipped
@@ -43,7 +43,7 @@ class GridRenderer(pygame.sprite.Group):
 
     def _initialize_tiles(self):
         self.empty()
-        for cell in self.grid._grid.values():
+        for cell in self.grid.tiles():
             tile = TileSprite(
                 camera_group=self.camera_group,
                 tile=cell,
@@ -0,0 +1,383 @@
+import os
+
+# sem janela: precisa ser definido antes de o pygame iniciar o vídeo
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from qtable_example.internal.grid import Grid
+from qtable_example.renders.camera_render import CameraGroup
+from qtable_example.renders.grid_renderer import GridRenderer
+from qtable_example.sprites.agent_sprite import AgentSprite
+from qtable_example.sprites.camera_center import CameraCenter
+
+import json
+import queue
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from qtable_example.envoriment import Envoriment
+
+
+class PngSequenceWriter:
+    """
+    Grava cada quadro como um PNG numerado (`frame_000000.png`, ...).
+    """
+
+    def __init__(self, directory: str, prefix: str = "frame"):
+        """
+        Args:
+            directory (str): Diretório de saída, criado se não existir.
+            prefix (str): Prefixo dos arquivos.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.frames = 0
+
+    def write(self, pixels: bytes, size: tuple[int, int]):
+        surface = pygame.image.frombuffer(pixels, size, "RGB")
+        path = os.path.join(self.directory, f"{self.prefix}_{self.frames:06d}.png")
+        pygame.image.save(surface, path)
+        self.frames += 1
+
+    def close(self):
+        pass
+
+
+class RawVideoWriter:
+    """
+    Grava os quadros em sequência num único arquivo rgb24 sem compressão, o formato
+    `rawvideo` do ffmpeg. Ao fechar, grava ao lado um `<path>.json` com largura,
+    altura, taxa de quadros e o comando para converter o arquivo em vídeo.
+    """
+
+    def __init__(self, path: str, fps: float = 30.0):
+        """
+        Args:
+            path (str): Arquivo de saída.
+            fps (float): Taxa de quadros do vídeo gerado a partir do arquivo.
+        """
+        self.path = path
+        self.fps = fps
+        self.frames = 0
+        self.size: tuple[int, int] | None = None
+        self._file = open(path, "wb")
+
+    def write(self, pixels: bytes, size: tuple[int, int]):
+        if self.size is None:
+            self.size = size
+        assert size == self.size, "Todos os quadros precisam ter o mesmo tamanho."
+        self._file.write(pixels)
+        self.frames += 1
+
+    def close(self):
+        self._file.close()
+        width, height = self.size or (0, 0)
+        metadata = {
+            "pix_fmt": "rgb24",
+            "width": width,
+            "height": height,
+            "fps": self.fps,
+            "frames": self.frames,
+            "ffmpeg": (
+                f"ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} "
+                f"-r {self.fps} -i {self.path} -pix_fmt yuv420p out.mp4"
+            ),
+        }
+        with open(f"{self.path}.json", "w") as file:
+            json.dump(metadata, file, indent=2)
+
+
+class BackgroundEncoder:
+    """
+    Codifica e grava quadros numa thread própria, para que quem captura os quadros
+    (o treino) não espere pela compressão nem pelo disco.
+
+    Se a fila encher, o quadro é descartado (`dropped_frames`), a não ser que
+    `block=True`.
+    """
+
+    def __init__(self, writer, max_pending: int = 64, block: bool = False):
+        """
+        Args:
+            writer: `PngSequenceWriter`, `RawVideoWriter` ou outro objeto com
+                `write(pixels, size)` e `close()`.
+            max_pending (int): Quadros aguardando gravação.
+            block (bool): Se True, espera espaço na fila em vez de descartar.
+        """
+        self.writer = writer
+        self.block = block
+        self.submitted_frames = 0
+        self.dropped_frames = 0
+        self.error: BaseException | None = None
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, pixels: bytes, size: tuple[int, int]):
+        """
+        Enfileira um quadro rgb24.
+        """
+        self._raise_error()
+        try:
+            self._queue.put((pixels, size), block=self.block)
+        except queue.Full:
+            self.dropped_frames += 1
+            return
+        self.submitted_frames += 1
+
+    def close(self):
+        """
+        Grava os quadros pendentes e fecha o writer.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self.writer.close()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError(f"Falha ao gravar quadro: {error}") from error
+
+    def _worker(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            if self.error is not None:
+                continue
+            try:
+                self.writer.write(*frame)
+            except BaseException as error:
+                self.error = error
+
+
+class HeadlessRenderer:
+    """
+    Renderiza o grid e o agente, com `GridRenderer` e `CameraGroup`, numa superfície
+    em memória, sem janela.
+    """
+
+    TEXT_COLOR = (255, 255, 255)
+    TEXT_BACKGROUND_COLOR = (0, 0, 0)
+
+    def __init__(self, grid: Grid, scale: float = 1.0, show_status: bool = True):
+        """
+        Args:
+            grid (Grid): O grid a renderizar.
+            scale (float): Escala dos quadros em relação ao tamanho do grid em pixels
+                (`tile_size` por célula).
+            show_status (bool): Se True, escreve episódio e passo no canto do quadro.
+        """
+        pygame.init()
+        rows, cols = grid.grid_size
+        grid_size = (cols * grid.tile_size, rows * grid.tile_size)
+
+        # com a superfície interna do tamanho da tela, a câmera centrada em (0, 0)
+        # desenha o grid a partir do canto superior esquerdo
+        self.surface = pygame.Surface(grid_size)
+        self.camera = CameraGroup(self.surface, camera_internal_surface_size=grid_size)
+        self.grid_render = GridRenderer(grid=grid, camera_group=self.camera)
+        self.camera_center = CameraCenter(camera_group=self.camera)
+        self.agent_sprite = AgentSprite(self.camera, grid.tile_size)
+
+        self.size = (
+            max(1, round(grid_size[0] * scale)),
+            max(1, round(grid_size[1] * scale)),
+        )
+        self.show_status = show_status
+        self.font = pygame.font.Font(None, 24)
+
+    def render(self, position: tuple[int, int], status: str = "") -> pygame.Surface:
+        """
+        Desenha um quadro com o agente na célula `position`.
+
+        Returns:
+            pygame.Surface: O quadro, no tamanho `size`.
+        """
+        self.agent_sprite.move_to(
+            self.grid_render._grid_to_screen_coordinates(position)
+        )
+        self.camera.custom_draw(self.camera_center)
+
+        frame = self.surface
+        if frame.get_size() != self.size:
+            frame = pygame.transform.smoothscale(frame, self.size)
+        if self.show_status and status:
+            frame.blit(
+                self.font.render(
+                    status, True, self.TEXT_COLOR, self.TEXT_BACKGROUND_COLOR
+                ),
+                (4, 4),
+            )
+        return frame
+
+    def render_bytes(self, position: tuple[int, int], status: str = "") -> bytes:
+        """
+        Como `render`, mas devolve os pixels rgb24 do quadro.
+        """
+        return pygame.image.tobytes(self.render(position, status), "RGB")
+
+
+class HeadlessRecorder:
+    """
+    Grava quadros de um treino do `Envoriment` a cada `every_steps` passos e/ou ao
+    fim de cada `every_episodes` episódios.
+
+    `attach` instala, só nesta instância do ambiente, um wrapper em
+    `step`/`step_compiled` e `run_episode` (como `Instrumentation`); o ambiente sem
+    gravador não muda. O quadro é desenhado na thread do treino e a codificação fica
+    com o `BackgroundEncoder`.
+    """
+
+    def __init__(
+        self,
+        renderer: HeadlessRenderer,
+        encoder: BackgroundEncoder,
+        every_steps: int | None = None,
+        every_episodes: int | None = 1,
+    ):
+        """
+        Args:
+            renderer (HeadlessRenderer): Renderizador do grid do ambiente.
+            encoder (BackgroundEncoder): Destino dos quadros.
+            every_steps (int | None): Intervalo em passos entre quadros.
+            every_episodes (int | None): Intervalo em episódios entre quadros,
+                capturados ao fim do episódio.
+        """
+        assert every_steps or every_episodes, "Informe every_steps e/ou every_episodes."
+        self.renderer = renderer
+        self.encoder = encoder
+        self.every_steps = every_steps
+        self.every_episodes = every_episodes
+        self.steps = 0
+        self.episodes = 0
+        self._patched: list[tuple[object, str, bool, object]] = []
+
+    def capture(self, env: "Envoriment"):
+        """
+        Renderiza o estado atual do ambiente e envia o quadro ao encoder.
+        """
+        if env.compiled:
+            position = env.maze.position(env.agent_current_state)
+        else:
+            position = env.agent_current_pos
+        status = f"episode {env.episode_count}  step {env.current_step}"
+        pixels = self.renderer.render_bytes(position, status)
+        self.encoder.submit(pixels, self.renderer.size)
+
+    def attach(self, env: "Envoriment"):
+        assert not self._patched, "HeadlessRecorder is already attached."
+
+        if self.every_steps:
+            step_name = "step_compiled" if env.compiled else "step"
+            step = self._patch(env, step_name)
+
+            def recording_step():
+                step()
+                self.steps += 1
+                if self.steps % self.every_steps == 0:
+                    self.capture(env)
+
+            setattr(env, step_name, recording_step)
+
+        if self.every_episodes:
+            run_episode = self._patch(env, "run_episode")
+
+            def recording_run_episode():
+                run_episode()
+                self.episodes += 1
+                if self.episodes % self.every_episodes == 0:
+                    self.capture(env)
+
+            env.run_episode = recording_run_episode
+
+    def detach(self):
+        """
+        Restaura os métodos que estavam no ambiente antes de `attach`, inclusive
+        wrappers de outros (como os de `Instrumentation`).
+        """
+        for owner, name, had_attribute, original in reversed(self._patched):
+            if had_attribute:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self._patched.clear()
+
+    def _patch(self, owner: object, name: str):
+        # guarda o que estava na instância para `detach` restaurar
+        had_attribute = name in vars(owner)
+        original = getattr(owner, name)
+        self._patched.append(
+            (owner, name, had_attribute, original if had_attribute else None)
+        )
+        return original
+
+
+def record_run(
+    env: "Envoriment",
+    episodes: int,
+    output: str,
+    every_steps: int | None = None,
+    every_episodes: int | None = 1,
+    scale: float = 1.0,
+    raw: bool = False,
+    fps: float = 30.0,
+) -> BackgroundEncoder:
+    """
+    Treina `env` por `episodes` episódios gravando quadros sem janela.
+
+    Args:
+        env (Envoriment): O ambiente.
+        episodes (int): Episódios de treino.
+        output (str): Diretório dos PNGs, ou arquivo rgb24 com `raw=True`.
+        every_steps (int | None): Intervalo em passos entre quadros.
+        every_episodes (int | None): Intervalo em episódios entre quadros.
+        scale (float): Escala dos quadros.
+        raw (bool): Grava um stream rgb24 (`RawVideoWriter`) em vez de PNGs.
+        fps (float): Taxa de quadros anotada no stream rgb24.
+
+    Returns:
+        BackgroundEncoder: O encoder, já fechado, com as contagens de quadros.
+    """
+    writer = RawVideoWriter(output, fps=fps) if raw else PngSequenceWriter(output)
+    encoder = BackgroundEncoder(writer)
+    recorder = HeadlessRecorder(
+        HeadlessRenderer(env.grid, scale=scale),
+        encoder,
+        every_steps=every_steps,
+        every_episodes=every_episodes,
+    )
+    recorder.attach(env)
+    try:
+        env.run(episodes, verbose=False)
+    finally:
+        recorder.detach()
+        encoder.close()
+    return encoder
+
+
+if __name__ == "__main__":
+    import sys
+
+    from qtable_example.agents.q_learng_agent import QLearningAgent
+    from qtable_example.enums import Directions
+    from qtable_example.envoriment import Envoriment
+    from qtable_example.experiments import generate_maze
+
+    sys.setrecursionlimit(10**6)
+
+    grid, solution = generate_maze(41)
+    agent = QLearningAgent(
+        [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT],
+        grid.grid_size,
+    )
+    env = Envoriment(grid, agent, solution.grid_position, compiled=True)
+    encoder = record_run(env, episodes=200, output="frames", every_steps=50)
+    print(
+        f"{encoder.submitted_frames} frames written, "
+        f"{encoder.dropped_frames} dropped."
+    )
@@ -0,0 +1,84 @@
+import numpy as np
+
+import random
+
+
+def python_random(seed_sequence: np.random.SeedSequence) -> random.Random:
+    """
+    Creates a `random.Random` seeded from a seed sequence.
+
+    Args:
+        seed_sequence (np.random.SeedSequence): The seed sequence.
+
+    Returns:
+        random.Random: An independent Python random generator.
+    """
+    state = seed_sequence.generate_state(4, np.uint32)
+    return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+
+class RunSeeds:
+    """
+    Independent random streams of one training run, derived from a single seed.
+
+    Each component gets its own generator, spawned from the run's
+    `np.random.SeedSequence`:
+
+    - `map_rng`: `random.Random` for `MapGenerator`.
+    - `solution_rng`: `random.Random` for `Grid.generate_random_solution`.
+    - `agent_rng`: `np.random.Generator` for the agent's action selection.
+    - `replay_rng`: `np.random.Generator` for replay buffers and planning.
+
+    Every call returns a fresh generator at the start of its stream, so a run can be
+    replayed exactly from its seed. `spawn` derives the seeds of many parallel runs
+    whose streams do not overlap.
+    """
+
+    def __init__(self, seed: int | np.random.SeedSequence | None = None):
+        """
+        Args:
+            seed (int | np.random.SeedSequence | None): Root seed of the run. None
+                draws fresh entropy from the OS (see `entropy` to record it).
+        """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        self._map, self._solution, self._agent, self._replay = seed.spawn(4)
+
+    @property
+    def entropy(self) -> int:
+        """
+        Entropy of the root seed; `RunSeeds(entropy)` reproduces a root run.
+        """
+        return self.seed_sequence.entropy
+
+    def map_rng(self) -> random.Random:
+        return python_random(self._map)
+
+    def solution_rng(self) -> random.Random:
+        return python_random(self._solution)
+
+    def agent_rng(self) -> np.random.Generator:
+        return np.random.default_rng(self._agent)
+
+    def replay_rng(self) -> np.random.Generator:
+        return np.random.default_rng(self._replay)
+
+    def spawn(self, n_runs: int) -> list["RunSeeds"]:
+        """
+        Derives the seeds of `n_runs` independent child runs. Successive calls derive
+        new runs, in a deterministic order.
+
+        Args:
+            n_runs (int): Number of runs.
+
+        Returns:
+            list[RunSeeds]: One `RunSeeds` per run.
+        """
+        return [RunSeeds(child) for child in self.seed_sequence.spawn(n_runs)]
+
+    def __repr__(self) -> str:
+        return (
+            f"RunSeeds(entropy={self.seed_sequence.entropy}, "
+            f"spawn_key={self.seed_sequence.spawn_key})"
+        )
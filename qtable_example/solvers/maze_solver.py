@@ -0,0 +1,234 @@
+from qtable_example.internal.compiled_maze import CompiledMaze
+
+import numpy as np
+
+import time
+
+
+class SolverResult:
+    """
+    Optimal values of a maze and the statistics of the run that computed them.
+    """
+
+    def __init__(
+        self,
+        q_table: np.ndarray,
+        values: np.ndarray,
+        policy: np.ndarray,
+        iterations: int,
+        sweeps: int,
+        delta: float,
+        converged: bool,
+        elapsed: float,
+    ):
+        """
+        Args:
+            q_table (np.ndarray): Q* with the same layout as `QLearningAgent.q_table`
+                (one row per occupied cell if the maze has a `state_index`).
+            values (np.ndarray): V* per flat state id (0 for empty cells and the solution).
+            policy (np.ndarray): Greedy action index per flat state id (-1 where the
+                cell is empty or has no valid action).
+            iterations (int): Outer iterations (value updates or policy improvements).
+            sweeps (int): Total Bellman sweeps over the state space.
+            delta (float): Last max |change| of the values.
+            converged (bool): Whether `delta` fell below the tolerance.
+            elapsed (float): Wall time in seconds.
+        """
+        self.q_table = q_table
+        self.values = values
+        self.policy = policy
+        self.iterations = iterations
+        self.sweeps = sweeps
+        self.delta = delta
+        self.converged = converged
+        self.elapsed = elapsed
+
+    def compare(self, q_table: np.ndarray, valid: np.ndarray) -> tuple[float, float]:
+        """
+        Measures how far a learned Q-table is from Q*.
+
+        Args:
+            q_table (np.ndarray): A Q-table with the same layout as `self.q_table`.
+            valid (np.ndarray): Valid-action matrix (n_states, n_actions) of the maze,
+                e.g. `CompiledMaze.valid_matrix`.
+
+        Returns:
+            tuple[float, float]: Max |Q - Q*| over valid pairs of states with a policy,
+            and the fraction of those states where the greedy action of `q_table` is
+            also optimal.
+        """
+        n_actions = q_table.shape[-1]
+        learned = q_table.reshape(-1, n_actions)
+        optimal = self.q_table.reshape(-1, n_actions)
+        states = np.flatnonzero(self.policy >= 0)
+
+        state_valid = valid[states]
+        error = np.abs(learned[states] - optimal[states])[state_valid].max()
+
+        greedy = np.where(state_valid, learned[states], -np.inf).argmax(axis=1)
+        optimal_values = self.values[states]
+        agreement = np.isclose(optimal[states, greedy], optimal_values).mean()
+        return float(error), float(agreement)
+
+    def __repr__(self) -> str:
+        return (
+            f"SolverResult(iterations={self.iterations}, sweeps={self.sweeps}, "
+            f"delta={self.delta:.3g}, converged={self.converged}, "
+            f"elapsed={self.elapsed:.3f}s)"
+        )
+
+
+class MazeSolver:
+    """
+    Computes Q* of a compiled maze with value iteration or policy iteration,
+    using only array operations over its occupied cells.
+
+    Follows the `Envoriment` reward rules: moving into a cell yields its reward (or the
+    invalid-action penalty) and reaching the solution ends the episode, so the solution
+    is terminal and is never bootstrapped from. Only valid actions are considered when
+    maximizing, like the agents do. The problem is treated as infinite-horizon
+    discounted, i.e. `max_steps` is ignored.
+    """
+
+    def __init__(
+        self,
+        maze: CompiledMaze,
+        solution_position: tuple[int, int],
+        discount_factor: float = 0.9,
+        tolerance: float = 1e-6,
+        max_iterations: int = 100_000,
+    ):
+        """
+        Initialize the solver.
+
+        Args:
+            maze (CompiledMaze): The compiled maze.
+            solution_position (tuple[int, int]): The solution cell.
+            discount_factor (float): The discount factor (gamma).
+            tolerance (float): Stops when the max |change| of the values is below it.
+            max_iterations (int): Maximum number of sweeps.
+        """
+        self.maze = maze
+        self.solution_state = maze.state_id(solution_position)
+        self.discount_factor = discount_factor
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+        occupied = maze.occupied.copy()
+        occupied[self.solution_state] = False
+        self.states = np.flatnonzero(occupied & (maze.valid_mask > 0))
+        self.next_state = maze.next_state[self.states]
+        self.reward = maze.reward[self.states]
+        self.valid = maze.valid_matrix[self.states]
+        # chegar na solução termina o episódio: não há valor futuro
+        self.bootstrap = np.where(self.next_state == self.solution_state, 0.0, 1.0)
+
+        # tabelas transpostas (n_actions, n_states) para as varreduras: cada ação é um
+        # vetor contíguo e ações inválidas já valem -inf
+        self._next_state_t = np.ascontiguousarray(self.next_state.T)
+        self._reward_t = np.ascontiguousarray(
+            np.where(self.valid, self.reward, -np.inf).T
+        )
+        self._discount_t = np.ascontiguousarray(
+            (self.discount_factor * self.bootstrap).T
+        )
+
+    def _q_values(self, values: np.ndarray) -> np.ndarray:
+        return (
+            self.reward
+            + self.discount_factor * self.bootstrap * values[self.next_state]
+        )
+
+    def _greedy(self, q_values: np.ndarray) -> np.ndarray:
+        return np.where(self.valid, q_values, -np.inf).argmax(axis=1)
+
+    def _result(self, values, iterations, sweeps, delta, start) -> SolverResult:
+        maze = self.maze
+        q_values = self._q_values(values)
+
+        q_table = np.zeros((maze.n_states, maze.n_actions))
+        q_table[self.states] = q_values
+        policy = np.full(maze.n_states, -1, dtype=np.int64)
+        policy[self.states] = self._greedy(q_values)
+
+        if maze.state_index is None:
+            q_table = q_table.reshape(*maze.grid_size, maze.n_actions)
+
+        return SolverResult(
+            q_table=q_table,
+            values=values,
+            policy=policy,
+            iterations=iterations,
+            sweeps=sweeps,
+            delta=delta,
+            converged=delta < self.tolerance,
+            elapsed=time.perf_counter() - start,
+        )
+
+    def value_iteration(self) -> SolverResult:
+        """
+        Runs synchronous value iteration until the values converge.
+
+        Returns:
+            SolverResult: Q*, V*, the greedy policy and iteration statistics.
+        """
+        start = time.perf_counter()
+        values = np.zeros(self.maze.n_states)
+        delta = np.inf
+        iterations = 0
+
+        q_values = np.empty_like(self._reward_t)
+        new_values = np.empty(len(self.states))
+
+        while delta >= self.tolerance and iterations < self.max_iterations:
+            np.take(values, self._next_state_t, out=q_values)
+            q_values *= self._discount_t
+            q_values += self._reward_t
+            np.max(q_values, axis=0, out=new_values)
+            delta = np.abs(new_values - values[self.states]).max(initial=0.0)
+            values[self.states] = new_values
+            iterations += 1
+
+        return self._result(values, iterations, iterations, delta, start)
+
+    def policy_iteration(self) -> SolverResult:
+        """
+        Runs policy iteration: iterative policy evaluation (to `tolerance`) followed by
+        greedy improvement, until the policy is stable.
+
+        Returns:
+            SolverResult: Q*, V*, the greedy policy and iteration statistics.
+        """
+        start = time.perf_counter()
+        rows = np.arange(len(self.states))
+        values = np.zeros(self.maze.n_states)
+        policy = self._greedy(self.reward)
+        iterations = 0
+        sweeps = 0
+        delta = np.inf
+
+        while sweeps < self.max_iterations:
+            # avaliação da política
+            reward = self.reward[rows, policy]
+            next_state = self.next_state[rows, policy]
+            bootstrap = self.bootstrap[rows, policy]
+            delta = np.inf
+            while delta >= self.tolerance and sweeps < self.max_iterations:
+                new_values = (
+                    reward + self.discount_factor * bootstrap * values[next_state]
+                )
+                delta = np.abs(new_values - values[self.states]).max(initial=0.0)
+                values[self.states] = new_values
+                sweeps += 1
+
+            # melhoria da política: mantém a ação atual em caso de empate
+            q_values = np.where(self.valid, self._q_values(values), -np.inf)
+            best = q_values.max(axis=1)
+            keep = q_values[rows, policy] >= best
+            new_policy = np.where(keep, policy, q_values.argmax(axis=1))
+            iterations += 1
+            if np.array_equal(new_policy, policy):
+                break
+            policy = new_policy
+
+        return self._result(values, iterations, sweeps, delta, start)
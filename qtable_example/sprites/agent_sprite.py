@@ -0,0 +1,28 @@
+import pygame
+
+from qtable_example.renders.camera_render import CameraGroup
+
+
+class AgentSprite(pygame.sprite.Sprite):
+    """
+    Marcador da posição do agente no grid.
+    """
+
+    COLOR = (255, 255, 255)
+
+    def __init__(self, camera_group: CameraGroup, tile_size: int):
+        super().__init__(camera_group)
+        self.image = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+        pygame.draw.circle(
+            self.image,
+            self.COLOR,
+            (tile_size // 2, tile_size // 2),
+            tile_size // 3,
+        )
+        self.rect = self.image.get_rect(topleft=(0, 0))
+
+    def move_to(self, screen_coordinates: tuple[int, int]):
+        """
+        Move o marcador para as coordenadas de tela de uma célula.
+        """
+        self.rect.topleft = screen_coordinates
@@ -0,0 +1,301 @@
+from qtable_example.agents.exploration import ExplorationStrategy
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.envoriment import Envoriment
+from qtable_example.internal.grid import Grid
+from qtable_example.enums import Directions
+
+import numpy as np
+
+
+class VectorEnvoriment:
+    """
+    Runs N mazes in lockstep, advancing every agent with a single batch of NumPy operations.
+
+    Each maze keeps its own `QLearningAgent`; their Q-tables are stacked into a single
+    array of shape (N, rows, cols, actions), padded to the largest grid, and copied back
+    into each agent's `q_table` at the end of `run` (see `sync_agents`). Only the
+    Q-learning update is implemented: the SARSA, Expected SARSA, Double Q and λ agents
+    are rejected and run through `Envoriment`.
+    Episodes that finish (solution reached or `max_steps` exhausted) are reset automatically.
+
+    Actions are chosen with the built-in epsilon-greedy of each agent or, if given, a
+    single `ExplorationStrategy` shared by every maze and applied to the whole batch
+    with `select_batch`.
+    """
+
+    ACTIONS = (Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT)
+    INVALID_ACTION_PENALTY = Envoriment.INVALID_ACTION_PENALTY
+
+    def __init__(
+        self,
+        grids: list[Grid],
+        agents: list[QLearningAgent],
+        solution_positions: list[tuple[int, int]],
+        start_positions: list[tuple[int, int]] | None = None,
+        max_steps: int = 1_000,
+        seed: int | None = None,
+        exploration: ExplorationStrategy | None = None,
+    ):
+        """
+        Initialize the vectorized environment.
+
+        Args:
+            grids (list[Grid]): The mazes, one per environment.
+            agents (list[QLearningAgent]): The agents, one per environment.
+            solution_positions (list[tuple[int, int]]): The solution cell of each maze.
+            start_positions (list[tuple[int, int]] | None): The start cell of each maze.
+                Defaults to (0, 0) for every maze, as in `Envoriment`.
+            max_steps (int): The maximum number of steps per episode.
+            seed (int | None): Seed for the action selection random generator.
+            exploration (ExplorationStrategy | None): Strategy used instead of the
+                agents' epsilon-greedy. It is bound to every cell of every maze, so
+                count-based strategies keep separate counts per maze; its schedules
+                advance once per lockstep step and once every `len(grids)` finished
+                episodes, i.e. with the average episode count of the mazes.
+        """
+        assert (
+            len(grids) == len(agents) == len(solution_positions)
+        ), "grids, agents and solution_positions must have the same length."
+
+        for agent in agents:
+            assert [a.value for a in agent.action_space] == [
+                a.value for a in self.ACTIONS
+            ], "VectorEnvoriment only supports the UP, DOWN, LEFT, RIGHT action space."
+            assert (
+                getattr(agent, "state_index", None) is None
+            ), "VectorEnvoriment requires agents with a full (rows, cols) Q-table."
+            assert (
+                getattr(agent, "exploration", None) is None
+            ), "Pass the exploration strategy to VectorEnvoriment, not to the agents."
+            assert (
+                type(agent).learn_index is QLearningAgent.learn_index
+            ), "VectorEnvoriment only implements the Q-learning update."
+
+        self.grids = grids
+        self.agents = agents
+        self.num_envs = len(grids)
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+
+        if start_positions is None:
+            start_positions = [(0, 0)] * self.num_envs
+
+        self.shape = (
+            max(grid.grid_size[0] for grid in grids),
+            max(grid.grid_size[1] for grid in grids),
+        )
+
+        self._deltas = np.array(
+            [Grid.DIRECTIONS_DELTA_MAP[action] for action in self.ACTIONS]
+        )
+        self._build_tables()
+        self._stack_q_tables()
+
+        self.exploration = exploration
+        if exploration is not None:
+            exploration.bind(
+                self.num_envs * self.shape[0] * self.shape[1], len(self.ACTIONS)
+            )
+
+        self.start_positions = np.array(start_positions, dtype=np.intp)
+        self.solution_positions = np.array(solution_positions, dtype=np.intp)
+
+        self.learning_rate = np.array([a.learning_rate for a in agents])
+        self.discount_factor = np.array([a.discount_factor for a in agents])
+        self.exploration_decay = np.array([a.exploration_decay for a in agents])
+        self.min_exploration_rate = np.array([a.min_exploration_rate for a in agents])
+        self.exploration_rate = np.array([a.exploration_rate for a in agents])
+        if exploration is not None:
+            self.exploration_rate[:] = exploration.exploration_rate
+
+        self.agent_current_pos = self.start_positions.copy()
+        self.current_step = np.zeros(self.num_envs, dtype=np.int64)
+        self.episode_return = np.zeros(self.num_envs)
+        self.rewards = np.zeros(self.num_envs)
+        self.done = np.zeros(self.num_envs, dtype=bool)
+        self.episodes_completed = np.zeros(self.num_envs, dtype=np.int64)
+
+        # historico dos episodios finalizados: (env, passos, retorno, sucesso)
+        self.history: list[tuple[int, int, float, bool]] = []
+
+    def _build_tables(self):
+        """
+        Builds the padded reward table and the valid-action mask of every maze.
+        The mask is computed from the occupancy with a one-cell empty border, so moves
+        that leave the grid are invalid exactly like in `Grid.get_neighbors`.
+        """
+        rows, cols = self.shape
+        occupied = np.zeros((self.num_envs, rows + 2, cols + 2), dtype=bool)
+        self.reward_table = np.full(
+            (self.num_envs, rows, cols), float(self.INVALID_ACTION_PENALTY)
+        )
+
+        for env_id, grid in enumerate(self.grids):
+            grid_rows, grid_cols = grid.grid_size
+            occupied[env_id, 1 : grid_rows + 1, 1 : grid_cols + 1] = grid.occupied
+            self.reward_table[env_id, :grid_rows, :grid_cols] = grid.cell_rewards(
+                empty_value=self.INVALID_ACTION_PENALTY
+            )
+
+        self.valid_actions = np.stack(
+            [
+                occupied[:, 1 + d_row : rows + 1 + d_row, 1 + d_col : cols + 1 + d_col]
+                for d_row, d_col in self._deltas
+            ],
+            axis=-1,
+        )
+
+    def _stack_q_tables(self):
+        """
+        Copies the agents' Q-tables into a single padded array, stored in the widest
+        of their dtypes.
+        """
+        dtype = np.result_type(*(agent.q_table.dtype for agent in self.agents))
+        self.q_table = np.zeros(
+            (self.num_envs, *self.shape, len(self.ACTIONS)), dtype=dtype
+        )
+        for env_id, agent in enumerate(self.agents):
+            rows, cols = agent.q_table.shape[:2]
+            self.q_table[env_id, :rows, :cols] = agent.q_table
+
+    def sync_agents(self):
+        """
+        Copies the stacked Q-tables and exploration rates back into the agents.
+        """
+        for env_id, agent in enumerate(self.agents):
+            rows, cols = agent.q_table.shape[:2]
+            agent.q_table[...] = self.q_table[env_id, :rows, :cols]
+            agent.exploration_rate = float(self.exploration_rate[env_id])
+
+    def _sample_from_mask(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Samples, for each row, one column uniformly among the True entries of `mask`.
+        """
+        counts = mask.sum(axis=1)
+        picks = (self.rng.random(len(mask)) * counts).astype(np.intp)
+        return np.argmax(np.cumsum(mask, axis=1) > picks[:, None], axis=1)
+
+    def reset(self, env_ids: np.ndarray | None = None):
+        """
+        Resets the given environments (all of them by default) to the start of an episode.
+
+        Args:
+            env_ids (np.ndarray | None): Indices of the environments to reset.
+        """
+        if env_ids is None:
+            env_ids = np.arange(self.num_envs)
+
+        self.agent_current_pos[env_ids] = self.start_positions[env_ids]
+        self.current_step[env_ids] = 0
+        self.episode_return[env_ids] = 0.0
+        self.done[env_ids] = False
+        if self.exploration is None:
+            # mesmo comportamento de QLearningAgent.reset
+            self.exploration_rate[env_ids] = 1.0
+
+    def step(self, env_ids: np.ndarray | None = None) -> np.ndarray:
+        """
+        Advances the given environments (all of them by default) by one step.
+
+        Args:
+            env_ids (np.ndarray | None): Indices of the environments to advance.
+
+        Returns:
+            np.ndarray: Indices of the environments whose episode finished in this step.
+        """
+        if env_ids is None:
+            env_ids = np.arange(self.num_envs)
+
+        rows = self.agent_current_pos[env_ids, 0]
+        cols = self.agent_current_pos[env_ids, 1]
+
+        valid = self.valid_actions[env_ids, rows, cols]
+        # tecnicamente, é impossível não ter ações válidas, pela construção do grid
+        assert valid.any(axis=1).all(), "No valid actions available"
+
+        q_values = self.q_table[env_ids, rows, cols]
+
+        if self.exploration is None:
+            # epsilon-greedy: empates entre as melhores ações são desfeitos ao acaso
+            masked_q = np.where(valid, q_values, -np.inf)
+            best = masked_q == masked_q.max(axis=1, keepdims=True)
+            explore = self.rng.random(len(env_ids)) < self.exploration_rate[env_ids]
+            actions = np.where(
+                explore, self._sample_from_mask(valid), self._sample_from_mask(best)
+            )
+        else:
+            states = (env_ids * self.shape[0] + rows) * self.shape[1] + cols
+            actions = self.exploration.select_batch(q_values, valid, self.rng, states)
+
+        next_rows = rows + self._deltas[actions, 0]
+        next_cols = cols + self._deltas[actions, 1]
+        rewards = self.reward_table[env_ids, next_rows, next_cols]
+
+        # aprende
+        current_q = q_values[np.arange(len(env_ids)), actions]
+        max_future_q = self.q_table[env_ids, next_rows, next_cols].max(axis=1)
+        td_error = rewards + self.discount_factor[env_ids] * max_future_q - current_q
+        self.q_table[env_ids, rows, cols, actions] = (
+            current_q + self.learning_rate[env_ids] * td_error
+        )
+        if self.exploration is None:
+            self.exploration_rate[env_ids] = np.maximum(
+                self.min_exploration_rate[env_ids],
+                self.exploration_rate[env_ids] * self.exploration_decay[env_ids],
+            )
+        else:
+            self.exploration.on_step()
+            self.exploration_rate[:] = self.exploration.exploration_rate
+
+        # Atualiza a posição dos agentes
+        self.agent_current_pos[env_ids, 0] = next_rows
+        self.agent_current_pos[env_ids, 1] = next_cols
+        self.current_step[env_ids] += 1
+        self.rewards[env_ids] = rewards
+        self.episode_return[env_ids] += rewards
+        self.done[env_ids] = (next_rows == self.solution_positions[env_ids, 0]) & (
+            next_cols == self.solution_positions[env_ids, 1]
+        )
+
+        finished = env_ids[
+            self.done[env_ids] | (self.current_step[env_ids] >= self.max_steps)
+        ]
+        if len(finished):
+            self.history.extend(
+                zip(
+                    finished.tolist(),
+                    self.current_step[finished].tolist(),
+                    self.episode_return[finished].tolist(),
+                    self.done[finished].tolist(),
+                )
+            )
+            rounds = self.episodes_completed.sum() // self.num_envs
+            self.episodes_completed[finished] += 1
+            if self.exploration is not None:
+                # uma rodada a cada `num_envs` episódios terminados
+                new_rounds = self.episodes_completed.sum() // self.num_envs - rounds
+                for _ in range(new_rounds):
+                    self.exploration.on_episode()
+                self.exploration_rate[:] = self.exploration.exploration_rate
+            self.reset(finished)
+
+        return finished
+
+    def run(self, episodes: int):
+        """
+        Runs every environment until it completes `episodes` episodes.
+        Environments that reach the target stop stepping while the others catch up.
+
+        Args:
+            episodes (int): Number of episodes per environment.
+        """
+        self.reset()
+        target = self.episodes_completed + episodes
+        active = np.arange(self.num_envs)[self.episodes_completed < target]
+
+        while len(active):
+            finished = self.step(active)
+            if len(finished):
+                active = active[self.episodes_completed[active] < target[active]]
+
+        self.sync_agents()
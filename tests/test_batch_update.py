@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from qtable_example.agents.batch_update import batched_td_update
+
+
+def test_duplicates_with_equal_targets_match_sequential_updates():
+    q_matrix = np.zeros((3, 2))
+    q_matrix[0, 1] = 2.0
+    expected = q_matrix.copy()
+    for _ in range(3):
+        expected[0, 1] += 0.5 * (-4.0 - expected[0, 1])
+    expected[2, 0] += 0.5 * (1.0 - expected[2, 0])
+
+    td_errors = batched_td_update(
+        q_matrix,
+        np.array([0, 2, 0, 0]),
+        np.array([1, 0, 1, 1]),
+        np.array([-4.0, 1.0, -4.0, -4.0]),
+        0.5,
+    )
+
+    assert q_matrix == pytest.approx(expected)
+    # um erro por par único, na ordem dos ids achatados
+    assert td_errors == pytest.approx([-6.0, 1.0])
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_duplicates_do_not_overshoot(dtype):
+    q_matrix = np.zeros((1, 4), dtype=dtype)
+    targets = np.array([10.0, 10.0, 10.0, 10.0, 20.0])
+
+    batched_td_update(
+        q_matrix, np.zeros(5, dtype=int), np.zeros(5, dtype=int), targets, 0.9
+    )
+
+    # 5 * lr > 1: np.add.at levaria o valor a 5 * 0.9 * 12 = 54
+    assert q_matrix.dtype == dtype
+    assert 0.0 < q_matrix[0, 0] <= 12.0
+    assert q_matrix[0, 0] == pytest.approx(12.0 * (1.0 - 0.1**5))
+    assert not q_matrix[0, 1:].any()
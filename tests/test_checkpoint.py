@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.checkpoint import (
+    FORMAT_VERSION,
+    MAGIC,
+    load_agent,
+    read_checkpoint,
+    save_agent,
+)
+from qtable_example.enums import Directions
+from qtable_example.exceptions import CheckpointError
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def make_agent() -> QLearningAgent:
+    return QLearningAgent(ACTIONS, (3, 4), rng=np.random.default_rng(0))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "agent.ckpt")
+    agent = make_agent()
+    agent.q_table[...] = np.arange(agent.q_table.size).reshape(agent.q_table.shape)
+    agent.exploration_rate = 0.25
+    save_agent(path, agent, episode=7)
+
+    restored = make_agent()
+    assert load_agent(path, restored) == 7
+    np.testing.assert_array_equal(restored.q_table, agent.q_table)
+    assert restored.exploration_rate == 0.25
+    assert restored.rng.random() == agent.rng.random()
+
+
+def test_other_format_versions_are_rejected(tmp_path):
+    path = tmp_path / "agent.ckpt"
+    save_agent(str(path), make_agent())
+    data = bytearray(path.read_bytes())
+    # a versão fica logo depois do magic, em uint16 little-endian
+    data[len(MAGIC) : len(MAGIC) + 2] = (FORMAT_VERSION + 1).to_bytes(2, "little")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(CheckpointError, match="format version"):
+        read_checkpoint(str(path))
@@ -0,0 +1,50 @@
+import sys
+
+import numpy as np
+
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.convergence import ConvergenceMonitor
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+
+sys.setrecursionlimit(10**6)
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def test_policy_ignores_invalid_actions_and_states():
+    valid_actions = np.array([[True, True, False, False], [False, False, False, False]])
+    monitor = ConvergenceMonitor(valid_actions=valid_actions)
+    q_table = np.zeros((2, 4))
+    q_table[0] = [-1.0, -2.0, 0.0, 0.0]
+
+    monitor.start_episode(q_table)
+    monitor.end_episode(False, q_table)
+    assert monitor.policy_changes[-1] == 1
+
+    # só mudam ações inválidas e o estado sem ações válidas
+    changed = q_table.copy()
+    changed[0, 2:] = 5.0
+    changed[1] = [0.0, 0.0, 3.0, 0.0]
+    monitor.start_episode(q_table)
+    monitor.end_episode(False, changed)
+    assert monitor.policy_changes[-1] == 0
+
+    changed[0, 1] = 1.0
+    monitor.start_episode(q_table)
+    monitor.end_episode(False, changed)
+    assert monitor.policy_changes[-1] == 1
+
+
+def test_run_masks_the_monitor_with_the_maze():
+    grid, solution = generate_maze(0, grid_size=(8, 8))
+    agent = QLearningAgent(ACTIONS, grid.grid_size, rng=np.random.default_rng(0))
+    env = Envoriment(grid, agent, solution.grid_position, max_steps=50)
+    monitor = ConvergenceMonitor()
+    env.run(3, monitor=monitor, verbose=False)
+
+    occupied = len(grid.non_empty_tiles)
+    assert monitor.valid_actions.shape == (64, 4)
+    assert monitor.policy_changes[0] == occupied
+    assert all(changes <= occupied for changes in monitor.policy_changes)
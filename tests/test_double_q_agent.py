@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from qtable_example.agents.double_q_agent import DoubleQAgent
+from qtable_example.enums import Directions
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def make_agent() -> DoubleQAgent:
+    # estado 1: só DOWN e LEFT são válidas, as inválidas ficam em 0
+    valid_matrix = np.ones((2, 4), dtype=bool)
+    valid_matrix[1] = [False, True, True, False]
+    agent = DoubleQAgent(
+        ACTIONS,
+        (1, 2),
+        learning_rate=0.5,
+        discount_factor=0.9,
+        rng=np.random.default_rng(0),
+        valid_matrix=valid_matrix,
+    )
+    for q_matrix in (agent.q_matrix_a, agent.q_matrix_b):
+        q_matrix[1] = [0.0, -5.0, -3.0, 0.0]
+    return agent
+
+
+def expected_value() -> float:
+    # argmax entre as válidas é LEFT (-3), não uma das inválidas (0)
+    return 0.5 * (-1.0 + 0.9 * -3.0)
+
+
+def test_learn_index_bootstraps_from_valid_actions():
+    agent = make_agent()
+    agent.learn_index(0, 1, -1.0, 1)
+
+    updated = max(agent.q_matrix_a.item(0, 1), agent.q_matrix_b.item(0, 1), key=abs)
+    assert updated == pytest.approx(expected_value())
+    assert agent.q_matrix.item(0, 1) == pytest.approx(expected_value() / 2)
+
+
+def test_learn_batch_bootstraps_from_valid_actions():
+    agent = make_agent()
+    agent.learn_batch(np.array([0]), np.array([1]), np.array([-1.0]), np.array([1]))
+
+    updated = max(agent.q_matrix_a.item(0, 1), agent.q_matrix_b.item(0, 1), key=abs)
+    assert updated == pytest.approx(expected_value())
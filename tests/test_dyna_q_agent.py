@@ -0,0 +1,60 @@
+import numpy as np
+
+from qtable_example.agents.dyna_q_agent import DynaQAgent
+from qtable_example.checkpoint import load_agent, save_agent
+from qtable_example.enums import Directions
+from qtable_example.seeding import RunSeeds
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def make_agent(planning_steps: int = 5, **kwargs) -> DynaQAgent:
+    return DynaQAgent(
+        ACTIONS,
+        (3, 3),
+        planning_steps=planning_steps,
+        rng=np.random.default_rng(0),
+        **kwargs,
+    )
+
+
+def train(agent: DynaQAgent, steps: int = 30):
+    state = 0
+    for _ in range(steps):
+        action = agent.act_index(state, (1, 3))
+        next_state = (state + 1) % 9
+        agent.learn_index(state, action, -1.0, next_state)
+        state = next_state
+
+
+def test_planning_does_not_consume_the_acting_stream():
+    states = []
+    for planning_steps in (0, 1, 20):
+        agent = make_agent(planning_steps)
+        train(agent)
+        states.append(agent.rng.bit_generator.state)
+
+    assert states[0] == states[1] == states[2]
+
+
+def test_planning_rng_can_be_given():
+    seeds = RunSeeds(3)
+    agent = make_agent(planning_rng=seeds.replay_rng())
+    train(agent, steps=1)
+
+    expected = seeds.replay_rng()
+    expected.integers(0, 1, size=5)
+    assert agent.planning_rng.random() == expected.random()
+
+
+def test_checkpoint_restores_the_planning_stream(tmp_path):
+    path = str(tmp_path / "dyna.ckpt")
+    agent = make_agent()
+    train(agent)
+    save_agent(path, agent)
+
+    restored = make_agent()
+    load_agent(path, restored)
+
+    assert restored.planning_rng.random() == agent.planning_rng.random()
+    assert restored.rng.random() == agent.rng.random()
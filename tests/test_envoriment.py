@@ -0,0 +1,44 @@
+import sys
+
+import numpy as np
+
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.checkpoint import CheckpointWriter, read_checkpoint
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+
+sys.setrecursionlimit(10**6)
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def make_envoriment(grid, solution) -> Envoriment:
+    agent = QLearningAgent(ACTIONS, grid.grid_size, rng=np.random.default_rng(7))
+    return Envoriment(grid, agent, solution.grid_position, max_steps=100)
+
+
+def test_resume_continues_an_interrupted_run(tmp_path):
+    grid, solution = generate_maze(5, grid_size=(8, 8))
+    total = 6
+
+    uninterrupted = make_envoriment(grid, solution)
+    assert uninterrupted.run(total, verbose=False) == total
+
+    path = str(tmp_path / "agent.ckpt")
+    first = make_envoriment(grid, solution)
+    writer = CheckpointWriter(path, every=100)
+    assert first.run(4, checkpoint=writer, verbose=False) == 4
+    assert read_checkpoint(path)[0]["episode"] == 4
+
+    resumed = make_envoriment(grid, solution)
+    assert resumed.resume(path) == 4
+    assert (
+        resumed.run(total - resumed.episode_count, checkpoint=writer, verbose=False)
+        == 2
+    )
+    writer.close()
+
+    assert resumed.episode_count == total
+    assert read_checkpoint(path)[0]["episode"] == total
+    assert np.array_equal(resumed.agent.q_table, uninterrupted.agent.q_table)
@@ -0,0 +1,32 @@
+import sys
+
+from qtable_example.experiments import generate_maze
+from qtable_example.internal.grid import Grid
+from qtable_example.internal.map_generator import MapGenerator
+from qtable_example.seeding import RunSeeds
+
+sys.setrecursionlimit(10**6)
+
+
+def test_generate_maze_matches_the_example():
+    # mesma construção do exemplo de envoriment.py
+    seeds = RunSeeds(41)
+    grid = Grid(grid_size=(20, 20))
+    map_generator = MapGenerator(
+        grid=grid,
+        map_max_length=100,
+        max_reward=10.0,
+        min_reward=-20,
+        max_cell_neighbors=2,
+        map_generation_create_subpath_probability=0.9,
+        rng=seeds.map_rng(),
+    )
+    map_generator.generate_map(start_cell_position=(0, 0))
+    solution = grid.generate_random_solution(
+        only_terminal=False, rng=seeds.solution_rng()
+    )
+    map_generator.generate_euclidian_rewards(solution=solution)
+
+    generated_grid, generated_solution = generate_maze(41)
+    assert generated_grid.fingerprint() == grid.fingerprint()
+    assert generated_solution.grid_position == solution.grid_position
@@ -0,0 +1,97 @@
+import sys
+
+import numpy as np
+
+from qtable_example.agents.exploration import UCB, Boltzmann, EpsilonGreedy
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.agents.sarsa_agent import ExpectedSarsaAgent
+from qtable_example.checkpoint import save_agent
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+
+sys.setrecursionlimit(10**6)
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def make_envoriment(grid, solution) -> Envoriment:
+    agent = QLearningAgent(
+        ACTIONS,
+        grid.grid_size,
+        rng=np.random.default_rng(3),
+        exploration=UCB(c=2.0),
+    )
+    return Envoriment(grid, agent, solution.grid_position, max_steps=100, compiled=True)
+
+
+def test_select_returns_a_valid_action():
+    rng = np.random.default_rng(0)
+    q_values = [5.0, -1.0, -2.0, 5.0]
+    for strategy in (EpsilonGreedy(), Boltzmann(), UCB()):
+        strategy.bind(1, 4)
+        for _ in range(50):
+            assert strategy.select(q_values, (1, 2), rng, 0) in (1, 2)
+
+
+def test_select_batch_returns_valid_actions():
+    rng = np.random.default_rng(0)
+    q_values = np.tile([5.0, -1.0, -2.0, 5.0], (6, 1))
+    valid = np.zeros((6, 4), dtype=bool)
+    valid[:, 1:3] = True
+    valid[0] = [True, False, False, False]
+    for strategy in (EpsilonGreedy(), Boltzmann(), UCB()):
+        strategy.bind(6, 4)
+        for _ in range(20):
+            actions = strategy.select_batch(q_values, valid, rng, np.arange(6))
+            assert valid[np.arange(6), actions].all()
+
+
+def test_ucb_probabilities_split_ties_of_the_greedy_scores():
+    strategy = UCB(c=1.0)
+    strategy.bind(2, 4)
+    strategy.counts[:] = [[0, 3, 0, 0], [2, 2, 2, 2]]
+    q_values = np.array([[0.0, 9.0, 0.0, 0.0], [1.0, 3.0, 3.0, 3.0]])
+    valid = np.array([[True, True, True, False], [True, True, True, False]])
+
+    probabilities = strategy.probabilities(q_values, valid, np.array([0, 1]))
+
+    # estado 0: ações não visitadas primeiro; estado 1: empate entre 1 e 2
+    np.testing.assert_allclose(
+        probabilities, [[0.5, 0.0, 0.5, 0.0], [0.0, 0.5, 0.5, 0.0]]
+    )
+
+
+def test_expected_sarsa_runs_with_ucb():
+    grid, solution = generate_maze(5, grid_size=(8, 8))
+    agent = ExpectedSarsaAgent(
+        ACTIONS, grid.grid_size, rng=np.random.default_rng(0), exploration=UCB()
+    )
+    env = Envoriment(grid, agent, solution.grid_position, max_steps=50)
+    env.run(2, verbose=False)
+    assert np.isfinite(agent.q_table).all()
+    assert agent.exploration.counts.sum() > 0
+
+
+def test_ucb_counts_survive_a_checkpoint(tmp_path):
+    grid, solution = generate_maze(5, grid_size=(8, 8))
+
+    uninterrupted = make_envoriment(grid, solution)
+    uninterrupted.run(6, verbose=False)
+
+    first = make_envoriment(grid, solution)
+    first.run(3, verbose=False)
+    path = str(tmp_path / "ucb.ckpt")
+    save_agent(path, first.agent, first.episode_count, grid=grid)
+
+    resumed = make_envoriment(grid, solution)
+    resumed.resume(path)
+    assert np.array_equal(
+        resumed.agent.exploration.counts, first.agent.exploration.counts
+    )
+    resumed.run(3, verbose=False)
+
+    assert np.array_equal(
+        resumed.agent.exploration.counts, uninterrupted.agent.exploration.counts
+    )
+    assert np.array_equal(resumed.agent.q_table, uninterrupted.agent.q_table)
@@ -0,0 +1,73 @@
+import sys
+
+import numpy as np
+import pytest
+
+from qtable_example.agents.exploration import UCB, Boltzmann, EpsilonGreedy
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+from qtable_example.fast_episode import FastEpisodeRunner
+
+sys.setrecursionlimit(10**6)
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_matches_envoriment_run(dtype):
+    grid, solution = generate_maze(3, grid_size=(8, 8))
+
+    def make_agent() -> QLearningAgent:
+        return QLearningAgent(
+            ACTIONS, grid.grid_size, rng=np.random.default_rng(11), dtype=dtype
+        )
+
+    env = Envoriment(grid, make_agent(), solution.grid_position, max_steps=200)
+    env.run(20, verbose=False)
+
+    agent = make_agent()
+    # blocos pequenos para cruzar várias fronteiras de bloco
+    runner = FastEpisodeRunner(
+        grid.compile(Envoriment.INVALID_ACTION_PENALTY),
+        agent,
+        solution_position=solution.grid_position,
+        max_steps=200,
+        block_size=64,
+    )
+    results = runner.run(20)
+
+    assert agent.q_table.dtype == dtype
+    assert np.array_equal(agent.q_table, env.agent.q_table)
+    assert agent.exploration_rate == env.agent.exploration_rate
+    assert np.count_nonzero(agent.q_table) > 0
+    assert len(results) == 20
+
+
+@pytest.mark.parametrize("strategy", [EpsilonGreedy, Boltzmann, UCB])
+def test_matches_envoriment_run_with_a_strategy(strategy):
+    grid, solution = generate_maze(3, grid_size=(8, 8))
+
+    def make_agent() -> QLearningAgent:
+        return QLearningAgent(
+            ACTIONS,
+            grid.grid_size,
+            rng=np.random.default_rng(11),
+            exploration=strategy(),
+        )
+
+    env = Envoriment(grid, make_agent(), solution.grid_position, max_steps=200)
+    env.run(10, verbose=False)
+
+    agent = make_agent()
+    runner = FastEpisodeRunner(
+        grid.compile(Envoriment.INVALID_ACTION_PENALTY),
+        agent,
+        solution_position=solution.grid_position,
+        max_steps=200,
+    )
+    runner.run(10)
+
+    assert np.array_equal(agent.q_table, env.agent.q_table)
+    assert agent.exploration_rate == env.agent.exploration_rate
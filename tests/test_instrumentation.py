@@ -0,0 +1,37 @@
+import sys
+
+import numpy as np
+import pytest
+
+from qtable_example.agents.double_q_agent import DoubleQAgent
+from qtable_example.agents.sarsa_agent import ExpectedSarsaAgent
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+from qtable_example.instrumentation import ACT, LEARN, Instrumentation
+
+sys.setrecursionlimit(10**6)
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+@pytest.mark.parametrize("agent_class", [ExpectedSarsaAgent, DoubleQAgent])
+@pytest.mark.parametrize("compiled", [False, True])
+def test_each_step_is_timed_once(agent_class, compiled):
+    grid, solution = generate_maze(0, grid_size=(8, 8))
+    agent = agent_class(ACTIONS, grid.grid_size, rng=np.random.default_rng(0))
+    env = Envoriment(
+        grid,
+        agent,
+        solution.grid_position,
+        max_steps=50,
+        compiled=compiled,
+        instrumentation=Instrumentation(),
+    )
+    env.run(3, verbose=False)
+
+    stats = env.instrumentation.stats
+    assert stats.steps > 0
+    # `learn` desses agentes chama `learn_index`: só um dos dois é cronometrado
+    assert stats.phases[LEARN].calls == stats.steps
+    assert stats.phases[ACT].calls == stats.steps
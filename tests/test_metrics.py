@@ -0,0 +1,34 @@
+import numpy as np
+
+from qtable_example.metrics import MetricsRecorder, read_metrics
+
+
+def record_episodes(recorder: MetricsRecorder, episodes: range):
+    for episode in episodes:
+        recorder.record(steps=episode, total_reward=float(episode), success=True)
+
+
+def test_flush_then_close_writes_each_episode_once(tmp_path):
+    recorder = MetricsRecorder(directory=str(tmp_path), capacity=8)
+    record_episodes(recorder, range(5))
+    recorder.flush()
+    recorder.close()
+
+    np.testing.assert_array_equal(read_metrics(str(tmp_path))["steps"], np.arange(5))
+
+
+def test_flushes_across_full_buffers_keep_order(tmp_path):
+    recorder = MetricsRecorder(directory=str(tmp_path), capacity=4)
+    record_episodes(recorder, range(6))
+    recorder.flush()
+    record_episodes(recorder, range(6, 11))
+    recorder.close()
+
+    np.testing.assert_array_equal(read_metrics(str(tmp_path))["steps"], np.arange(11))
+
+
+def test_in_memory_ring_keeps_last_episodes():
+    recorder = MetricsRecorder(capacity=4)
+    record_episodes(recorder, range(6))
+
+    np.testing.assert_array_equal(recorder.recent("steps"), [2, 3, 4, 5])
@@ -0,0 +1,104 @@
+import sys
+
+import numpy as np
+
+from qtable_example.agents.q_lambda_agent import QLambdaAgent, SarsaLambdaAgent
+from qtable_example.agents.sarsa_agent import SarsaAgent
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+
+sys.setrecursionlimit(10**6)
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+RIGHT = Directions.RIGHT.value
+LEFT = Directions.LEFT.value
+
+
+def make_corridor_agent(agent_class, **kwargs):
+    # corredor 1x3: estados 0, 1 e 2, andando para a direita
+    return agent_class(
+        ACTIONS,
+        (1, 3),
+        learning_rate=0.5,
+        discount_factor=1.0,
+        rng=np.random.default_rng(0),
+        **kwargs,
+    )
+
+
+def test_traces_below_the_threshold_are_dropped():
+    agent = make_corridor_agent(SarsaLambdaAgent, trace_decay=0.5, trace_threshold=0.3)
+
+    agent.learn_index(0, RIGHT, 0.0, 1)
+    agent.act_index(1, (RIGHT,))
+    assert agent.traces == {RIGHT: 0.5}
+
+    agent.learn_index(1, RIGHT, 0.0, 2)
+    agent.act_index(2, (LEFT,))
+    # o traço de (0, RIGHT) cairia para 0.25, abaixo do limiar
+    assert agent.traces == {4 + RIGHT: 0.5}
+
+
+def test_traces_are_cut_after_an_exploratory_action():
+    agent = make_corridor_agent(
+        QLambdaAgent, trace_decay=1.0, exploration_decay=1.0, min_exploration_rate=1.0
+    )
+    # no estado 1, LEFT é a ação gulosa entre as válidas; UP (inválida) vale mais
+    agent.q_matrix[1] = [5.0, 0.0, 1.0, -1.0]
+
+    kept = cut = 0
+    while not (kept and cut):
+        agent.learn_index(0, RIGHT, 0.0, 1)
+        action = agent.act_index(1, (LEFT, RIGHT))
+        if action == LEFT:
+            assert RIGHT in agent.traces
+            kept += 1
+        else:
+            assert agent.traces == {}
+            cut += 1
+        agent.end_episode()
+        agent.q_matrix[:] = 0.0
+        agent.q_matrix[1] = [5.0, 0.0, 1.0, -1.0]
+
+
+def test_q_lambda_bootstraps_from_valid_actions():
+    agent = make_corridor_agent(QLambdaAgent)
+    agent.q_matrix[1] = [5.0, 0.0, -3.0, -1.0]
+    agent.valid_matrix[1] = [False, False, True, True]
+
+    agent.learn_index(0, RIGHT, -1.0, 1)
+    agent.end_episode()
+
+    # alvo: -1 + max(-3, -1) = -2, não -1 + 5 da ação inválida
+    assert agent.q_matrix.item(0, RIGHT) == -1.0
+
+
+def test_traces_are_cleared_at_end_episode():
+    agent = make_corridor_agent(SarsaLambdaAgent)
+    agent.learn_index(0, RIGHT, 0.0, 1)
+    agent.act_index(1, (RIGHT,))
+    agent.learn_index(1, RIGHT, 1.0, 2)
+    assert agent.traces
+
+    agent.end_episode()
+
+    assert agent.traces == {}
+    # a transição pendente foi aplicada antes de limpar os traços
+    assert agent.q_matrix.item(1, RIGHT) > 0.0
+
+
+def test_sarsa_lambda_zero_matches_sarsa():
+    grid, solution = generate_maze(5, grid_size=(8, 8))
+
+    def run(agent_class, **kwargs) -> np.ndarray:
+        agent = agent_class(
+            ACTIONS, grid.grid_size, rng=np.random.default_rng(4), **kwargs
+        )
+        env = Envoriment(grid, agent, solution.grid_position, max_steps=100)
+        env.run(5, verbose=False)
+        return agent.q_table
+
+    np.testing.assert_array_equal(
+        run(SarsaLambdaAgent, trace_decay=0.0), run(SarsaAgent)
+    )
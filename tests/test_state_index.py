@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from qtable_example.internal.state_index import StateIndex
+
+
+def make_index() -> StateIndex:
+    return StateIndex((3, 4), np.array([(0, 1), (1, 0), (1, 3), (2, 2)]))
+
+
+def test_state_id_round_trip():
+    index = make_index()
+    for state_id, position in enumerate([(0, 1), (1, 0), (1, 3), (2, 2)]):
+        assert index.state_id(position) == state_id
+        assert index.position(state_id) == position
+        assert position in index
+
+
+@pytest.mark.parametrize("position", [(0, 0), (2, 3), (-1, 1), (3, 0), (0, 4)])
+def test_empty_or_outside_cells_have_no_id(position):
+    index = make_index()
+    assert position not in index
+    with pytest.raises(KeyError):
+        index.state_id(position)
+
+
+def test_cell_to_state_is_int32_per_cell():
+    cell_state = make_index().cell_to_state()
+    assert cell_state.dtype == np.int32
+    np.testing.assert_array_equal(
+        cell_state, [-1, 0, -1, -1, 1, -1, -1, 2, -1, -1, 3, -1]
+    )
@@ -0,0 +1,52 @@
+import sys
+
+import numpy as np
+
+from qtable_example.agents.exploration import UCB
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.experiments import generate_maze
+from qtable_example.vector_envoriment import VectorEnvoriment
+
+sys.setrecursionlimit(10**6)
+
+
+def make_vector_envoriment(num_envs: int = 3) -> VectorEnvoriment:
+    grids, solutions, agents = [], [], []
+    for map_seed in range(num_envs):
+        grid, solution = generate_maze(map_seed, grid_size=(8, 8))
+        grids.append(grid)
+        solutions.append(solution.grid_position)
+        agents.append(QLearningAgent(list(VectorEnvoriment.ACTIONS), grid.grid_size))
+    return VectorEnvoriment(grids, agents, solutions, max_steps=50, seed=0)
+
+
+def test_run_counts_episodes_per_call():
+    env = make_vector_envoriment()
+    env.run(3)
+    np.testing.assert_array_equal(env.episodes_completed, [3, 3, 3])
+
+    env.run(2)
+    np.testing.assert_array_equal(env.episodes_completed, [5, 5, 5])
+
+
+def test_run_with_a_shared_strategy():
+    env = make_vector_envoriment()
+    strategy = UCB(c=2.0)
+    env = VectorEnvoriment(
+        env.grids,
+        env.agents,
+        env.solution_positions.tolist(),
+        max_steps=50,
+        seed=0,
+        exploration=strategy,
+    )
+    env.run(2)
+
+    np.testing.assert_array_equal(env.episodes_completed, [2, 2, 2])
+    # uma visita por passo, contada separadamente em cada labirinto
+    steps = np.zeros(env.num_envs, dtype=np.int64)
+    for env_id, episode_steps, _, _ in env.history:
+        steps[env_id] += episode_steps
+    visits = strategy.counts.reshape(env.num_envs, -1).sum(axis=1)
+    np.testing.assert_array_equal(visits, steps)
+    assert strategy.exploration_rate == env.agents[0].exploration_rate
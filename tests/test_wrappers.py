@@ -0,0 +1,58 @@
+import sys
+
+import numpy as np
+
+from qtable_example.agents.q_learng_agent import QLearningAgent
+from qtable_example.background_training import SnapshotBuffer, TrainingWorker
+from qtable_example.enums import Directions
+from qtable_example.envoriment import Envoriment
+from qtable_example.experiments import generate_maze
+from qtable_example.instrumentation import Instrumentation
+from qtable_example.renders.headless import record_run
+
+sys.setrecursionlimit(10**6)
+
+ACTIONS = [Directions.UP, Directions.DOWN, Directions.LEFT, Directions.RIGHT]
+
+
+def make_envoriment(compiled: bool = True) -> Envoriment:
+    grid, solution = generate_maze(0, grid_size=(8, 8))
+    agent = QLearningAgent(ACTIONS, grid.grid_size, rng=np.random.default_rng(0))
+    return Envoriment(
+        grid,
+        agent,
+        solution.grid_position,
+        max_steps=50,
+        compiled=compiled,
+        instrumentation=Instrumentation(),
+    )
+
+
+def test_record_run_keeps_instrumentation(tmp_path):
+    env = make_envoriment()
+    env.run(2, verbose=False)
+    stats = env.instrumentation.stats
+    steps = stats.steps
+
+    record_run(env, 2, str(tmp_path / "frames"), every_steps=10, every_episodes=1)
+    env.run(2, verbose=False)
+
+    assert stats.steps > steps
+    env.instrumentation.detach()
+    assert not {"step", "step_compiled", "run_episode"} & set(vars(env))
+
+
+def test_training_worker_restores_step():
+    env = make_envoriment()
+    wrapped_step = env.step_compiled
+    snapshots = SnapshotBuffer(env.agent.q_table.shape, env.agent.dtype)
+    try:
+        worker = TrainingWorker(env, snapshots, episodes=2)
+        worker.start()
+        worker.join()
+    finally:
+        snapshots.close()
+
+    assert env.step_compiled is wrapped_step
+    env.instrumentation.detach()
+    assert "step_compiled" not in vars(env)